@@ -0,0 +1,46 @@
+"""Per-update latency of `OnlineDecoder.update`.
+
+Run with `python benchmarks/bench_online_decoder.py`. The median and 95th percentile
+of the latency of one call to `update` (one time bin) are printed for a few sizes.
+Nothing is asserted on wall-clock time.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+import pynapple as nap
+
+
+def bench_online_decoder(n_neurons, n_bins, transition=None, n_updates=2000, seed=0):
+    """Latencies (in s) of `n_updates` calls to `update` with one bin of spike counts."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, n_bins)
+    centers = rng.uniform(0, 1, n_neurons)
+    rates = 1 + 20 * np.exp(-((x[:, None] - centers[None, :]) ** 2) / 0.01)
+    tc = pd.DataFrame(index=x, data=rates, columns=np.arange(n_neurons))
+
+    decoder = nap.OnlineDecoder(tc, bin_size=0.02, transition=transition)
+    counts = rng.poisson(0.2, (n_updates, n_neurons))
+    decoder.update(counts[0])  # Warm-up
+
+    latency = np.zeros(n_updates)
+    for i, c in enumerate(counts):
+        t0 = time.perf_counter()
+        decoder.update(c)
+        latency[i] = time.perf_counter() - t0
+    return latency
+
+
+if __name__ == "__main__":
+    print(
+        f"{'neurons':>8} {'bins':>6} {'transition':>10} {'median (us)':>12} {'p95 (us)':>10}"
+    )
+    for n_neurons, n_bins in [(100, 200), (500, 200), (100, 1000)]:
+        for transition in [None, 0.05]:
+            latency = bench_online_decoder(n_neurons, n_bins, transition) * 1e6
+            print(
+                f"{n_neurons:>8} {n_bins:>6} {str(transition):>10} "
+                f"{np.median(latency):>12.1f} {np.percentile(latency, 95):>10.1f}"
+            )
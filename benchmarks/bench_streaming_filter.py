@@ -0,0 +1,44 @@
+"""Per-chunk latency of `StreamingFilter.process`.
+
+Run with `python benchmarks/bench_streaming_filter.py`. The median and 95th percentile
+of the latency of one call to `process` are printed for a few chunk shapes, in causal
+and zero-phase mode. Nothing is asserted on wall-clock time.
+"""
+
+import time
+
+import numpy as np
+
+import pynapple as nap
+
+
+def bench_streaming_filter(
+    chunk_size, n_channels, zero_phase=False, overlap=None, n_chunks=500, seed=0
+):
+    """Latencies (in s) of `n_chunks` calls to `process` on a 30 kHz stream."""
+    rng = np.random.default_rng(seed)
+    filt = nap.StreamingFilter(
+        (150, 250), 30000.0, "bandpass", zero_phase=zero_phase, overlap=overlap
+    )
+    chunks = rng.standard_normal((n_chunks, chunk_size, n_channels)).astype(np.float32)
+    filt.process(chunks[0])  # Warm-up
+
+    latency = np.zeros(n_chunks)
+    for i, chunk in enumerate(chunks):
+        t0 = time.perf_counter()
+        filt.process(chunk)
+        latency[i] = time.perf_counter() - t0
+    return latency
+
+
+if __name__ == "__main__":
+    print(
+        f"{'chunk':>6} {'channels':>8} {'zero_phase':>10} {'median (us)':>12} {'p95 (us)':>10}"
+    )
+    for chunk_size, n_channels in [(30, 64), (300, 64), (3000, 64)]:
+        for zero_phase in [False, True]:
+            latency = bench_streaming_filter(chunk_size, n_channels, zero_phase) * 1e6
+            print(
+                f"{chunk_size:>6} {n_channels:>8} {str(zero_phase):>10} "
+                f"{np.median(latency):>12.1f} {np.percentile(latency, 95):>10.1f}"
+            )
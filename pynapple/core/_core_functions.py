@@ -14,10 +14,17 @@ from scipy import signal
 from ._jitted_functions import (  # pjitconvolve,
     jitbin_array,
     jitcount,
+    jitpercentile_by_interval,
+    jitreduce_by_interval,
     jitremove_nan,
     jitrestrict,
     jitrestrict_with_count,
+    jitrolling_extremum,
+    jitrolling_median,
+    jitrolling_sum,
+    jitrolling_var,
     jitthreshold,
+    jitthreshold_columns,
     jitvaluefrom,
 )
 from .utils import get_backend
@@ -87,6 +94,101 @@ def _dropna(time_array, data_array, starts, ends, update_time_support, ndim):
         return (time_array, data_array, starts, ends)
 
 
+def _reduce_by_interval(time_array, data_array, starts, ends, ops):
+    idx_start = np.searchsorted(time_array, starts)
+    idx_end = np.searchsorted(time_array, ends, side="right")
+
+    # Slice first for compatibility with lazy loading.
+    offset = idx_start[0] if len(idx_start) else 0
+    data_array = np.asarray(data_array[offset : idx_end[-1] if len(idx_end) else 0])
+    idx_start = idx_start - offset
+    idx_end = idx_end - offset
+
+    shape = data_array.shape
+    data_array = data_array.reshape(shape[0], -1)
+
+    total, mean, var, mini, maxi, argmin, argmax = jitreduce_by_interval(
+        data_array, idx_start, idx_end
+    )
+
+    def index_to_time(idx):
+        t = np.full(idx.shape, np.nan)
+        t[idx >= 0] = time_array[idx[idx >= 0] + offset]
+        return t
+
+    reductions = {
+        "sum": lambda: total,
+        "mean": lambda: mean,
+        "var": lambda: var,
+        "std": lambda: np.sqrt(var),
+        "min": lambda: mini,
+        "max": lambda: maxi,
+        "argmin": lambda: index_to_time(argmin),
+        "argmax": lambda: index_to_time(argmax),
+    }
+
+    q = [op for op in ops if not isinstance(op, str)]
+    if len(q):
+        perc = jitpercentile_by_interval(
+            data_array, idx_start, idx_end, np.array(q, dtype=np.float64)
+        )
+        for i, op in enumerate(q):
+            reductions[op] = lambda i=i: perc[i]
+
+    return {op: reductions[op]().reshape((len(starts), *shape[1:])) for op in ops}
+
+
+def _rolling(time_array, data_array, starts, ends, window, stat, time_based):
+    shape = data_array.shape
+    data_array = np.asarray(data_array[:]).reshape(shape[0], -1)
+
+    # Windows never extend before the start of the epoch of each sample
+    idx_s = np.searchsorted(time_array, starts)
+    idx_e = np.searchsorted(time_array, ends, side="right")
+    first = np.repeat(idx_s, idx_e - idx_s)
+
+    if time_based:
+        left = np.searchsorted(time_array, time_array - window, side="right")
+    else:
+        left = np.arange(shape[0]) - window + 1
+    incomplete = left < first
+    left = np.maximum(left, first)
+
+    if np.issubdtype(data_array.dtype, np.floating):
+        out = np.empty(data_array.shape, dtype=data_array.dtype)
+    else:
+        out = np.empty(data_array.shape, dtype=np.float64)
+
+    if stat in ["sum", "mean"]:
+        jitrolling_sum(data_array, left, out, stat == "mean")
+    elif stat == "var":
+        jitrolling_var(data_array, left, out)
+    elif stat in ["min", "max"]:
+        jitrolling_extremum(data_array, left, out, stat == "max")
+    else:
+        jitrolling_median(data_array, left, out)
+
+    if not time_based:
+        out[incomplete] = np.nan
+
+    return out.reshape(shape)
+
+
+def _threshold_columns(time_array, data_array, starts, ends, on, off, method):
+    idx_s = np.searchsorted(time_array, starts)
+    idx_e = np.searchsorted(time_array, ends, side="right")
+    return jitthreshold_columns(
+        time_array,
+        np.asarray(data_array[:]),
+        idx_s,
+        idx_e,
+        on,
+        off,
+        method.startswith("above"),
+        method.endswith("equal"),
+    )
+
+
 ####################################
 # Can call pynajax
 ####################################
@@ -1,5 +1,5 @@
 import numpy as np
-from numba import jit  # , njit, prange
+from numba import jit, prange  # , njit
 
 
 ################################
@@ -312,6 +312,97 @@ def jitthreshold(time_array, data_array, starts, ends, thr, method="above"):
     return (new_time_array, new_data_array, new_starts, new_ends)
 
 
+@jit(nopython=True)
+def _jitthreshold_channel(
+    time_array, x, idx_s, idx_e, on, off, above, equal, new_start, new_end, pos, fill
+):
+    count = 0
+    for k in range(idx_s.shape[0]):
+        active = False
+        for i in range(idx_s[k], idx_e[k]):
+            if active:
+                thr = off
+            else:
+                thr = on
+
+            if above:
+                cross = x[i] >= thr if equal else x[i] > thr
+            else:
+                cross = x[i] <= thr if equal else x[i] < thr
+
+            if active and not cross:
+                active = False
+                if fill:
+                    new_end[pos + count] = time_array[i] - (
+                        (time_array[i] - time_array[i - 1]) / 2
+                    )
+                count += 1
+            elif not active and cross:
+                active = True
+                if fill:
+                    if i == idx_s[k]:
+                        new_start[pos + count] = time_array[i]
+                    else:
+                        new_start[pos + count] = time_array[i] - (
+                            (time_array[i] - time_array[i - 1]) / 2
+                        )
+
+        if active:
+            if fill:
+                new_end[pos + count] = time_array[idx_e[k] - 1]
+            count += 1
+
+    return count
+
+
+@jit(nopython=True, parallel=True)
+def jitthreshold_columns(time_array, data_array, idx_s, idx_e, on, off, above, equal):
+    f = data_array.shape[1]
+    empty = np.zeros(0, dtype=np.float64)
+
+    # First pass to count the intervals of each channel
+    count = np.zeros(f, dtype=np.int64)
+    for j in prange(f):
+        count[j] = _jitthreshold_channel(
+            time_array,
+            data_array[:, j],
+            idx_s,
+            idx_e,
+            on[j],
+            off[j],
+            above,
+            equal,
+            empty,
+            empty,
+            0,
+            False,
+        )
+
+    offsets = np.zeros(f + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(count)
+
+    # Second pass to fill the packed intervals
+    new_start = np.zeros(offsets[-1], dtype=np.float64)
+    new_end = np.zeros(offsets[-1], dtype=np.float64)
+    for j in prange(f):
+        _jitthreshold_channel(
+            time_array,
+            data_array[:, j],
+            idx_s,
+            idx_e,
+            on[j],
+            off[j],
+            above,
+            equal,
+            new_start,
+            new_end,
+            offsets[j],
+            True,
+        )
+
+    return (new_start, new_end, offsets)
+
+
 def jitbin_array(time_array, data_array, starts, ends, bin_size):
     """Slice first for compatibility with lazy loading."""
     idx, countin = jitrestrict_with_count(time_array, starts, ends)
@@ -374,6 +465,248 @@ def _jitbin_array(countin, time_array, data_array, starts, ends, bin_size):
     return (new_time_array, new_data_array)
 
 
+@jit(nopython=True)
+def jitreduce_by_interval(data_array, idx_start, idx_end):
+    m = idx_start.shape[0]
+    f = data_array.shape[1]
+
+    total = np.zeros((m, f), dtype=np.float64)
+    mean = np.full((m, f), np.nan)
+    var = np.full((m, f), np.nan)
+    mini = np.full((m, f), np.nan)
+    maxi = np.full((m, f), np.nan)
+    argmin = np.full((m, f), -1, dtype=np.int64)
+    argmax = np.full((m, f), -1, dtype=np.int64)
+
+    for k in range(m):
+        s = idx_start[k]
+        e = idx_end[k]
+        if e <= s:
+            continue
+
+        for j in range(f):
+            mini[k, j] = data_array[s, j]
+            maxi[k, j] = data_array[s, j]
+            argmin[k, j] = s
+            argmax[k, j] = s
+
+        # Rows are contiguous in memory, columns are the inner loop.
+        for i in range(s, e):
+            for j in range(f):
+                v = data_array[i, j]
+                total[k, j] += v
+                # NaN propagates as in numpy.min/numpy.argmin: the first NaN wins
+                if not np.isnan(mini[k, j]) and (np.isnan(v) or v < mini[k, j]):
+                    mini[k, j] = v
+                    argmin[k, j] = i
+                if not np.isnan(maxi[k, j]) and (np.isnan(v) or v > maxi[k, j]):
+                    maxi[k, j] = v
+                    argmax[k, j] = i
+
+        for j in range(f):
+            mean[k, j] = total[k, j] / (e - s)
+            var[k, j] = 0.0
+
+        for i in range(s, e):
+            for j in range(f):
+                d = data_array[i, j] - mean[k, j]
+                var[k, j] += d * d
+
+        for j in range(f):
+            var[k, j] /= e - s
+
+    return (total, mean, var, mini, maxi, argmin, argmax)
+
+
+@jit(nopython=True)
+def jitpercentile_by_interval(data_array, idx_start, idx_end, q):
+    m = idx_start.shape[0]
+    f = data_array.shape[1]
+
+    out = np.full((q.shape[0], m, f), np.nan)
+
+    for k in range(m):
+        s = idx_start[k]
+        e = idx_end[k]
+        if e <= s:
+            continue
+        for j in range(f):
+            out[:, k, j] = np.percentile(data_array[s:e, j], q)
+
+    return out
+
+
+@jit(nopython=True)
+def jitrolling_sum(data_array, left, out, mean=False):
+    n, f = data_array.shape
+    total = np.zeros(f, dtype=np.float64)
+    nans = np.zeros(f, dtype=np.int64)
+
+    lo = 0
+    for i in range(n):
+        while lo < left[i]:
+            for j in range(f):
+                v = data_array[lo, j]
+                if np.isnan(v):
+                    nans[j] -= 1
+                else:
+                    total[j] -= v
+            lo += 1
+
+        if lo == i:  # New window, resetting to avoid drift
+            total[:] = 0.0
+            nans[:] = 0
+
+        for j in range(f):
+            v = data_array[i, j]
+            if np.isnan(v):
+                nans[j] += 1
+            else:
+                total[j] += v
+
+            if nans[j] > 0:
+                out[i, j] = np.nan
+            elif mean:
+                out[i, j] = total[j] / (i - lo + 1)
+            else:
+                out[i, j] = total[j]
+
+    return out
+
+
+@jit(nopython=True)
+def jitrolling_var(data_array, left, out):
+    n, f = data_array.shape
+    cnt = np.zeros(f, dtype=np.int64)
+    mean = np.zeros(f, dtype=np.float64)
+    m2 = np.zeros(f, dtype=np.float64)
+    nans = np.zeros(f, dtype=np.int64)
+
+    lo = 0
+    for i in range(n):
+        while lo < left[i]:
+            for j in range(f):
+                v = data_array[lo, j]
+                if np.isnan(v):
+                    nans[j] -= 1
+                else:
+                    cnt[j] -= 1
+                    if cnt[j] > 0:
+                        d = v - mean[j]
+                        mean[j] -= d / cnt[j]
+                        m2[j] -= d * (v - mean[j])
+                    else:
+                        mean[j] = 0.0
+                        m2[j] = 0.0
+            lo += 1
+
+        if lo == i:  # New window, resetting to avoid drift
+            cnt[:] = 0
+            mean[:] = 0.0
+            m2[:] = 0.0
+            nans[:] = 0
+
+        for j in range(f):
+            v = data_array[i, j]
+            if np.isnan(v):
+                nans[j] += 1
+            else:
+                # Welford update
+                cnt[j] += 1
+                d = v - mean[j]
+                mean[j] += d / cnt[j]
+                m2[j] += d * (v - mean[j])
+
+            if nans[j] > 0:
+                out[i, j] = np.nan
+            else:
+                out[i, j] = max(m2[j], 0.0) / cnt[j]
+
+    return out
+
+
+@jit(nopython=True)
+def jitrolling_extremum(data_array, left, out, find_max=True):
+    n, f = data_array.shape
+    deque = np.empty(n, dtype=np.int64)
+
+    for j in range(f):
+        head = 0
+        tail = 0
+        nans = 0
+        lo = 0
+        for i in range(n):
+            while lo < left[i]:
+                if np.isnan(data_array[lo, j]):
+                    nans -= 1
+                lo += 1
+            while head < tail and deque[head] < lo:
+                head += 1
+
+            v = data_array[i, j]
+            if np.isnan(v):
+                nans += 1
+            else:
+                # Monotonic deque : the front always holds the extremum of the window
+                if find_max:
+                    while head < tail and data_array[deque[tail - 1], j] <= v:
+                        tail -= 1
+                else:
+                    while head < tail and data_array[deque[tail - 1], j] >= v:
+                        tail -= 1
+                deque[tail] = i
+                tail += 1
+
+            if nans > 0:
+                out[i, j] = np.nan
+            else:
+                out[i, j] = data_array[deque[head], j]
+
+    return out
+
+
+@jit(nopython=True)
+def jitrolling_median(data_array, left, out):
+    n, f = data_array.shape
+    window = np.empty(n, dtype=np.float64)
+
+    for j in range(f):
+        cnt = 0
+        nans = 0
+        lo = 0
+        for i in range(n):
+            while lo < left[i]:
+                v = data_array[lo, j]
+                if np.isnan(v):
+                    nans -= 1
+                else:
+                    k = np.searchsorted(window[0:cnt], v)
+                    for p in range(k, cnt - 1):
+                        window[p] = window[p + 1]
+                    cnt -= 1
+                lo += 1
+
+            v = data_array[i, j]
+            if np.isnan(v):
+                nans += 1
+            else:
+                # Keeping the window sorted
+                k = np.searchsorted(window[0:cnt], v)
+                for p in range(cnt, k, -1):
+                    window[p] = window[p - 1]
+                window[k] = v
+                cnt += 1
+
+            if nans > 0:
+                out[i, j] = np.nan
+            elif cnt % 2:
+                out[i, j] = window[cnt // 2]
+            else:
+                out[i, j] = (window[cnt // 2 - 1] + window[cnt // 2]) / 2
+
+    return out
+
+
 # @jit(nopython=True)
 # def jitconvolve(d, a):
 #     return np.convolve(d, a)
@@ -406,8 +739,21 @@ def _jitbin_array(countin, time_array, data_array, starts, ends, bin_size):
 ################################
 # IntervalSet functions
 ################################
+def jitintersect(start1, end1, start2, end2, return_index=False):
+    """
+    Intersection of two sets of intervals.
+
+    If `return_index` is True, also returns for each new interval the index
+    of the interval it comes from in each input.
+    """
+    newstart, newend, idx1, idx2 = _jitintersect(start1, end1, start2, end2)
+    if return_index:
+        return (newstart, newend, idx1, idx2)
+    return (newstart, newend)
+
+
 @jit(nopython=True)
-def jitintersect(start1, end1, start2, end2):
+def _jitintersect(start1, end1, start2, end2):
     m = start1.shape[0]
     n = start2.shape[0]
 
@@ -416,6 +762,8 @@ def jitintersect(start1, end1, start2, end2):
 
     newstart = np.zeros(m + n, dtype=np.float64)
     newend = np.zeros(m + n, dtype=np.float64)
+    idx1 = np.zeros(m + n, dtype=np.int64)
+    idx2 = np.zeros(m + n, dtype=np.int64)
     ct = 0
 
     while i < m:
@@ -430,6 +778,8 @@ def jitintersect(start1, end1, start2, end2):
         if start2[j] < end1[i]:
             newstart[ct] = max(start1[i], start2[j])
             newend[ct] = min(end1[i], end2[j])
+            idx1[ct] = i
+            idx2[ct] = j
             ct += 1
             if end2[j] < end1[i]:
                 j += 1
@@ -440,12 +790,28 @@ def jitintersect(start1, end1, start2, end2):
 
     newstart = newstart[0:ct]
     newend = newend[0:ct]
+    idx1 = idx1[0:ct]
+    idx2 = idx2[0:ct]
+
+    return (newstart, newend, idx1, idx2)
 
+
+def jitunion(start1, end1, start2, end2, return_index=False):
+    """
+    Union of two sets of intervals.
+
+    If `return_index` is True, also returns for each interval of each input
+    the index of the new interval that contains it. Intervals can be joined
+    so the mapping goes from the inputs to the output.
+    """
+    newstart, newend, idx1, idx2 = _jitunion(start1, end1, start2, end2)
+    if return_index:
+        return (newstart, newend, idx1, idx2)
     return (newstart, newend)
 
 
 @jit(nopython=True)
-def jitunion(start1, end1, start2, end2):
+def _jitunion(start1, end1, start2, end2):
     m = start1.shape[0]
     n = start2.shape[0]
 
@@ -454,6 +820,8 @@ def jitunion(start1, end1, start2, end2):
 
     newstart = np.zeros(m + n, dtype=np.float64)
     newend = np.zeros(m + n, dtype=np.float64)
+    idx1 = np.zeros(m, dtype=np.int64)
+    idx2 = np.zeros(n, dtype=np.int64)
     ct = 0
 
     while i < m:
@@ -462,6 +830,7 @@ def jitunion(start1, end1, start2, end2):
                 break
             newstart[ct] = start2[j]
             newend[ct] = end2[j]
+            idx2[j] = ct
             ct += 1
             j += 1
 
@@ -474,6 +843,8 @@ def jitunion(start1, end1, start2, end2):
 
             while i < m and j < n:
                 newend[ct] = max(end1[i], end2[j])
+                idx1[i] = ct
+                idx2[j] = ct
 
                 if end1[i] < end2[j]:
                     i += 1
@@ -502,29 +873,45 @@ def jitunion(start1, end1, start2, end2):
         else:
             newstart[ct] = start1[i]
             newend[ct] = end1[i]
+            idx1[i] = ct
             ct += 1
             i += 1
 
     while i < m:
         newstart[ct] = start1[i]
         newend[ct] = end1[i]
+        idx1[i] = ct
         ct += 1
         i += 1
 
     while j < n:
         newstart[ct] = start2[j]
         newend[ct] = end2[j]
+        idx2[j] = ct
         ct += 1
         j += 1
 
     newstart = newstart[0:ct]
     newend = newend[0:ct]
 
+    return (newstart, newend, idx1, idx2)
+
+
+def jitdiff(start1, end1, start2, end2, return_index=False):
+    """
+    Difference of two sets of intervals.
+
+    If `return_index` is True, also returns for each new interval the index
+    of the interval it comes from in the first input.
+    """
+    newstart, newend, idx1 = _jitdiff(start1, end1, start2, end2)
+    if return_index:
+        return (newstart, newend, idx1)
     return (newstart, newend)
 
 
 @jit(nopython=True)
-def jitdiff(start1, end1, start2, end2):
+def _jitdiff(start1, end1, start2, end2):
     m = start1.shape[0]
     n = start2.shape[0]
 
@@ -533,6 +920,7 @@ def jitdiff(start1, end1, start2, end2):
 
     newstart = np.zeros(m + n, dtype=np.float64)
     newend = np.zeros(m + n, dtype=np.float64)
+    idx1 = np.zeros(m + n, dtype=np.int64)
     ct = 0
 
     while i < m:
@@ -553,18 +941,21 @@ def jitdiff(start1, end1, start2, end2):
                 if start2[j] > start1[i]:
                     newstart[ct] = start1[i]
                     newend[ct] = start2[j]
+                    idx1[ct] = i
                     ct += 1
                     j += 1
 
                 else:
                     newstart[ct] = end2[j]
                     newend[ct] = end1[i]
+                    idx1[ct] = i
                     j += 1
 
                 while j < n:
                     if start2[j] < end1[i]:
                         newstart[ct] = end2[j - 1]
                         newend[ct] = start2[j]
+                        idx1[ct] = i
                         ct += 1
                         j += 1
                     else:
@@ -573,6 +964,7 @@ def jitdiff(start1, end1, start2, end2):
                 if end2[j - 1] < end1[i]:
                     newstart[ct] = end2[j - 1]
                     newend[ct] = end1[i]
+                    idx1[ct] = i
                     ct += 1
                 else:
                     j -= 1
@@ -581,19 +973,22 @@ def jitdiff(start1, end1, start2, end2):
         else:
             newstart[ct] = start1[i]
             newend[ct] = end1[i]
+            idx1[ct] = i
             ct += 1
             i += 1
 
     while i < m:
         newstart[ct] = start1[i]
         newend[ct] = end1[i]
+        idx1[ct] = i
         ct += 1
         i += 1
 
     newstart = newstart[0:ct]
     newend = newend[0:ct]
+    idx1 = idx1[0:ct]
 
-    return (newstart, newend)
+    return (newstart, newend, idx1)
 
 
 @jit(nopython=True)
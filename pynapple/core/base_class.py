@@ -36,7 +36,7 @@ class Base(abc.ABC):
         # Restrict should occur in the inherited class
         if len(self.index):
             if isinstance(time_support, IntervalSet):
-                self.time_support = time_support
+                self.time_support = time_support._drop_metadata()
             else:
                 self.time_support = IntervalSet(start=self.index[0], end=self.index[-1])
 
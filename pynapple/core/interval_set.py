@@ -80,7 +80,7 @@ class IntervalSet(NDArrayOperatorsMixin):
     A class representing a (irregular) set of time intervals in elapsed time, with relative operations
     """
 
-    def __init__(self, start, end=None, time_units="s"):
+    def __init__(self, start, end=None, time_units="s", metadata=None):
         """
         IntervalSet initializer
 
@@ -105,6 +105,13 @@ class IntervalSet(NDArrayOperatorsMixin):
             Ends of intervals
         time_units : str, optional
             Time unit of the intervals ('us', 'ms', 's' [default])
+        metadata : dict or pandas.DataFrame, optional
+            Per-interval metadata (e.g. trial number, stimulus id). Each column
+            should have one value per interval. Columns are stored as numpy arrays.
+            If `start` is a pandas.DataFrame, columns other than "start" and "end"
+            are used as metadata.
+            Metadata are not carried over when the IntervalSet becomes the time
+            support of a time series or of a TsGroup.
 
         Raises
         ------
@@ -112,20 +119,25 @@ class IntervalSet(NDArrayOperatorsMixin):
             If `start` and `end` arguments are of unknown type
 
         """
+        self._metadata = {}
+        metadata = {} if metadata is None else dict(metadata)
+
         if isinstance(start, IntervalSet):
+            if not len(metadata):
+                metadata = start._metadata
             end = start.end.astype(np.float64)
             start = start.start.astype(np.float64)
 
         elif isinstance(start, pd.DataFrame):
             assert (
-                "start" in start.columns
-                and "end" in start.columns
-                and start.shape[-1] == 2
+                "start" in start.columns and "end" in start.columns
             ), """
                 Wrong dataframe format. Expected format if passing a pandas dataframe is :
-                    - 2 columns
-                    - column names are ["start", "end"]                    
+                    - column names "start" and "end"
+                    - additional columns are added as metadata
                 """
+            if not len(metadata):
+                metadata = dict(start[start.columns.drop(["start", "end"])])
             end = start["end"].values.astype(np.float64)
             start = start["start"].values.astype(np.float64)
 
@@ -168,9 +180,18 @@ class IntervalSet(NDArrayOperatorsMixin):
         start = TsIndex.format_timestamps(start, time_units)
         end = TsIndex.format_timestamps(end, time_units)
 
+        metadata = {k: np.asarray(v) for k, v in metadata.items()}
+        for k, v in metadata.items():
+            if v.ndim != 1 or len(v) != len(start):
+                raise RuntimeError(
+                    "Metadata {} is not the same length as the intervals.".format(k)
+                )
+
         if not (np.diff(start) > 0).all():
             warnings.warn("start is not sorted. Sorting it.", stacklevel=2)
-            start = np.sort(start)
+            order = np.argsort(start, kind="stable")
+            start = start[order]
+            metadata = {k: v[order] for k, v in metadata.items()}
 
         if not (np.diff(end) > 0).all():
             warnings.warn("end is not sorted. Sorting it.", stacklevel=2)
@@ -187,12 +208,22 @@ class IntervalSet(NDArrayOperatorsMixin):
         self.columns = np.array(["start", "end"])
         self.nap_class = self.__class__.__name__
 
+        if len(metadata):
+            if data.shape[0] == len(start):
+                self.set_info(**metadata)
+            else:
+                warnings.warn(
+                    "Intervals have been dropped or joined. Dropping the metadata!",
+                    stacklevel=2,
+                )
+
     def __repr__(self):
-        headers = [" " * 6, "start", "end"]
+        headers = [" " * 6, "start", "end"] + self.metadata_columns
         bottom = "shape: {}, time unit: sec.".format(self.shape)
 
         rows = _get_terminal_size()[1]
         max_rows = np.maximum(rows - 10, 6)
+        colalign = ("left", "center", "center") + ("center",) * len(self._metadata)
 
         if len(self) > max_rows:
             n_rows = max_rows // 2
@@ -200,27 +231,25 @@ class IntervalSet(NDArrayOperatorsMixin):
                 warnings.simplefilter("ignore")
                 return (
                     tabulate(
-                        np.hstack(
-                            (self.index[0:n_rows][:, None], self.values[0:n_rows])
-                        ),
+                        self._repr_table(slice(0, n_rows)),
                         headers=headers,
                         tablefmt="plain",
-                        colalign=("left", "center", "center"),
+                        colalign=colalign,
                     )
                     + "\n"
                     + " " * 10
                     + "..."
                     + tabulate(
-                        np.hstack(
-                            (self.index[-n_rows:][:, None], self.values[-n_rows:])
-                        ),
+                        self._repr_table(slice(-n_rows, None)),
                         headers=[
                             " " * 6,
                             " " * 5,
                             " " * 3,
-                        ],  # To align properly the columns
+                        ]
+                        + [" " * len(str(c)) for c in self.metadata_columns],
+                        # To align properly the columns
                         tablefmt="plain",
-                        colalign=("left", "center", "center"),
+                        colalign=colalign,
                     )
                     + "\n"
                     + bottom
@@ -229,12 +258,24 @@ class IntervalSet(NDArrayOperatorsMixin):
         else:
             return (
                 tabulate(
-                    self.values, headers=headers, showindex="always", tablefmt="plain"
+                    self._repr_table(slice(None))[:, 1:],
+                    headers=headers,
+                    showindex="always",
+                    tablefmt="plain",
                 )
                 + "\n"
                 + bottom
             )
 
+    def _repr_table(self, sl):
+        """Stack the index, the start/end and the metadata columns for __repr__"""
+        if not len(self._metadata):
+            return np.hstack((self.index[sl][:, None], self.values[sl]))
+        return np.hstack(
+            [self.index[sl][:, None].astype(object), self.values[sl].astype(object)]
+            + [v[sl][:, None].astype(object) for v in self._metadata.values()]
+        )
+
     def __str__(self):
         return self.__repr__()
 
@@ -249,30 +290,59 @@ class IntervalSet(NDArrayOperatorsMixin):
             "IntervalSet is immutable. Starts and ends have been already sorted."
         )
 
+    def __getattr__(self, name):
+        """
+        Allows dynamic access to metadata columns as properties.
+
+        Parameters
+        ----------
+        name : str
+            The name of the metadata column to access.
+
+        Returns
+        -------
+        numpy.ndarray
+            The values of the requested metadata column.
+
+        Raises
+        ------
+        AttributeError
+            If the requested attribute is not a metadata column.
+        """
+        # avoid infinite recursion when pickling
+        if name in ("__getstate__", "__setstate__", "__reduce__", "__reduce_ex__"):
+            raise AttributeError(name)
+        metadata = self.__dict__.get("_metadata", {})
+        if name in metadata:
+            return metadata[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
     def __getitem__(self, key, *args, **kwargs):
         if isinstance(key, str):
             if key == "start":
                 return self.values[:, 0]
             elif key == "end":
                 return self.values[:, 1]
+            elif key in self._metadata:
+                return self._metadata[key]
             else:
                 raise IndexError("Unknown string argument. Should be 'start' or 'end'")
         elif isinstance(key, Number):
-            output = self.values.__getitem__(key)
-            return IntervalSet(start=output[0], end=output[1])
+            return self._take(np.array([key]))
         elif isinstance(key, (list, slice, np.ndarray)):
-            output = self.values.__getitem__(key)
-            return IntervalSet(start=output[:, 0], end=output[:, 1])
+            return self._take(key)
         elif isinstance(key, pd.Series):
-            output = self.values.__getitem__(key)
-            return IntervalSet(start=output[:, 0], end=output[:, 1])
+            return self._take(key.values)
         elif isinstance(key, tuple):
             if len(key) == 2:
                 if isinstance(key[1], Number):
                     return self.values.__getitem__(key)
                 elif key[1] == slice(None, None, None) or key[1] == slice(0, 2, None):
-                    output = self.values.__getitem__(key)
-                    return IntervalSet(start=output[:, 0], end=output[:, 1])
+                    if isinstance(key[0], Number):
+                        return self._take(np.array([key[0]]))
+                    return self._take(key[0])
                 else:
                     return self.values.__getitem__(key)
             else:
@@ -282,6 +352,21 @@ class IntervalSet(NDArrayOperatorsMixin):
         else:
             return self.values.__getitem__(key)
 
+    def _drop_metadata(self):
+        """Return self, or a copy without the metadata columns if there are some"""
+        if not len(self._metadata):
+            return self
+        return IntervalSet(start=self.values[:, 0], end=self.values[:, 1])
+
+    def _take(self, idx):
+        """Return a new IntervalSet with the intervals (and metadata) selected by `idx`"""
+        output = self.values[idx]
+        return IntervalSet(
+            start=output[:, 0],
+            end=output[:, 1],
+            metadata={k: v[idx] for k, v in self._metadata.items()},
+        )
+
     def __array__(self, dtype=None):
         return self.values.astype(dtype)
 
@@ -380,12 +465,223 @@ class IntervalSet(NDArrayOperatorsMixin):
         """
         return _IntervalSetSliceHelper(self)
 
+    #######################
+    # Metadata
+    #######################
+
+    @property
+    def metadata_columns(self):
+        """
+        Returns list of metadata columns
+        """
+        return list(self._metadata.keys())
+
+    def set_info(self, *args, **kwargs):
+        """
+        Add metadata information about the intervals.
+        Metadata are stored as numpy arrays aligned with the intervals.
+
+        Parameters
+        ----------
+        *args
+            pandas.DataFrame or list of pandas.DataFrame
+        **kwargs
+            Can be either pandas.Series, numpy.ndarray, list or tuple
+
+        Raises
+        ------
+        RuntimeError
+            Raise an error if
+                indexes are not equals for a pandas series or dataframe,
+                not the same length when passing numpy array.
+        ValueError
+            If a metadata name is 'start', 'end' or an attribute of IntervalSet.
+        TypeError
+            If some of the provided metadata could not be set.
+
+        Examples
+        --------
+        >>> import pynapple as nap
+        >>> import numpy as np
+        >>> ep = nap.IntervalSet(start=[0, 10, 20], end=[5, 15, 25])
+        >>> ep.set_info(trial=[0, 1, 2], stim=["a", "b", "a"])
+        >>> ep
+              start    end    trial  stim
+         0        0      5      0     a
+         1       10     15      1     b
+         2       20     25      2     a
+        shape: (3, 2), time unit: sec.
+        >>> ep.stim
+        array(['a', 'b', 'a'], dtype='<U1')
+        """
+        columns = {}
+        not_set = []
+        for arg in args:
+            if isinstance(arg, pd.DataFrame):
+                if pd.Index.equals(pd.RangeIndex(len(self)), arg.index):
+                    columns.update({k: arg[k].values for k in arg.columns})
+                else:
+                    raise RuntimeError("Index are not equals")
+            elif isinstance(arg, (pd.Series, np.ndarray, list)):
+                raise RuntimeError("Argument should be passed as keyword argument.")
+            else:
+                not_set.append(arg)
+        for k, v in kwargs.items():
+            if isinstance(v, pd.Series):
+                if pd.Index.equals(pd.RangeIndex(len(self)), v.index):
+                    columns[k] = v.values
+                else:
+                    raise RuntimeError("Index are not equals for argument {}".format(k))
+            elif isinstance(v, (np.ndarray, list, tuple)):
+                columns[k] = np.asarray(v)
+            else:
+                not_set.append({k: v})
+        if not_set:
+            raise TypeError(
+                f"Cannot set the following metadata:\n{not_set}.\nMetadata columns provided must be  "
+                f"of type `panda.Series`, `tuple`, `list`, or `numpy.ndarray`."
+            )
+
+        invalid_cols = [
+            k for k in columns if k in ("start", "end") or hasattr(IntervalSet, k)
+        ]
+        if invalid_cols:
+            raise ValueError(
+                f"Invalid metadata name(s) {invalid_cols}. Metadata name must differ from "
+                f"IntervalSet attribute names!"
+            )
+        for k, v in columns.items():
+            if v.ndim != 1 or len(v) != len(self):
+                raise RuntimeError("Array is not the same length.")
+
+        self._metadata.update(columns)
+
+    def get_info(self, key):
+        """
+        Returns the metadata located in one column.
+
+        Parameters
+        ----------
+        key : str
+            One of the metadata columns name
+
+        Returns
+        -------
+        numpy.ndarray
+            The metadata
+        """
+        return self._metadata[key]
+
+    def getby_threshold(self, key, thr, op=">"):
+        """
+        Return the intervals with values above threshold for metadata under key.
+
+        Parameters
+        ----------
+        key : str
+            One of the metadata columns name
+        thr : float
+            The value for thresholding
+        op : str, optional
+            The type of operation. Possibilities are '>', '<', '>=' or '<='.
+
+        Returns
+        -------
+        IntervalSet
+            The selected intervals with their metadata
+
+        Raises
+        ------
+        RuntimeError
+            Raise eror is operation is not recognized.
+
+        Examples
+        --------
+        >>> import pynapple as nap
+        >>> ep = nap.IntervalSet(start=[0, 10, 20], end=[5, 15, 25], metadata={"speed": [1, 5, 10]})
+        >>> ep.getby_threshold("speed", 2)
+              start    end    speed
+         0       10     15      5
+         1       20     25     10
+        shape: (2, 2), time unit: sec.
+        """
+        values = self._metadata[key]
+        if op == ">":
+            return self[values > thr]
+        elif op == "<":
+            return self[values < thr]
+        elif op == ">=":
+            return self[values >= thr]
+        elif op == "<=":
+            return self[values <= thr]
+        else:
+            raise RuntimeError("Operation {} not recognized.".format(op))
+
+    def getby_intervals(self, key, bins):
+        """
+        Return a list of IntervalSet binned by the values of the metadata under key.
+
+        Parameters
+        ----------
+        key : str
+            One of the metadata columns name
+        bins : numpy.ndarray or list
+            The bin intervals
+
+        Returns
+        -------
+        list
+            A list of IntervalSet
+        numpy.ndarray
+            The center of the non-empty bins
+        """
+        bins = np.asarray(bins)
+        idx = np.digitize(self._metadata[key], bins) - 1
+        ix = np.unique(idx)
+        ix = ix[(ix >= 0) & (ix < len(bins) - 1)]
+        xb = bins[0:-1] + np.diff(bins) / 2
+        sliced = [self[idx == i] for i in ix]
+        return sliced, xb[ix]
+
+    def getby_category(self, key):
+        """
+        Return a dictionary of IntervalSet grouped by the categories of the metadata under key.
+
+        Parameters
+        ----------
+        key : str
+            One of the metadata columns name
+
+        Returns
+        -------
+        dict
+            A dictionary of IntervalSet
+
+        Examples
+        --------
+        >>> import pynapple as nap
+        >>> ep = nap.IntervalSet(start=[0, 10, 20], end=[5, 15, 25], metadata={"stim": ["a", "b", "a"]})
+        >>> ep.getby_category("stim")
+        {'a':       start    end    stim
+         0        0      5     a
+         1       20     25     a
+        shape: (2, 2), time unit: sec.,
+         'b':       start    end    stim
+         0       10     15     b
+        shape: (1, 2), time unit: sec.}
+        """
+        categories, inverse = np.unique(self._metadata[key], return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        return {c: self[g] for c, g in zip(categories.tolist(), groups)}
+
     @classmethod
     def _from_npz_reader(cls, file):
         """Load an IntervalSet object from a npz file.
 
         The file should contain the keys 'start', 'end' and 'type'.
-        The 'type' key should be 'IntervalSet'.
+        The 'type' key should be 'IntervalSet'. Other keys with one value per
+        interval are loaded as metadata columns.
 
         Parameters
         ----------
@@ -397,7 +693,12 @@ class IntervalSet(NDArrayOperatorsMixin):
         IntervalSet
             The IntervalSet object
         """
-        return cls(start=file["start"], end=file["end"])
+        metadata = {}
+        for k in set(file.keys()) - {"start", "end", "type"}:
+            tmp = file[k]
+            if tmp.ndim == 1 and len(tmp) == len(file["start"]):
+                metadata[k] = tmp
+        return cls(start=file["start"], end=file["end"], metadata=metadata)
 
     def time_span(self):
         """
@@ -433,6 +734,8 @@ class IntervalSet(NDArrayOperatorsMixin):
         """
         Set intersection of IntervalSet
 
+        The metadata of self are carried to the new intervals.
+
         Parameters
         ----------
         a : IntervalSet
@@ -447,13 +750,24 @@ class IntervalSet(NDArrayOperatorsMixin):
         end1 = self.values[:, 1]
         start2 = a.values[:, 0]
         end2 = a.values[:, 1]
-        s, e = jitintersect(start1, end1, start2, end2)
-        return IntervalSet(s, e)
+        s, e, idx, _ = jitintersect(start1, end1, start2, end2, return_index=True)
+        return self._derive(s, e, idx)
+
+    def _derive(self, start, end, idx):
+        """
+        Create a new IntervalSet from intervals that are each contained in one interval of self.
+        `idx` gives the index of the parent interval, whose metadata are carried to the new interval.
+        """
+        return IntervalSet(
+            start, end, metadata={k: v[idx] for k, v in self._metadata.items()}
+        )
 
     def union(self, a):
         """
         set union of IntervalSet
 
+        Metadata are not carried since intervals can be joined.
+
         Parameters
         ----------
         a : IntervalSet
@@ -475,6 +789,8 @@ class IntervalSet(NDArrayOperatorsMixin):
         """
         set difference of IntervalSet
 
+        The metadata of self are carried to the new intervals.
+
         Parameters
         ----------
         a : IntervalSet
@@ -489,8 +805,8 @@ class IntervalSet(NDArrayOperatorsMixin):
         end1 = self.values[:, 1]
         start2 = a.values[:, 0]
         end2 = a.values[:, 1]
-        s, e = jitdiff(start1, end1, start2, end2)
-        return IntervalSet(s, e)
+        s, e, idx = jitdiff(start1, end1, start2, end2, return_index=True)
+        return self._derive(s, e, idx)
 
     def in_interval(self, tsd):
         """
@@ -558,7 +874,8 @@ class IntervalSet(NDArrayOperatorsMixin):
 
     def as_units(self, units="s"):
         """
-        returns a pandas DataFrame with time expressed in the desired unit
+        returns a pandas DataFrame with time expressed in the desired unit.
+        Metadata columns are appended after the start and end columns.
 
         Parameters
         ----------
@@ -577,6 +894,8 @@ class IntervalSet(NDArrayOperatorsMixin):
             data = data.astype(np.int64)
 
         df = pd.DataFrame(index=self.index, data=data, columns=self.columns)
+        for k, v in self._metadata.items():
+            df[k] = v
 
         return df
 
@@ -643,24 +962,30 @@ class IntervalSet(NDArrayOperatorsMixin):
     def as_dataframe(self):
         """
         Convert the `IntervalSet` object to a pandas.DataFrame object.
+        Metadata columns are appended after the start and end columns.
 
         Returns
         -------
         out: pandas.DataFrame
             _
         """
-        return pd.DataFrame(data=self.values, columns=["start", "end"])
+        df = pd.DataFrame(data=self.values, columns=["start", "end"])
+        for k, v in self._metadata.items():
+            df[k] = v
+        return df
 
     def save(self, filename):
         """
-        Save IntervalSet object in npz format. The file will contain the starts and ends.
+        Save IntervalSet object in npz format. The file will contain the starts, the ends
+        and the metadata columns.
 
         The main purpose of this function is to save small/medium sized IntervalSet
         objects. For example, you determined some epochs for one session that you want to save
         to avoid recomputing them.
 
-        You can load the object with `nap.load_file`. Keys are 'start', 'end' and 'type'.
-        See the example below.
+        You can load the object with `nap.load_file`. Keys are 'start', 'end', 'type' and
+        the names of the metadata columns. Object columns are saved as strings and a
+        metadata column named 'type' cannot be saved. See the example below.
 
         Parameters
         ----------
@@ -688,11 +1013,22 @@ class IntervalSet(NDArrayOperatorsMixin):
         RuntimeError
             If filename is not str, path does not exist or filename is a directory.
         """
+        dicttosave = {}
+        for k, v in self._metadata.items():
+            if k == "type":
+                warnings.warn(
+                    "Metadata column 'type' conflicts with the npz key 'type' and is not saved.",
+                    stacklevel=2,
+                )
+                continue
+            dicttosave[k] = v.astype(np.str_) if v.dtype == np.dtype("O") else v
+
         np.savez(
             check_filename(filename),
             start=self.values[:, 0],
             end=self.values[:, 1],
             type=np.array(["IntervalSet"], dtype=np.str_),
+            **dicttosave,
         )
 
         return
@@ -703,6 +1039,7 @@ class IntervalSet(NDArrayOperatorsMixin):
         Used mostly for chunking very large dataset or looping throught multiple epoch of same duration.
 
         This function skips the epochs that are shorter than `interval_size`.
+        The metadata of each epoch are carried to the intervals it is split into.
 
         Note that intervals are strictly non-overlapping in pynapple. One microsecond is removed from contiguous intervals.
 
@@ -767,8 +1104,9 @@ class IntervalSet(NDArrayOperatorsMixin):
         tokeep = durations >= interval_size
         new_starts = new_starts[tokeep]
         new_ends = new_ends[tokeep]
+        parents = np.repeat(idxs, size_tmp - 1)[tokeep]
 
         # Removing 1 microsecond to have strictly non-overlapping intervals for intervals coming from the same epoch
         new_ends -= 1e-6
 
-        return IntervalSet(new_starts, new_ends)
+        return self._derive(new_starts, new_ends, parents)
@@ -26,7 +26,16 @@ from numpy.lib.mixins import NDArrayOperatorsMixin
 from scipy import signal
 from tabulate import tabulate
 
-from ._core_functions import _bin_average, _convolve, _dropna, _restrict, _threshold
+from ._core_functions import (
+    _bin_average,
+    _convolve,
+    _dropna,
+    _reduce_by_interval,
+    _restrict,
+    _rolling,
+    _threshold,
+    _threshold_columns,
+)
 from .base_class import Base
 from .interval_set import IntervalSet
 from .time_index import TsIndex
@@ -90,11 +99,13 @@ class BaseTsd(Base, NDArrayOperatorsMixin, abc.ABC):
             starts = time_support.start
             ends = time_support.end
             idx = _restrict(self.index.values, starts, ends)
-            t = self.index.values[idx]
-            d = self.values[idx]
+            # Lazy arrays are only indexed (and loaded) if some timestamps are outside
+            if load_array or len(idx) < len(self.index):
+                t = self.index.values[idx]
+                d = self.values[idx]
 
-            self.index = TsIndex(t)
-            self.values = d
+                self.index = TsIndex(t)
+                self.values = d
             self.rate = self.index.shape[0] / np.sum(
                 time_support.values[:, 1] - time_support.values[:, 0]
             )
@@ -424,6 +435,195 @@ class BaseTsd(Base, NDArrayOperatorsMixin, abc.ABC):
 
         return self.__class__(t=t, d=d, time_support=ep, **kwargs)
 
+    def reduce_by_interval(self, iset, ops="mean"):
+        """
+        Reduce the data within each interval of an IntervalSet.
+
+        All reductions are computed in a single pass over the samples of each interval,
+        for all columns at once, without creating a restricted copy per interval.
+        The result has one row per interval and is indexed by the center of the intervals.
+
+        Supported operations are 'mean', 'sum', 'std', 'var', 'min', 'max', 'argmin' and 'argmax'.
+        A number between 0 and 100 is interpreted as a percentile.
+        'argmin' and 'argmax' return the timestamp of the extremum within each interval.
+
+        Intervals without any sample return 0 for 'sum' and NaN for the other operations.
+        NaN values propagate as in numpy: any NaN within an interval gives NaN for all operations
+        and the timestamp of the first NaN for 'argmin' and 'argmax'.
+
+        Parameters
+        ----------
+        iset : IntervalSet
+            The intervals to reduce over.
+        ops : str, float or list, optional
+            The reduction(s) to compute (default is 'mean')
+
+        Returns
+        -------
+        out: Tsd, TsdFrame, TsdTensor or dict
+            If ops is a single operation, a time series of the same type with one row per interval.
+            If ops is a list, a dictionary of time series keyed by operation.
+
+        Raises
+        ------
+        IOError
+            If iset is not an IntervalSet.
+        ValueError
+            If an operation is not recognized.
+
+        Examples
+        --------
+        >>> import pynapple as nap
+        >>> import numpy as np
+        >>> tsd = nap.Tsd(t=np.arange(100), d=np.arange(100))
+        >>> ep = nap.IntervalSet(start=[0, 50], end=[9, 59])
+        >>> tsd.reduce_by_interval(ep, "mean")
+        Time (s)
+        ----------  ----
+        4.5          4.5
+        54.5        54.5
+        dtype: float64, shape: (2,)
+
+        Several reductions can be computed at once:
+
+        >>> out = tsd.reduce_by_interval(ep, ["max", "argmax", 90])
+        >>> out["argmax"]
+        Time (s)
+        ----------  --
+        4.5          9
+        54.5        59
+        dtype: float64, shape: (2,)
+        """
+        if not isinstance(iset, IntervalSet):
+            raise IOError("iset should be an object of type IntervalSet")
+
+        single = isinstance(ops, (str, Number))
+        ops = [ops] if single else list(ops)
+
+        valid = ["mean", "sum", "std", "var", "min", "max", "argmin", "argmax"]
+        for op in ops:
+            if isinstance(op, str):
+                if op not in valid:
+                    raise ValueError(
+                        "Unknown operation {}. Should be a number between 0 and 100 or one of {}".format(
+                            op, valid
+                        )
+                    )
+            elif not isinstance(op, Number) or not 0 <= op <= 100:
+                raise ValueError(
+                    "Percentile {} should be a number between 0 and 100".format(op)
+                )
+
+        time_array = self.index.values
+        starts = iset.start
+        ends = iset.end
+
+        out = _reduce_by_interval(time_array, self.values, starts, ends, ops)
+
+        t = starts + (ends - starts) / 2
+
+        kwargs = {}
+        if hasattr(self, "columns"):
+            kwargs["columns"] = self.columns
+
+        out = {
+            op: self.__class__(t=t, d=d, time_support=iset, **kwargs)
+            for op, d in out.items()
+        }
+
+        return out[ops[0]] if single else out
+
+    def rolling(self, window, stat="mean", time_units=None):
+        """
+        Compute a statistic over a trailing window for each time point.
+
+        Windows are computed independently within each epoch of the time support and never
+        cross an epoch boundary. Each column is processed in a single streaming pass.
+
+        If `time_units` is None, `window` is a number of samples and the first `window - 1`
+        points of each epoch are NaN. Otherwise `window` is a duration and each point
+        is computed over the samples within `(t - window, t]`.
+
+        Floating point data keep their dtype. Other dtypes are returned as float64.
+        A window containing a NaN returns NaN.
+
+        Parameters
+        ----------
+        window : int or float
+            The size of the window, in samples or in `time_units`
+        stat : str, optional
+            The statistic to compute : 'mean' [default], 'sum', 'var', 'min', 'max' or 'median'
+        time_units : None or str, optional
+            Time units of the window ('us', 'ms', 's'). If None [default], the window is in samples.
+
+        Returns
+        -------
+        Tsd, TsdFrame or TsdTensor
+            Time series with the same shape and time support
+
+        Raises
+        ------
+        ValueError
+            If `stat` is not recognized or if `window` is not strictly positive.
+        TypeError
+            If `window` is not an integer for a sample-based window.
+
+        Examples
+        --------
+        A rolling z-score over 100 samples:
+
+        >>> import pynapple as nap
+        >>> import numpy as np
+        >>> tsdframe = nap.TsdFrame(t=np.arange(1000), d=np.random.randn(1000, 4))
+        >>> mean = tsdframe.rolling(100, "mean")
+        >>> std = np.sqrt(tsdframe.rolling(100, "var"))
+        >>> zscore = (tsdframe - mean) / std
+
+        A rolling maximum over the last 2 seconds:
+
+        >>> maxi = tsdframe.rolling(2, "max", time_units="s")
+        """
+        valid = ["mean", "sum", "var", "min", "max", "median"]
+        if stat not in valid:
+            raise ValueError(
+                "Unknown statistic {}. Should be one of {}".format(stat, valid)
+            )
+
+        if not isinstance(window, Number) or isinstance(window, bool):
+            raise TypeError("window should be type int or float")
+        if window <= 0:
+            raise ValueError("window should be strictly positive")
+
+        if time_units is None:
+            if int(window) != window:
+                raise TypeError("window should be an integer number of samples")
+            window = int(window)
+        else:
+            window = TsIndex.format_timestamps(np.array([window]), time_units)[0]
+
+        time_array = self.index.values
+        data_array = self.values
+        starts = self.time_support.start
+        ends = self.time_support.end
+
+        d = _rolling(
+            time_array,
+            data_array,
+            starts,
+            ends,
+            window,
+            stat,
+            time_based=time_units is not None,
+        )
+
+        kwargs = {}
+        if hasattr(self, "columns"):
+            kwargs["columns"] = self.columns
+
+        return self.__class__(
+            t=time_array, d=d, time_support=self.time_support, **kwargs
+        )
+
     def dropna(self, update_time_support=True):
         """Drop every rows containing NaNs. By default, the time support is updated to start and end around the time points that are non NaNs.
         To change this behavior, you can set update_time_support=False.
@@ -1058,6 +1258,123 @@ class TsdFrame(BaseTsd):
         df.columns = self.columns.copy()
         return df
 
+    def threshold(
+        self,
+        thr,
+        method="above",
+        off_thr=None,
+        min_duration=None,
+        time_units="s",
+        output="intervals",
+    ):
+        """
+        Apply a threshold to every column at once and return the epochs
+        above/below/>=/<= the threshold for each column.
+
+        Thresholds can be set per column. With `off_thr`, an epoch starts when the data
+        crosses `thr` and lasts until it crosses back `off_thr` (hysteresis).
+        Epoch boundaries follow the same convention as `Tsd.threshold`.
+
+        Parameters
+        ----------
+        thr : float or array_like
+            The threshold value, either one for all columns or one per column
+        method : str, optional
+            The threshold method ("above"[default], "below", "aboveequal", "belowequal")
+        off_thr : None, float or array_like, optional
+            The threshold ending an epoch. Default is `thr`. It should be less strict than `thr`,
+            i.e. lower for "above" methods and higher for "below" methods.
+        min_duration : None or float, optional
+            Epochs shorter than min_duration are dropped
+        time_units : str, optional
+            Time units of min_duration ('us', 'ms', 's' [default])
+        output : str, optional
+            "intervals" [default] returns a dictionary of IntervalSet keyed by column.
+            "table" returns a pandas.DataFrame with columns start, end and channel sorted by start.
+
+        Returns
+        -------
+        dict or pandas.DataFrame
+            The epochs of each column
+
+        Raises
+        ------
+        ValueError
+            If method or output are unknown, if the number of thresholds does not match
+            the number of columns or if off_thr is stricter than thr.
+
+        Examples
+        --------
+        >>> import pynapple as nap
+        >>> import numpy as np
+        >>> tsdframe = nap.TsdFrame(t=np.arange(1000), d=np.random.randn(1000, 4))
+        >>> epochs = tsdframe.threshold([1, 1.5, 2, 2.5], off_thr=0.5, min_duration=2)
+        >>> epochs[0]
+                    start    end
+               0     12.5   16.5
+               1     37.5   40.5
+               ...
+
+        The same epochs as a single table:
+
+        >>> tsdframe.threshold([1, 1.5, 2, 2.5], off_thr=0.5, min_duration=2, output="table")
+             start    end  channel
+        0     12.5   16.5        0
+        1     20.5   25.5        2
+        ...
+        """
+        if method not in ["above", "below", "aboveequal", "belowequal"]:
+            raise ValueError(
+                "Method {} for thresholding is not accepted.".format(method)
+            )
+        if output not in ["intervals", "table"]:
+            raise ValueError(
+                "Output {} is not accepted. Should be 'intervals' or 'table'.".format(
+                    output
+                )
+            )
+
+        n = self.shape[1]
+        on = np.asarray(thr, dtype=np.float64)
+        off = on if off_thr is None else np.asarray(off_thr, dtype=np.float64)
+        if any(x.ndim > 0 and x.shape != (n,) for x in (on, off)):
+            raise ValueError("Thresholds should be a number or one per column.")
+        on = np.broadcast_to(on, (n,)).copy()
+        off = np.broadcast_to(off, (n,)).copy()
+        if np.any(off > on if method.startswith("above") else off < on):
+            raise ValueError("off_thr should be less strict than thr.")
+
+        time_array = self.index.values
+        starts = self.time_support.start
+        ends = self.time_support.end
+
+        ns, ne, offsets = _threshold_columns(
+            time_array, self.values, starts, ends, on, off, method
+        )
+        channel = np.repeat(np.arange(n), np.diff(offsets))
+
+        if min_duration is not None:
+            min_duration = TsIndex.format_timestamps(
+                np.array([min_duration]), time_units
+            )[0]
+            keep = (ne - ns) >= min_duration
+            ns, ne, channel = ns[keep], ne[keep], channel[keep]
+
+        if output == "table":
+            order = np.argsort(ns, kind="stable")
+            return pd.DataFrame(
+                {
+                    "start": ns[order],
+                    "end": ne[order],
+                    "channel": self.columns.values[channel[order]],
+                }
+            )
+
+        return {
+            c: IntervalSet(start=ns[channel == i], end=ne[channel == i])
+            for i, c in enumerate(self.columns)
+        }
+
     def save(self, filename):
         """
         Save TsdFrame object in npz format. The file will contain the timestamps, the
@@ -161,7 +161,7 @@ class TsGroup(UserDict):
 
         # If time_support is passed, all elements of data are restricted prior to init
         if passed_time_support:
-            self.time_support = time_support
+            self.time_support = time_support._drop_metadata()
             if not bypass_check:
                 data = {k: data[k].restrict(self.time_support) for k in self.index}
         else:
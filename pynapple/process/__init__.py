@@ -3,14 +3,18 @@ from .correlograms import (
     compute_crosscorrelogram,
     compute_eventcorrelogram,
 )
-from .decoding import decode_1d, decode_2d
+from .decoding import OnlineDecoder, decode_1d, decode_2d, decode_cv
+from .detection import detect_oscillatory_events
 from .filtering import (
+    StreamingFilter,
     apply_bandpass_filter,
     apply_bandstop_filter,
+    apply_filter_bank,
     apply_highpass_filter,
     apply_lowpass_filter,
     get_filter_frequency_response,
 )
+from .hilbert import compute_hilbert
 from .perievent import (
     compute_event_trigger_average,
     compute_perievent,
@@ -24,7 +28,10 @@ from .randomize import (
 )
 from .spectrum import (
     compute_mean_power_spectral_density,
+    compute_multitaper_power_spectral_density,
     compute_power_spectral_density,
+    compute_spectrogram,
+    compute_welch_power_spectral_density,
 )
 from .tuning_curves import (
     compute_1d_mutual_info,
@@ -34,5 +41,8 @@ from .tuning_curves import (
     compute_2d_tuning_curves,
     compute_2d_tuning_curves_continuous,
     compute_discrete_tuning_curves,
+    compute_nd_tuning_curves,
+    compute_phase_locking,
+    compute_tuning_significance,
 )
 from .wavelets import compute_wavelet_transform, generate_morlet_filterbank
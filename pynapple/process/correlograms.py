@@ -4,14 +4,56 @@ from itertools import combinations, product
 
 import numpy as np
 import pandas as pd
-from numba import jit
+from numba import jit, prange
+from scipy.fft import irfft, next_fast_len, rfft
 
 from .. import core as nap
 
+_CORRELOGRAM_MEMORY = 2**30
+
 
 #########################################################
 # CORRELATION
 #########################################################
+def _get_nbins(binsize, windowsize):
+    nbins = int((windowsize * 2) // binsize)
+    if np.floor(nbins / 2) * 2 == nbins:
+        nbins = nbins + 1
+    return nbins
+
+
+@jit(nopython=True)
+def _correlogram_counts(t1, t2, binsize, C):
+    """
+    Add to C the number of t2 events within each bin around each t1 event.
+    The window is centered on 0 and spans len(C) bins.
+
+    For each t1 event, the t2 events within the window are histogrammed directly
+    by computing their bin index, i.e. O(len(t1) + number of matches).
+    """
+    nt1 = len(t1)
+    nt2 = len(t2)
+    nbins = len(C)
+
+    w = (nbins / 2) * binsize
+    i2 = 0
+
+    for i1 in range(nt1):
+        lbound = t1[i1] - w
+        while i2 < nt2 and t2[i2] < lbound:
+            i2 = i2 + 1
+
+        k = i2
+        while k < nt2:
+            j = int(np.floor((t2[k] - lbound) / binsize))
+            if j >= nbins:
+                break
+            C[j] += 1
+            k = k + 1
+
+    return C
+
+
 @jit(nopython=True)
 def _cross_correlogram(t1, t2, binsize, windowsize):
     """
@@ -43,33 +85,13 @@ def _cross_correlogram(t1, t2, binsize, windowsize):
     # nbins = ((windowsize//binsize)*2)
 
     nt1 = len(t1)
-    nt2 = len(t2)
 
     nbins = int((windowsize * 2) // binsize)
     if np.floor(nbins / 2) * 2 == nbins:
         nbins = nbins + 1
 
     w = (nbins / 2) * binsize
-    C = np.zeros(nbins)
-    i2 = 0
-
-    for i1 in range(nt1):
-        lbound = t1[i1] - w
-        while i2 < nt2 and t2[i2] < lbound:
-            i2 = i2 + 1
-        while i2 > 0 and t2[i2 - 1] > lbound:
-            i2 = i2 - 1
-
-        rbound = lbound
-        leftb = i2
-        for j in range(nbins):
-            k = 0
-            rbound = rbound + binsize
-            while leftb < nt2 and t2[leftb] < rbound:
-                leftb = leftb + 1
-                k = k + 1
-
-            C[j] += k
+    C = _correlogram_counts(t1, t2, binsize, np.zeros(nbins))
 
     C = C / (nt1 * binsize)
 
@@ -81,6 +103,303 @@ def _cross_correlogram(t1, t2, binsize, windowsize):
     return C, B
 
 
+@jit(nopython=True, parallel=True)
+def _cross_correlogram_pairs(times, offsets, pairs, binsize, nbins):
+    """
+    Counts of the cross-correlograms of all the pairs in parallel.
+    The timestamps of all the units are packed in times and the
+    timestamps of unit i are times[offsets[i]:offsets[i+1]].
+    """
+    n_pairs = pairs.shape[0]
+    C = np.zeros((n_pairs, nbins))
+    for p in prange(n_pairs):
+        i = pairs[p, 0]
+        j = pairs[p, 1]
+        _correlogram_counts(
+            times[offsets[i] : offsets[i + 1]],
+            times[offsets[j] : offsets[j + 1]],
+            binsize,
+            C[p],
+        )
+    return C
+
+
+@jit(nopython=True)
+def _surrogate_timestamps(t, mode, jitter, starts, ends):
+    """
+    Surrogate of the timestamps t within the epochs defined by starts and ends :
+    0 : each timestamp is jittered uniformly within [-jitter, jitter], restricted to its epoch
+    1 : each timestamp is drawn uniformly within its interval of a grid of size jitter,
+        restricted to its epoch
+    2 : all the timestamps are shifted by the same amount within [-jitter, jitter],
+        wrapping around the concatenation of the epochs (gaps between epochs are skipped)
+    Timestamps outside of the epochs are first moved to the closest edge of the previous epoch.
+    """
+    n = len(t)
+    new_t = np.empty(n)
+    k = np.searchsorted(starts, t, side="right") - 1
+    k = np.maximum(k, 0)
+
+    if mode == 2:
+        # Time elapsed within the epochs
+        cum = np.zeros(len(starts) + 1)
+        cum[1:] = np.cumsum(ends - starts)
+        shift = np.random.uniform(-jitter, jitter)
+        for i in range(n):
+            u = min(max(t[i], starts[k[i]]), ends[k[i]]) - starts[k[i]] + cum[k[i]]
+            u = np.mod(u + shift, cum[-1])
+            kk = min(np.searchsorted(cum, u, side="right") - 1, len(starts) - 1)
+            new_t[i] = starts[kk] + u - cum[kk]
+        return np.sort(new_t)
+
+    for i in range(n):
+        ti = min(max(t[i], starts[k[i]]), ends[k[i]])
+        if mode == 0:
+            lo, hi = ti - jitter, ti + jitter
+        else:
+            lo = np.floor(ti / jitter) * jitter
+            hi = lo + jitter
+        new_t[i] = np.random.uniform(max(lo, starts[k[i]]), min(hi, ends[k[i]]))
+    return np.sort(new_t)
+
+
+@jit(nopython=True)
+def _percentile_sorted(x, q):
+    """Percentile q (between 0 and 1) of the sorted array x with linear interpolation."""
+    pos = q * (len(x) - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(x) - 1)
+    return x[lo] + (pos - lo) * (x[hi] - x[lo])
+
+
+@jit(nopython=True, parallel=True)
+def _cross_correlogram_surrogates(
+    times,
+    offsets,
+    pairs,
+    binsize,
+    nbins,
+    n_surrogates,
+    mode,
+    jitter,
+    starts,
+    ends,
+    alpha,
+    seed,
+):
+    """
+    Counts of the cross-correlograms of all the pairs with surrogates of the target timestamps.
+    Only the statistics of the surrogates are kept for each pair : the mean, the pointwise
+    confidence band at level alpha and the two-sided pointwise p-value of the observed counts.
+    """
+    n_pairs = pairs.shape[0]
+    C = np.zeros((n_pairs, nbins))
+    mean = np.zeros((n_pairs, nbins))
+    lower = np.zeros((n_pairs, nbins))
+    upper = np.zeros((n_pairs, nbins))
+    pvalue = np.ones((n_pairs, nbins))
+
+    for p in prange(n_pairs):
+        # One seed per pair for reproducibility across threads
+        np.random.seed(seed + p)
+
+        t1 = times[offsets[pairs[p, 0]] : offsets[pairs[p, 0] + 1]]
+        t2 = times[offsets[pairs[p, 1]] : offsets[pairs[p, 1] + 1]]
+        _correlogram_counts(t1, t2, binsize, C[p])
+
+        S = np.zeros((n_surrogates, nbins))
+        for k in range(n_surrogates):
+            t2s = _surrogate_timestamps(t2, mode, jitter, starts, ends)
+            _correlogram_counts(t1, t2s, binsize, S[k])
+
+        for j in range(nbins):
+            x = np.sort(S[:, j])
+            mean[p, j] = np.mean(x)
+            lower[p, j] = _percentile_sorted(x, alpha / 2)
+            upper[p, j] = _percentile_sorted(x, 1 - alpha / 2)
+            dev = np.abs(C[p, j] - mean[p, j])
+            extreme = np.sum(np.abs(S[:, j] - mean[p, j]) >= dev)
+            pvalue[p, j] = (1 + extreme) / (1 + n_surrogates)
+
+    return C, mean, lower, upper, pvalue
+
+
+def _fft_length(binsize, nbins, starts, ends):
+    """FFT length of the binned timestamps of each epoch."""
+    nb = (
+        np.floor((np.asarray(ends) - np.asarray(starts)) / binsize).astype(np.int64) + 1
+    )
+    return nb, np.array(
+        [next_fast_len(int(k) + nbins // 2) for k in nb], dtype=np.int64
+    )
+
+
+def _cross_correlogram_fft(times, pairs, binsize, nbins, starts, ends):
+    """
+    Counts of the cross-correlograms of all the pairs from the correlation of the
+    binned timestamps, computed with FFTs within each epoch.
+    Lags are quantized to multiples of binsize.
+    """
+    half = nbins // 2
+    C = np.zeros((len(pairs), nbins))
+    for s, e, nb, n in zip(starts, ends, *_fft_length(binsize, nbins, starts, ends)):
+        counts = np.zeros((nb, len(times)))
+        for i, t in enumerate(times):
+            t = t[(t >= s) & (t <= e)]
+            counts[:, i] = np.bincount(
+                np.floor((t - s) / binsize).astype(np.int64), minlength=nb
+            )[0:nb]
+
+        X = rfft(counts, n, axis=0)
+
+        # Pairs are processed by blocks to bound memory
+        block = max(1, _CORRELOGRAM_MEMORY // (np.dtype(np.complex128).itemsize * n))
+        for p in range(0, len(pairs), block):
+            i, j = pairs[p : p + block].T
+            c = irfft(np.conj(X[:, i]) * X[:, j], n, axis=0)
+            C[p : p + block] += np.concatenate([c[n - half :], c[0 : half + 1]]).T
+
+    return np.rint(C)
+
+
+def _pack_timestamps(times):
+    """Concatenate a list of timestamps arrays. Returns the packed array and the offsets."""
+    offsets = np.concatenate([[0], np.cumsum([len(t) for t in times])]).astype(np.int64)
+    if len(times):
+        return np.concatenate(times).astype(np.float64), offsets
+    return np.zeros(0), offsets
+
+
+def _mirror_pairs(pairs, *counts):
+    """
+    Append the reversed pairs (j, i) to the pairs (i, j). The counts of (j, i) are the
+    counts of (i, j) with the lag axis reversed.
+    """
+    return np.concatenate([pairs, pairs[:, ::-1]]), [
+        np.concatenate([c, c[:, ::-1]]) for c in counts
+    ]
+
+
+def _crosscorrelograms(
+    times,
+    pairs,
+    binsize,
+    windowsize,
+    method="direct",
+    starts=None,
+    ends=None,
+    mirror=False,
+):
+    """
+    Cross-correlograms of all the pairs of a list of timestamps arrays.
+
+    With method "direct", pairs are sorted by reference so that consecutive pairs processed by
+    the same thread reuse the timestamps of the reference.
+    With method "fft", the timestamps are binned within the epochs defined by starts and ends.
+    If the binned counts of an epoch would take more than `_CORRELOGRAM_MEMORY` bytes for all the units,
+    the method "direct" is used instead.
+    If mirror is True, the reversed pairs are appended after the pairs without being computed.
+
+    Returns
+    -------
+    numpy.ndarray
+        The cross-correlograms of shape (n_bins, n_pairs)
+    numpy.ndarray
+        Center of the bins (in s)
+    """
+    nbins = _get_nbins(binsize, windowsize)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    count = np.array([len(t) for t in times], dtype=np.int64)
+
+    if method == "fft" and len(starts):
+        # The binned counts and their spectra hold about 16 bytes per bin and per unit
+        n = np.max(_fft_length(binsize, nbins, starts, ends)[1])
+        if 16 * n * len(times) > _CORRELOGRAM_MEMORY:
+            method = "direct"
+
+    if method == "fft":
+        C = _cross_correlogram_fft(times, pairs, binsize, nbins, starts, ends)
+    else:
+        packed, offsets = _pack_timestamps(times)
+        order = np.argsort(pairs[:, 0], kind="stable")
+        C = np.zeros((len(pairs), nbins))
+        C[order] = _cross_correlogram_pairs(
+            packed, offsets, pairs[order], binsize, nbins
+        )
+    if mirror:
+        pairs, (C,) = _mirror_pairs(pairs, C)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        C = C / (count[pairs[:, 0], None] * binsize)
+
+    w = (nbins / 2) * binsize
+    B = -w + binsize / 2 + np.arange(nbins) * binsize
+
+    return C.T, B
+
+
+def _crosscorrelograms_surrogates(
+    times,
+    pairs,
+    binsize,
+    windowsize,
+    n_surrogates,
+    surrogate,
+    jitter,
+    starts,
+    ends,
+    alpha,
+    seed,
+):
+    """
+    Cross-correlograms of all the pairs of a list of timestamps arrays and statistics
+    of the cross-correlograms of surrogates of the targets.
+
+    Returns
+    -------
+    dict
+        The cross-correlograms, the mean, the lower and upper bounds of the surrogates
+        and the p-values, each of shape (n_bins, n_pairs)
+    numpy.ndarray
+        Center of the bins (in s)
+    """
+    nbins = _get_nbins(binsize, windowsize)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    packed, offsets = _pack_timestamps(times)
+    count = np.diff(offsets)
+
+    mode = ["jitter", "interval_jitter", "shift"].index(surrogate)
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    if jitter is None:
+        jitter = np.sum(ends - starts)
+
+    out = _cross_correlogram_surrogates(
+        packed,
+        offsets,
+        pairs,
+        binsize,
+        nbins,
+        n_surrogates,
+        mode,
+        jitter,
+        starts,
+        ends,
+        alpha,
+        seed,
+    )
+    out = dict(zip(["crosscorrs", "mean", "lower", "upper", "pvalue"], out))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for k in ["crosscorrs", "mean", "lower", "upper"]:
+            out[k] = out[k] / (count[pairs[:, 0], None] * binsize)
+    out = {k: v.T for k, v in out.items()}
+
+    w = (nbins / 2) * binsize
+    B = -w + binsize / 2 + np.arange(nbins) * binsize
+
+    return out, B
+
+
 def compute_autocorrelogram(
     group, binsize, windowsize, ep=None, norm=True, time_units="s"
 ):
@@ -152,8 +471,108 @@ def compute_autocorrelogram(
     return autocorrs.astype("float")
 
 
+def _get_crosscorrelogram_pairs(group, ep, reverse, all_pairs, mirror):
+    """
+    Timestamps, pairs and target rates for compute_crosscorrelogram.
+    ref_pos and tgt_pos are the positions of each pair in the references and targets keys
+    and idx are the positions of each pair in times.
+    For a single TsGroup, all_pairs gives all the ordered pairs. With mirror, idx only holds
+    the combinations (i, j) to compute while ref_pos and tgt_pos also hold the reversed
+    pairs (j, i) that follow them.
+    """
+    if isinstance(group, nap.TsGroup):
+        if isinstance(ep, nap.IntervalSet):
+            newgroup = group.restrict(ep)
+        else:
+            newgroup = group
+        references = targets = list(newgroup.keys())
+        times = [newgroup[n].index for n in references]
+        rates = newgroup.get_info("rate").values
+        support = newgroup.time_support
+
+        if all_pairs and not mirror:
+            pairs = [
+                p for p in product(range(len(references)), repeat=2) if p[0] != p[1]
+            ]
+        else:
+            pairs = list(combinations(range(len(references)), 2))
+            if reverse and not all_pairs:
+                pairs = [(j, i) for i, j in pairs]
+        ref_pos, tgt_pos = np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+        idx = np.stack([ref_pos, tgt_pos], 1)
+        if all_pairs and mirror:
+            ref_pos, tgt_pos = _mirror_pairs(idx)[0].T
+
+    elif (
+        isinstance(group, (tuple, list))
+        and len(group) == 2
+        and all(map(lambda g: isinstance(g, nap.TsGroup), group))
+    ):
+        if isinstance(ep, nap.IntervalSet):
+            newgroup = [group[i].restrict(ep) for i in range(2)]
+        else:
+            newgroup = group
+
+        references = list(newgroup[0].keys())
+        targets = list(newgroup[1].keys())
+        times = [newgroup[0][n].index for n in references]
+        times += [newgroup[1][n].index for n in targets]
+        rates = np.array([newgroup[1][n].rate for n in targets])
+        support = newgroup[0].time_support.intersect(newgroup[1].time_support)
+
+        pairs = list(product(range(len(references)), range(len(targets))))
+        ref_pos, tgt_pos = np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+        idx = np.stack([ref_pos, tgt_pos + len(references)], 1)
+
+    else:
+        raise RuntimeError("Unknown format for group")
+
+    return references, targets, times, rates, support, ref_pos, tgt_pos, idx
+
+
+def _validate_crosscorrelogram_inputs(output, method, n_surrogates, surrogate, jitter):
+    if output not in ["dataframe", "array"]:
+        raise ValueError(
+            "Output {} is not accepted. Should be 'dataframe' or 'array'.".format(
+                output
+            )
+        )
+    if method not in ["direct", "fft"]:
+        raise ValueError(
+            "Method {} is not accepted. Should be 'direct' or 'fft'.".format(method)
+        )
+    if not isinstance(n_surrogates, int) or n_surrogates < 0:
+        raise ValueError("n_surrogates should be a positive integer.")
+    if n_surrogates > 0:
+        if method != "direct":
+            raise ValueError("Surrogates are only available with method 'direct'.")
+        if surrogate not in ["jitter", "interval_jitter", "shift"]:
+            raise ValueError(
+                "Surrogate {} is not accepted. Should be 'jitter', 'interval_jitter' or 'shift'.".format(
+                    surrogate
+                )
+            )
+        if surrogate != "shift" and jitter is None:
+            raise ValueError(
+                "jitter should be provided for surrogate '{}'.".format(surrogate)
+            )
+
+
 def compute_crosscorrelogram(
-    group, binsize, windowsize, ep=None, norm=True, time_units="s", reverse=False
+    group,
+    binsize,
+    windowsize,
+    ep=None,
+    norm=True,
+    time_units="s",
+    reverse=False,
+    output="dataframe",
+    method="direct",
+    n_surrogates=0,
+    surrogate="jitter",
+    jitter=None,
+    alpha=0.05,
+    seed=None,
 ):
     """
     Computes all the pairwise cross-correlograms for TsGroup or list/tuple of two TsGroup.
@@ -165,6 +584,18 @@ def compute_crosscorrelogram(
 
     If input is tuple/list of TsGroup, for example group=(group1, group2), the reference for each pairs comes from group1.
 
+    All the pairs are computed in parallel and written in a single array.
+
+    If n_surrogates > 0, the cross-correlograms are also computed for surrogates of the target time series
+    generated within the kernel, and their statistics are returned along the cross-correlograms.
+    The surrogate timestamps stay within the epochs of the time support (or `ep`) :
+
+    - `"jitter"` : each timestamp is jittered uniformly within [-jitter, jitter], without leaving its epoch.
+    - `"interval_jitter"` : each timestamp is drawn uniformly within its interval of a grid of size jitter,
+      without leaving its epoch.
+    - `"shift"` : all the timestamps are shifted by the same amount within [-jitter, jitter] (default is the
+      total duration of the epochs), wrapping around the concatenated epochs as if there were no gaps between them.
+
     Parameters
     ----------
     group : TsGroup or tuple/list of two TsGroups
@@ -182,82 +613,130 @@ def compute_crosscorrelogram(
         If True (default), cross-correlograms are normalized to baseline (i.e. divided by the average rate of the target time series)
         If False, cross-orrelograms are returned as the rate (Hz) of the target time series ((relative to the reference time series)
     time_units : str, optional
-        The time units of the parameters. They have to be consistent for binsize and windowsize.
+        The time units of the parameters. They have to be consistent for binsize, windowsize and jitter.
         ('s' [default], 'ms', 'us').
     reverse : bool, optional
         To reverse the pair order if input is TsGroup
+    output : str, optional
+        "dataframe" (default) returns a DataFrame with one column per pair.
+        "array" returns a tuple of a 3-D array of shape (n_bins, n_references, n_targets) and the center of the bins.
+        For a single TsGroup, all the ordered pairs are returned, the reference being the second axis,
+        and the diagonal is NaN. Without surrogates, only the pairs (i, j) with i < j are computed and the
+        cross-correlogram of (j, i) is the one of (i, j) with the lag axis reversed (lags falling exactly
+        on a bin edge are then counted in the other bin). With surrogates, all the ordered pairs are computed
+        so that the surrogates of (j, i) jitter the target i.
+    method : str, optional
+        "direct" (default) counts the exact lags between the timestamps.
+        "fft" correlates the timestamps binned at binsize within each epoch using FFTs. Lags are then
+        quantized to multiples of binsize, which approximates "direct". Its cost depends on the duration
+        of the epochs divided by binsize instead of the number of events within the window,
+        which pays off for high rates and wide windows. The binned counts of all the units are held in memory
+        for each epoch (about 16 bytes per bin and per unit). Above 1 GB, e.g. 1000 units binned at 1 ms for
+        more than about 1 min, "direct" is used instead.
+    n_surrogates : int, optional
+        Number of surrogates. Default is 0.
+    surrogate : str, optional
+        "jitter" (default), "interval_jitter" or "shift".
+    jitter : float, optional
+        The jitter or maximum shift of the surrogates.
+    alpha : float, optional
+        The pointwise confidence bands of the surrogates are the alpha / 2 and 1 - alpha / 2 percentiles. Default is 0.05.
+    seed : int, optional
+        Seed of the random generator. If None, it is drawn from numpy global random generator.
 
     Returns
     -------
-    pandas.DataFrame
-        _
+    pandas.DataFrame or (numpy.ndarray, numpy.ndarray)
+        The cross-correlograms, as a DataFrame or as a tuple (array, bin centers) for `output="array"`.
+        If n_surrogates == 0, this is the only returned value.
+    dict
+        Only if n_surrogates > 0, in which case the function returns a tuple `(crosscorrs, surrogates)`.
+        The keys "mean", "lower", "upper" and "pvalue" hold the mean of the surrogates, the confidence
+        bands and the two-sided pointwise p-values of the cross-correlograms, with the same format
+        as the cross-correlograms (DataFrame or array, without the bin centers).
 
     Raises
     ------
     RuntimeError
         group must be TsGroup or tuple/list of two TsGroups
+    ValueError
+        output must be "dataframe" or "array"
+        method must be "direct" or "fft"
+        surrogate must be "jitter", "interval_jitter" or "shift" and jitter must be provided for jitters.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> import numpy as np
+    >>> group = nap.TsGroup({i: nap.Ts(np.sort(np.random.uniform(0, 100, 1000))) for i in range(3)})
+    >>> cc, surrogates = nap.compute_crosscorrelogram(
+    ...     group, 0.001, 0.05, n_surrogates=1000, surrogate="jitter", jitter=0.005
+    ... )
+    >>> significant = surrogates["pvalue"] < 0.01
 
     """
-    crosscorrs = {}
-
-    binsize = nap.TsIndex.format_timestamps(
-        np.array([binsize], dtype=np.float64), time_units
-    )[0]
-    windowsize = nap.TsIndex.format_timestamps(
-        np.array([windowsize], dtype=np.float64), time_units
-    )[0]
-
-    if isinstance(group, nap.TsGroup):
-        if isinstance(ep, nap.IntervalSet):
-            newgroup = group.restrict(ep)
-        else:
-            newgroup = group
-        neurons = list(newgroup.keys())
-        pairs = list(combinations(neurons, 2))
-        if reverse:
-            pairs = list(map(lambda n: (n[1], n[0]), pairs))
-
-        for i, j in pairs:
-            spk1 = newgroup[i].index
-            spk2 = newgroup[j].index
-            auc, times = _cross_correlogram(spk1, spk2, binsize, windowsize)
-            crosscorrs[(i, j)] = pd.Series(index=times, data=auc, dtype="float")
-
-        crosscorrs = pd.DataFrame.from_dict(crosscorrs)
-
-        if norm:
-            freq = newgroup.get_info("rate")
-            freq2 = pd.Series(
-                index=pairs, data=list(map(lambda n: freq.loc[n[1]], pairs))
-            )
-            crosscorrs = crosscorrs / freq2
-
-    elif (
-        isinstance(group, (tuple, list))
-        and len(group) == 2
-        and all(map(lambda g: isinstance(g, nap.TsGroup), group))
-    ):
-        if isinstance(ep, nap.IntervalSet):
-            newgroup = [group[i].restrict(ep) for i in range(2)]
-        else:
-            newgroup = group
-
-        pairs = product(list(newgroup[0].keys()), list(newgroup[1].keys()))
-
-        for i, j in pairs:
-            spk1 = newgroup[0][i].index
-            spk2 = newgroup[1][j].index
-            auc, times = _cross_correlogram(spk1, spk2, binsize, windowsize)
-            if norm:
-                auc /= newgroup[1][j].rate
-            crosscorrs[(i, j)] = pd.Series(index=times, data=auc, dtype="float")
-
-        crosscorrs = pd.DataFrame.from_dict(crosscorrs)
+    _validate_crosscorrelogram_inputs(output, method, n_surrogates, surrogate, jitter)
+
+    binsize, windowsize = nap.TsIndex.format_timestamps(
+        np.array([binsize, windowsize], dtype=np.float64), time_units
+    )
+    if jitter is not None:
+        jitter = nap.TsIndex.format_timestamps(
+            np.array([jitter], dtype=np.float64), time_units
+        )[0]
+
+    # Surrogates jitter the target, so (j, i) is not the mirror of (i, j) and both are computed
+    mirror = output == "array" and isinstance(group, nap.TsGroup) and n_surrogates == 0
+    references, targets, times, rates, support, ref_pos, tgt_pos, idx = (
+        _get_crosscorrelogram_pairs(group, ep, reverse, output == "array", mirror)
+    )
+
+    if n_surrogates > 0:
+        if seed is None:
+            seed = np.random.randint(0, 2**31 - 1)
+        out, times = _crosscorrelograms_surrogates(
+            times,
+            idx,
+            binsize,
+            windowsize,
+            n_surrogates,
+            surrogate,
+            jitter,
+            support.start,
+            support.end,
+            alpha,
+            seed,
+        )
+    else:
+        crosscorrs, times = _crosscorrelograms(
+            times, idx, binsize, windowsize, method, support.start, support.end, mirror
+        )
+        out = {"crosscorrs": crosscorrs}
 
+    if norm:
+        for k in ["crosscorrs", "mean", "lower", "upper"]:
+            if k in out:
+                out[k] = out[k] / rates[tgt_pos]
+
+    if output == "array":
+        for k in out:
+            tmp = np.full((len(times), len(references), len(targets)), np.nan)
+            tmp[:, ref_pos, tgt_pos] = out[k]
+            out[k] = tmp
+        crosscorrs = (out.pop("crosscorrs"), times)
     else:
-        raise RuntimeError("Unknown format for group")
+        columns = pd.MultiIndex.from_arrays(
+            [[references[i] for i in ref_pos], [targets[j] for j in tgt_pos]]
+        )
+        for k in out:
+            out[k] = pd.DataFrame(index=times, data=out[k], columns=columns).astype(
+                "float"
+            )
+        crosscorrs = out.pop("crosscorrs")
 
-    return crosscorrs.astype("float")
+    if n_surrogates > 0:
+        return crosscorrs, out
+    return crosscorrs
 
 
 def compute_eventcorrelogram(
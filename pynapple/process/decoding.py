@@ -7,12 +7,124 @@
 """
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import pandas as pd
 
 from .. import core as nap
 
+# Memory budget (in bytes) of the temporary arrays of the decoders
+_DECODING_MEMORY = 2**27
+
+
+def _get_likelihood_terms(tc, occupancy, bin_size, dtype=np.float64):
+    """
+    Terms of the Poisson log-posterior `counts @ log_tc.T + offset`.
+    NaNs in the tuning curves are ignored. Bins with a null firing rate are flagged in zeros
+    since they have a null probability as soon as the neuron fires.
+
+    Parameters
+    ----------
+    tc : numpy.ndarray
+        Tuning curves of shape (n_bins, n_neurons)
+    occupancy : numpy.ndarray
+        Occupancy of shape (n_bins,)
+    bin_size : float
+        Bin size in seconds
+
+    Returns
+    -------
+    log_tc : numpy.ndarray
+        Log of the tuning curves with 0 for null and NaN values
+    offset : numpy.ndarray
+        Log prior minus the expected number of spikes
+    zeros : numpy.ndarray
+        Mask of the null values of the tuning curves
+    """
+    tc = np.asarray(tc, dtype=np.float64)
+    nans = np.isnan(tc)
+    zeros = tc == 0
+    with np.errstate(divide="ignore"):
+        log_tc = np.log(np.where(zeros | nans, 1.0, tc))
+        log_prior = np.log(occupancy / occupancy.sum())
+    offset = log_prior - bin_size * np.where(nans, 0.0, tc).sum(1)
+    return log_tc.astype(dtype), offset.astype(dtype), zeros
+
 
-def decode_1d(tuning_curves, group, ep, bin_size, time_units="s", feature=None):
+def _log_posterior(ct, log_tc, offset, zeros):
+    """Unnormalized log-posterior of the counts ct of shape (n_time_bins, n_neurons)."""
+    logp = ct @ log_tc.T + offset
+    if np.any(zeros):
+        impossible = (ct > 0).astype(log_tc.dtype) @ zeros.T.astype(log_tc.dtype)
+        logp[impossible > 0] = -np.inf
+    return logp
+
+
+def _normalize_log_posterior(logp):
+    """Exponentiate and normalize the log-posterior along the last axis."""
+    with np.errstate(invalid="ignore"):
+        p = np.exp(logp - np.max(logp, -1, keepdims=True))
+        return p / p.sum(-1, keepdims=True)
+
+
+def _decode(ct, tc, occupancy, bin_size, dtype=np.float64, chunk_size=None):
+    """
+    Bayesian decoding in the log domain, processed by chunks of time bins.
+
+    Parameters
+    ----------
+    ct : numpy.ndarray
+        Spike counts of shape (n_time_bins, n_neurons)
+    tc : numpy.ndarray
+        Tuning curves of shape (n_bins, n_neurons)
+    occupancy : numpy.ndarray
+        Occupancy of shape (n_bins,)
+    bin_size : float
+        Bin size in seconds
+    dtype : numpy.dtype, optional
+        Precision of the computation. Default is float64.
+    chunk_size : int, optional
+        Number of time bins decoded at once. Default is set by the memory budget.
+
+    Returns
+    -------
+    p : numpy.ndarray
+        The posterior of shape (n_time_bins, n_bins)
+    idxmax : numpy.ndarray
+        Index of the maximum of the posterior for each time bin
+    """
+    log_tc, offset, zeros = _get_likelihood_terms(tc, occupancy, bin_size, dtype)
+    n_time, n_bins = len(ct), len(tc)
+
+    if chunk_size is None:
+        itemsize = np.dtype(dtype).itemsize
+        chunk_size = _DECODING_MEMORY // (3 * itemsize * (n_bins + ct.shape[1]))
+    chunk_size = max(1, int(chunk_size))
+
+    p = np.zeros((n_time, n_bins), dtype=dtype)
+    idxmax = np.zeros(n_time, dtype=np.int64)
+    for i in range(0, n_time, chunk_size):
+        logp = _log_posterior(
+            np.asarray(ct[i : i + chunk_size], dtype=dtype), log_tc, offset, zeros
+        )
+        idxmax[i : i + chunk_size] = np.argmax(logp, 1)
+        p[i : i + chunk_size] = _normalize_log_posterior(logp)
+
+    return p, idxmax
+
+
+def decode_1d(
+    tuning_curves,
+    group,
+    ep,
+    bin_size,
+    time_units="s",
+    feature=None,
+    dtype=np.float64,
+    chunk_size=None,
+):
     """
     Performs Bayesian decoding over a one dimensional feature.
     See:
@@ -22,6 +134,9 @@ def decode_1d(tuning_curves, group, ep, bin_size, time_units="s", feature=None):
     hippocampal place cells. Journal of neurophysiology, 79(2),
     1017-1044.
 
+    The log-posterior is computed as the product of the spike counts with the log of the tuning curves,
+    by chunks of time bins. This bounds the memory and avoids underflows with many neurons.
+
     Parameters
     ----------
     tuning_curves : pandas.DataFrame
@@ -38,6 +153,11 @@ def decode_1d(tuning_curves, group, ep, bin_size, time_units="s", feature=None):
     feature : Tsd, optional
         The 1d feature used to compute the tuning curves. Used to correct for occupancy.
         If feature is not passed, the occupancy is uniform.
+    dtype : numpy.dtype, optional
+        Precision of the posterior. Default is float64. float32 halves the memory.
+    chunk_size : int, optional
+        Number of time bins decoded at once. By default, it is chosen to keep the temporary arrays
+        within a fixed memory budget.
 
     Returns
     -------
@@ -90,17 +210,7 @@ def decode_1d(tuning_curves, group, ep, bin_size, time_units="s", feature=None):
         np.array([bin_size], dtype=np.float64), time_units
     )[0]
 
-    p1 = np.exp(-bin_size_s * tc.sum(1))
-    p2 = occupancy / occupancy.sum()
-
-    ct2 = np.tile(ct[:, np.newaxis, :], (1, tc.shape[0], 1))
-
-    p3 = np.prod(tc**ct2, -1)
-
-    p = p1 * p2 * p3
-    p = p / p.sum(1)[:, np.newaxis]
-
-    idxmax = np.argmax(p, 1)
+    p, idxmax = _decode(ct, tc, occupancy, bin_size_s, dtype, chunk_size)
 
     p = nap.TsdFrame(
         t=count.index, d=p, time_support=ep, columns=tuning_curves.index.values
@@ -113,7 +223,17 @@ def decode_1d(tuning_curves, group, ep, bin_size, time_units="s", feature=None):
     return decoded, p
 
 
-def decode_2d(tuning_curves, group, ep, bin_size, xy, time_units="s", features=None):
+def decode_2d(
+    tuning_curves,
+    group,
+    ep,
+    bin_size,
+    xy,
+    time_units="s",
+    features=None,
+    dtype=np.float64,
+    chunk_size=None,
+):
     """
     Performs Bayesian decoding over a two dimensional feature.
     See:
@@ -123,6 +243,9 @@ def decode_2d(tuning_curves, group, ep, bin_size, xy, time_units="s", features=N
     hippocampal place cells. Journal of neurophysiology, 79(2),
     1017-1044.
 
+    The log-posterior is computed as the product of the spike counts with the log of the tuning curves,
+    by chunks of time bins. This bounds the memory and avoids underflows with many neurons.
+
     Parameters
     ----------
     tuning_curves : dict
@@ -140,6 +263,11 @@ def decode_2d(tuning_curves, group, ep, bin_size, xy, time_units="s", features=N
     features : TsdFrame
         The 2 columns features used to compute the tuning curves. Used to correct for occupancy.
         If feature is not passed, the occupancy is uniform.
+    dtype : numpy.dtype, optional
+        Precision of the posterior. Default is float64. float32 halves the memory.
+    chunk_size : int, optional
+        Number of time bins decoded at once. By default, it is chosen to keep the temporary arrays
+        within a fixed memory budget.
 
     Returns
     -------
@@ -210,17 +338,7 @@ def decode_2d(tuning_curves, group, ep, bin_size, xy, time_units="s", features=N
         np.array([bin_size], dtype=np.float64), time_units
     )[0]
 
-    p1 = np.exp(-bin_size_s * np.nansum(tc, 1))
-    p2 = occupancy / occupancy.sum()
-
-    ct2 = np.tile(ct[:, np.newaxis, :], (1, tc.shape[0], 1))
-
-    p3 = np.nanprod(tc**ct2, -1)
-
-    p = p1 * p2 * p3
-    p = p / p.sum(1)[:, np.newaxis]
-
-    idxmax = np.argmax(p, 1)
+    p, idxmax = _decode(ct, tc, occupancy, bin_size_s, dtype, chunk_size)
 
     p = p.reshape(p.shape[0], len(xy[0]), len(xy[1]))
 
@@ -239,3 +357,528 @@ def decode_2d(tuning_curves, group, ep, bin_size, xy, time_units="s", features=N
     )
 
     return decoded, p
+
+
+def _get_folds(folds, ep):
+    """
+    Test epochs of each fold, restricted to ep, as flat arrays of starts, ends and fold index
+    sorted by start.
+    """
+    if isinstance(folds, (int, np.integer)):
+        if folds < 2:
+            raise RuntimeError("folds should be at least 2")
+        # Contiguous blocks with the same duration within ep
+        cumdur = np.hstack(([0], np.cumsum(ep.end - ep.start)))
+        edges = np.linspace(0, cumdur[-1], folds + 1)
+        boundaries = np.interp(
+            edges, cumdur, np.hstack((ep.start, ep.end[-1])), right=ep.end[-1]
+        )
+        folds = [
+            ep.intersect(nap.IntervalSet(start=boundaries[i], end=boundaries[i + 1]))
+            for i in range(folds)
+        ]
+    elif isinstance(folds, nap.IntervalSet):
+        folds = [folds[i] for i in range(len(folds))]
+    elif isinstance(folds, (list, tuple)) and all(
+        isinstance(f, nap.IntervalSet) for f in folds
+    ):
+        folds = list(folds)
+    else:
+        raise RuntimeError(
+            "folds should be an int, an IntervalSet or a list of IntervalSet"
+        )
+
+    folds = [f.intersect(ep) for f in folds]
+    starts = np.hstack([f.start for f in folds])
+    ends = np.hstack([f.end for f in folds])
+    fold_id = np.hstack([np.full(len(f), i) for i, f in enumerate(folds)])
+    order = np.argsort(starts)
+    starts, ends, fold_id = starts[order], ends[order], fold_id[order]
+    keep = ends > starts
+    starts, ends, fold_id = starts[keep], ends[keep], fold_id[keep]
+
+    if np.any(starts[1:] < ends[:-1]):
+        raise RuntimeError("Folds should not overlap")
+
+    return starts, ends, fold_id.astype(np.int64), len(folds)
+
+
+def _assign_folds(t, starts, ends, fold_id, n_folds):
+    """Fold index of each timestamp, n_folds if it is not in any test epoch."""
+    idx = np.searchsorted(starts, t, side="right") - 1
+    inside = (idx >= 0) & (t <= ends[np.maximum(idx, 0)])
+    return np.where(inside, fold_id[np.maximum(idx, 0)], n_folds)
+
+
+def _fold_histograms(values, folds, bins, n_folds):
+    """Histogram of the values for each fold, the last row being outside of the folds."""
+    nb_bins = len(bins) - 1
+    idx = np.searchsorted(bins, values, side="right") - 1
+    idx[values == bins[-1]] = nb_bins - 1  # Last edge is included as in np.histogram
+    keep = (idx >= 0) & (idx < nb_bins)
+    return np.bincount(
+        folds[keep] * nb_bins + idx[keep], minlength=(n_folds + 1) * nb_bins
+    ).reshape(n_folds + 1, nb_bins)
+
+
+def decode_cv(
+    group,
+    feature,
+    nb_bins,
+    bin_size,
+    folds=5,
+    ep=None,
+    minmax=None,
+    time_units="s",
+    use_occupancy=False,
+    n_jobs=None,
+):
+    """
+    Cross-validated Bayesian decoding of a one dimensional feature.
+
+    For each fold, the tuning curves are computed as with `compute_1d_tuning_curves` on the feature restricted
+    to `ep` minus the test epochs of the fold (the sampling rate of the feature is the one of the training epochs)
+    and the feature is decoded as with `decode_1d` on the test epochs.
+
+    The spikes and the feature are binned once for all the folds. The spike counts and the occupancy of the
+    training set of a fold are obtained by subtracting the counts of the fold from the totals.
+    The folds are then decoded in parallel.
+
+    Parameters
+    ----------
+    group : TsGroup
+        The group of Ts/Tsd for which the tuning curves will be computed
+    feature : Tsd
+        The 1-dimensional target feature (e.g. head-direction)
+    nb_bins : int
+        Number of bins in the tuning curve
+    bin_size : float
+        Bin size of the decoding. Default is second. Use the parameter time_units to change it.
+    folds : int, IntervalSet or list of IntervalSet, optional
+        If an int, `ep` is split into this number of contiguous folds of equal duration [default 5].
+        If an IntervalSet, each interval is one fold (e.g. leave-one-trial-out).
+        If a list of IntervalSet, each IntervalSet is the test set of one fold.
+        Folds should not overlap. Samples on the boundary of a test epoch are only assigned to the test set.
+    ep : IntervalSet, optional
+        The epoch on which tuning curves are computed and decoding is performed.
+        If None, the epoch is the time support of the feature.
+    minmax : tuple, optional
+        The min and max boundaries of the tuning curves.
+        If None, the boundaries are inferred from the target feature
+    time_units : str, optional
+        Time unit of the bin size ('s' [default], 'ms', 'us').
+    use_occupancy : bool, optional
+        If True, the occupancy of the training set is used as prior. Default is False (uniform prior).
+    n_jobs : int, optional
+        Number of threads decoding the folds. Default is the number of CPUs.
+
+    Returns
+    -------
+    Tsd
+        The decoded feature on the test epochs of all the folds
+    TsdFrame
+        The probability distribution of the decoded feature for each time bin
+    pandas.DataFrame
+        Error metrics of each fold between the decoded feature and the average of the feature in each time bin:
+        number of time bins, mean absolute error, root mean square error and median absolute error.
+
+    Raises
+    ------
+    RuntimeError
+        If folds is not an int, an IntervalSet or a list of IntervalSet.
+        If folds overlap.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> decoded, proba, errors = nap.decode_cv(group, position, nb_bins=40, bin_size=0.2, folds=trials)
+    >>> errors["mae"].mean()
+    """
+    assert isinstance(group, nap.TsGroup), "group should be a TsGroup."
+    assert isinstance(feature, nap.Tsd), "feature should be a Tsd"
+    assert isinstance(nb_bins, int)
+
+    if ep is None:
+        ep = feature.time_support
+    else:
+        assert isinstance(ep, nap.IntervalSet), "ep should be an IntervalSet"
+
+    if minmax is None:
+        bins = np.linspace(np.min(feature), np.max(feature), nb_bins + 1)
+    else:
+        assert isinstance(minmax, tuple), "minmax should be a tuple of boundaries"
+        bins = np.linspace(minmax[0], minmax[1], nb_bins + 1)
+    idx = bins[0:-1] + np.diff(bins) / 2
+
+    starts, ends, fold_id, n_folds = _get_folds(folds, ep)
+
+    # Occupancy and spike counts per fold, computed once
+    feat = feature.restrict(ep)
+    occupancy = _fold_histograms(
+        feat.values,
+        _assign_folds(feat.index.values, starts, ends, fold_id, n_folds),
+        bins,
+        n_folds,
+    )
+    counts = np.zeros((n_folds + 1, nb_bins, len(group)))
+    for i, v in enumerate(group.value_from(feature, ep).values()):
+        counts[:, :, i] = _fold_histograms(
+            v.values,
+            _assign_folds(v.index.values, starts, ends, fold_id, n_folds),
+            bins,
+            n_folds,
+        )
+
+    # Time bins of the test epochs of each fold, aligned on the start of each test epoch
+    test_eps = [
+        nap.IntervalSet(start=starts[fold_id == f], end=ends[fold_id == f])
+        for f in range(n_folds)
+    ]
+    counts_test = [group.count(bin_size, e, time_units) for e in test_eps]
+
+    bin_size_s = nap.TsIndex.format_timestamps(
+        np.array([bin_size], dtype=np.float64), time_units
+    )[0]
+
+    # Sampling rate of the feature on the training epochs, as in compute_1d_tuning_curves
+    rates = [feature.restrict(ep.set_diff(e)).rate for e in test_eps]
+
+    def decode_fold(f):
+        occ = occupancy.sum(0) - occupancy[f]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tc = (counts.sum(0) - counts[f]) / occ[:, None] * rates[f]
+        prior = occ if use_occupancy else np.ones(nb_bins)
+        return _decode(counts_test[f].values, tc, prior, bin_size_s)
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max(1, min(n_jobs, n_folds))) as pool:
+        results = list(pool.map(decode_fold, range(n_folds)))
+
+    t = np.hstack([c.index.values for c in counts_test])
+    order = np.argsort(t, kind="stable")
+    p = np.vstack([r[0] for r in results])[order]
+    idxmax = np.hstack([r[1] for r in results])[order]
+
+    decoded = nap.Tsd(t=t[order], d=idx[idxmax], time_support=ep)
+    p = nap.TsdFrame(t=t[order], d=p, time_support=ep, columns=idx)
+
+    # Errors against the average feature in each time bin
+    error = [
+        np.abs(idx[r[1]] - feature.bin_average(bin_size, e, time_units).values)
+        for r, e in zip(results, test_eps)
+    ]
+    errors = pd.DataFrame(
+        {
+            "n_bins": [len(c) for c in counts_test],
+            "mae": [np.nanmean(e) for e in error],
+            "rmse": [np.sqrt(np.nanmean(e**2)) for e in error],
+            "median_ae": [np.nanmedian(e) for e in error],
+        }
+    )
+    errors.index.name = "fold"
+
+    return decoded, p, errors
+
+
+def _gaussian_transition(centers, std):
+    """Row-normalized transition matrix of a gaussian random walk over the bin centers."""
+    centers = np.asarray(centers, dtype=np.float64)
+    T = np.exp(-((centers[None, :] - centers[:, None]) ** 2) / (2 * std**2))
+    return T / T.sum(1, keepdims=True)
+
+
+class OnlineDecoder:
+    """
+    Stateful Bayesian decoder for closed-loop experiments.
+
+    The log of the tuning curves and the occupancy prior are computed once at initialization.
+    Each call to `update` (spike counts of one or more time bins) or `push` (spike times)
+    decodes the new bins with a matrix-vector product restricted to the active neurons.
+
+    Without transition, each bin is decoded independently as in `decode_1d` and `decode_2d`.
+    With a transition, the posterior of the previous bin is propagated through the transition
+    matrix and used as the prior of the next bin (forward filtering of a hidden Markov model).
+
+    Parameters
+    ----------
+    tuning_curves : pandas.DataFrame or dict
+        The 1d tuning curves (as for `decode_1d`) or a dictionnary of 2d tuning curves
+        (as for `decode_2d`).
+    bin_size : float
+        Bin size. Default is second. Use the parameter time_units to change it.
+    xy : tuple, optional
+        A tuple of bin positions for 2d tuning curves i.e. xy=(x,y).
+    time_units : str, optional
+        Time unit of the bin size, of `start` and of the spike times ('s' [default], 'ms', 'us').
+    occupancy : numpy.ndarray, optional
+        Occupancy of each bin of the tuning curves. Default is uniform.
+    transition : float or numpy.ndarray, optional
+        If a float, standard deviation (in feature units) of a gaussian random walk between two bins.
+        If an array of shape (n_bins, n_bins), transition probabilities between the flattened bins
+        of the tuning curves, with rows summing to one. Default is None (independent bins).
+    start : float, optional
+        Start time of the first bin for `push`. Default is 0.
+    dtype : numpy.dtype, optional
+        Precision of the posterior. Default is float64.
+
+    Attributes
+    ----------
+    posterior : numpy.ndarray
+        The posterior of the last decoded bin.
+    decoded : float or numpy.ndarray
+        The feature value at the maximum of the last posterior.
+
+    Raises
+    ------
+    RuntimeError
+        If tuning_curves is not a pandas.DataFrame or a dict.
+        If xy is missing for 2d tuning curves.
+        If occupancy or transition do not match the bins of the tuning curves.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> decoder = nap.OnlineDecoder(tuning_curves, bin_size=0.02, transition=2.0)
+    >>> for counts in stream:
+    ...     posterior = decoder.update(counts)
+    ...     position = decoder.decoded
+    """
+
+    def __init__(
+        self,
+        tuning_curves,
+        bin_size,
+        xy=None,
+        time_units="s",
+        occupancy=None,
+        transition=None,
+        start=0.0,
+        dtype=np.float64,
+    ):
+        if isinstance(tuning_curves, dict):
+            if xy is None:
+                raise RuntimeError("xy should be provided for 2d tuning curves")
+            self.keys = np.array(list(tuning_curves.keys()))
+            self.xy = tuple(np.asarray(b) for b in xy)
+            tc = np.array([tuning_curves[k] for k in tuning_curves.keys()])
+            tc = tc.reshape(tc.shape[0], -1).T
+            self.shape = tuple(len(b) for b in self.xy)
+            if tc.shape[0] != np.prod(self.shape):
+                raise RuntimeError("Different shapes for tuning_curves and xy")
+        elif hasattr(tuning_curves, "columns"):
+            self.keys = np.asarray(tuning_curves.columns.values)
+            self.xy = (np.asarray(tuning_curves.index.values),)
+            tc = tuning_curves.values
+            self.shape = (tc.shape[0],)
+        else:
+            raise RuntimeError("Unknown format for tuning_curves")
+
+        n_bins = tc.shape[0]
+        if occupancy is None:
+            occupancy = np.ones(n_bins)
+        occupancy = np.asarray(occupancy, dtype=np.float64).flatten()
+        if occupancy.shape[0] != n_bins:
+            raise RuntimeError("Different shapes for occupancy and tuning_curves")
+
+        self.time_units = time_units
+        self.bin_size = nap.TsIndex.format_timestamps(
+            np.array([bin_size], dtype=np.float64), time_units
+        )[0]
+        self.dtype = np.dtype(dtype)
+
+        log_tc, self._offset, zeros = _get_likelihood_terms(
+            tc, np.ones(n_bins), self.bin_size, dtype
+        )
+        # Neurons x bins so that the rows of the active neurons are contiguous
+        self._log_tc = np.ascontiguousarray(log_tc.T)
+        self._zeros = np.ascontiguousarray(zeros.T) if np.any(zeros) else None
+        self._prior = occupancy / occupancy.sum()
+
+        with np.errstate(divide="ignore"):
+            self._log_prior = np.log(self._prior).astype(dtype)
+
+        self._transition = self._get_transition(transition, n_bins)
+
+        self._sorter = np.argsort(self.keys)
+        self._start = nap.TsIndex.format_timestamps(
+            np.array([start], dtype=np.float64), time_units
+        )[0]
+        self.reset()
+
+    def _get_transition(self, transition, n_bins):
+        if transition is None:
+            return None
+        if np.isscalar(transition):
+            if transition <= 0:
+                raise RuntimeError("transition should be strictly positive")
+            # Separable gaussian random walk, one matrix per dimension
+            return [
+                _gaussian_transition(b, transition).astype(self.dtype) for b in self.xy
+            ]
+        transition = np.asarray(transition, dtype=self.dtype)
+        if transition.shape != (n_bins, n_bins):
+            raise RuntimeError("Different shapes for transition and tuning_curves")
+        return [transition]
+
+    def reset(self, start=None):
+        """
+        Reset the state of the decoder to the occupancy prior.
+
+        Parameters
+        ----------
+        start : float, optional
+            New start time of the first bin for `push`, in `time_units`.
+        """
+        if start is not None:
+            self._start = nap.TsIndex.format_timestamps(
+                np.array([start], dtype=np.float64), self.time_units
+            )[0]
+        self._bin_start = self._start
+        self._counts = np.zeros(len(self.keys), dtype=self.dtype)
+        self._p = self._prior.astype(self.dtype)
+        self._idxmax = None
+
+    def _predict(self):
+        """Log-prior of the next bin."""
+        if self._transition is None:
+            return self._log_prior
+        if len(self._transition) == 1 and self._transition[0].shape[0] == self._p.size:
+            prior = self._p @ self._transition[0]
+        else:
+            prior = self._p.reshape(self.shape)
+            for axis, T in enumerate(self._transition):
+                prior = np.moveaxis(
+                    np.tensordot(prior, T, axes=([axis], [0])), -1, axis
+                )
+            prior = prior.ravel()
+        with np.errstate(divide="ignore"):
+            return np.log(prior)
+
+    def _step(self, counts):
+        """Decode one bin of spike counts."""
+        active = np.flatnonzero(counts)
+        logp = counts[active] @ self._log_tc[active] + self._offset + self._predict()
+        if self._zeros is not None and len(active):
+            logp[np.any(self._zeros[active], 0)] = -np.inf
+        self._idxmax = np.argmax(logp)
+        self._p = _normalize_log_posterior(logp)
+        return self._p
+
+    def update(self, spike_counts):
+        """
+        Decode one or more time bins of spike counts.
+
+        Parameters
+        ----------
+        spike_counts : numpy.ndarray
+            Spike counts of shape (n_neurons,) for one bin or (n_time_bins, n_neurons),
+            with neurons ordered as the tuning curves.
+
+        Returns
+        -------
+        numpy.ndarray
+            The posterior of shape (n_bins,) in 1d or (n_x, n_y) in 2d, with a leading
+            time dimension if several bins were passed.
+
+        Raises
+        ------
+        RuntimeError
+            If the number of neurons does not match the tuning curves.
+        """
+        counts = np.asarray(spike_counts, dtype=self.dtype)
+        if counts.shape[-1] != len(self.keys) or counts.ndim > 2:
+            raise RuntimeError("Different shapes for spike_counts and tuning_curves")
+        if counts.ndim == 1:
+            return self._step(counts).reshape(self.shape)
+        p = np.zeros((len(counts), self._p.size), dtype=self.dtype)
+        for i in range(len(counts)):
+            p[i] = self._step(counts[i])
+        return p.reshape((len(counts),) + self.shape)
+
+    def push(self, spike_times, neurons, t=None):
+        """
+        Add spikes to the current bin and decode the bins completed up to time `t`.
+
+        Bins are consecutive windows of `bin_size` starting at `start`. Spikes of bins already
+        decoded are ignored.
+
+        Parameters
+        ----------
+        spike_times : numpy.ndarray
+            Times of the new spikes, in `time_units`.
+        neurons : numpy.ndarray
+            Label of the neuron of each spike, as in the tuning curves.
+        t : float, optional
+            Current time in `time_units`. Default is the time of the last spike. Bins ending
+            before `t` are decoded even if they contain no spike.
+
+        Returns
+        -------
+        numpy.ndarray
+            The posteriors of the completed bins, of shape (n_completed, n_bins) in 1d
+            or (n_completed, n_x, n_y) in 2d. The first dimension can be empty.
+
+        Raises
+        ------
+        RuntimeError
+            If spike_times and neurons have different lengths.
+            If a neuron label is not in the tuning curves.
+        """
+        spike_times = nap.TsIndex.format_timestamps(
+            np.asarray(spike_times, dtype=np.float64).ravel(), self.time_units
+        )
+        neurons = np.asarray(neurons).ravel()
+        if len(spike_times) != len(neurons):
+            raise RuntimeError("Different lengths for spike_times and neurons")
+
+        if len(neurons):
+            idx = self._sorter[
+                np.searchsorted(self.keys, neurons, sorter=self._sorter).clip(
+                    0, len(self.keys) - 1
+                )
+            ]
+            if np.any(self.keys[idx] != neurons):
+                raise RuntimeError("Unknown neurons for the tuning curves")
+        else:
+            idx = neurons.astype(np.int64)
+
+        if t is None:
+            t = self._bin_start
+        else:
+            t = nap.TsIndex.format_timestamps(
+                np.array([t], dtype=np.float64), self.time_units
+            )[0]
+        if len(spike_times):
+            t = max(t, spike_times.max())
+
+        # Bin of each spike relative to the current bin
+        bins = np.floor((spike_times - self._bin_start) / self.bin_size).astype(
+            np.int64
+        )
+        n_done = max(int(np.floor((t - self._bin_start) / self.bin_size)), 0)
+        keep = bins >= 0
+        bins, idx = bins[keep], idx[keep]
+
+        p = np.zeros((n_done, self._p.size), dtype=self.dtype)
+        for i in range(n_done):
+            np.add.at(self._counts, idx[bins == i], 1)
+            p[i] = self._step(self._counts)
+            self._counts[:] = 0
+        np.add.at(self._counts, idx[bins == n_done], 1)
+        self._bin_start += n_done * self.bin_size
+
+        return p.reshape((n_done,) + self.shape)
+
+    @property
+    def posterior(self):
+        return self._p.reshape(self.shape)
+
+    @property
+    def decoded(self):
+        if self._idxmax is None:
+            return None
+        if len(self.shape) == 1:
+            return self.xy[0][self._idxmax]
+        idx = np.unravel_index(self._idxmax, self.shape)
+        return np.array([b[i] for b, i in zip(self.xy, idx)])
@@ -0,0 +1,291 @@
+"""Detection of oscillatory events.
+
+The pipeline (band-pass filter, Hilbert envelope, smoothing, z-scoring, threshold and
+interval cleaning) is applied chunk by chunk so that the peak memory is bounded by
+the chunk size and not by the length of the recording.
+"""
+
+from collections.abc import Iterable
+from numbers import Number
+
+import numpy as np
+from numba import jit
+from scipy.ndimage import gaussian_filter1d
+from scipy.signal import hilbert, sosfiltfilt
+
+from .. import core as nap
+from .filtering import _get_butter_coefficients, _get_padlen
+
+
+@jit(nopython=True)
+def _jitstream_threshold(time_array, x, on, off, state):
+    """
+    Hysteresis threshold of one chunk. The state (active, start, peak time, peak value
+    and previous timestamp) is carried over from one chunk to the next.
+    """
+    n = x.shape[0]
+    starts = np.zeros(n, dtype=np.float64)
+    ends = np.zeros(n, dtype=np.float64)
+    peak_times = np.zeros(n, dtype=np.float64)
+    peak_values = np.zeros(n, dtype=np.float64)
+
+    active, start, peak_t, peak_v, last_t = state
+    k = 0
+    for i in range(n):
+        if active:
+            if x[i] > off:
+                if x[i] > peak_v:
+                    peak_v = x[i]
+                    peak_t = time_array[i]
+            else:
+                starts[k] = start
+                ends[k] = time_array[i] - (time_array[i] - last_t) / 2
+                peak_times[k] = peak_t
+                peak_values[k] = peak_v
+                k += 1
+                active = 0.0
+        elif x[i] > on:
+            active = 1.0
+            if np.isnan(last_t):
+                start = time_array[i]
+            else:
+                start = time_array[i] - (time_array[i] - last_t) / 2
+            peak_v = x[i]
+            peak_t = time_array[i]
+        last_t = time_array[i]
+
+    state[0] = active
+    state[1] = start
+    state[2] = peak_t
+    state[3] = peak_v
+    state[4] = last_t
+
+    return starts[0:k], ends[0:k], peak_times[0:k], peak_values[0:k]
+
+
+def _iter_envelope(data, sos, sigma, chunk_size, overlap):
+    """
+    Yield the smoothed envelope of the data, averaged over channels, chunk by chunk.
+
+    Each chunk is loaded with `overlap` extra samples on both sides which are discarded
+    after filtering, Hilbert transform and smoothing (overlap-discard).
+    The last chunk of each epoch is flagged so that open events can be closed.
+    """
+    time_array = data.index.values
+    values = data.values
+    padlen = _get_padlen(sos)
+
+    for s, e in zip(data.time_support.start, data.time_support.end):
+        idx_s = np.searchsorted(time_array, s)
+        idx_e = np.searchsorted(time_array, e, side="right")
+
+        for b0 in range(idx_s, idx_e, chunk_size):
+            b1 = min(b0 + chunk_size, idx_e)
+            lo = max(b0 - overlap, idx_s)
+            hi = min(b1 + overlap, idx_e)
+
+            block = np.asarray(values[lo:hi])
+            block = block.reshape(block.shape[0], -1)
+
+            if hi - lo > 1:
+                block = sosfiltfilt(sos, block, axis=0, padlen=min(padlen, hi - lo - 1))
+            env = np.abs(hilbert(block, axis=0))
+            if sigma > 0:
+                env = gaussian_filter1d(env, sigma, axis=0, mode="nearest")
+            env = env.mean(1)
+
+            yield time_array[b0:b1], env[b0 - lo : b1 - lo], b1 == idx_e
+
+
+def _merge_events(starts, ends, peak_times, peak_values, epochs, max_gap, min_duration):
+    """
+    Merge events of the same epoch separated by less than max_gap and drop short events.
+    epochs is the index of the epoch of each event.
+    """
+    if max_gap is not None and len(starts) > 1:
+        split = (starts[1:] - ends[:-1] >= max_gap) | (epochs[1:] != epochs[:-1])
+        group = np.concatenate([[0], np.cumsum(split)])
+        first = np.flatnonzero(np.diff(group, prepend=-1))
+        last = np.append(first[1:] - 1, len(group) - 1)
+
+        # Peak of each merged event
+        order = np.lexsort((-peak_values, group))
+        best = order[first]
+
+        starts, ends = starts[first], ends[last]
+        peak_times, peak_values = peak_times[best], peak_values[best]
+
+    if min_duration is not None:
+        keep = (ends - starts) >= min_duration
+        starts, ends = starts[keep], ends[keep]
+        peak_times, peak_values = peak_times[keep], peak_values[keep]
+
+    return starts, ends, peak_times, peak_values
+
+
+def detect_oscillatory_events(
+    data,
+    cutoff,
+    thr,
+    off_thr=None,
+    fs=None,
+    order=4,
+    smooth_std=None,
+    zscore=True,
+    min_duration=None,
+    max_gap=None,
+    time_units="s",
+    chunk_size=100000,
+    overlap=None,
+):
+    """
+    Detect oscillatory events (e.g. ripples, spindles, bursts) with a streaming pipeline.
+
+    The signal is band-pass filtered (zero-phase Butterworth), its envelope is computed with the Hilbert transform,
+    optionally smoothed with a gaussian kernel and averaged over channels. Events are the epochs where the envelope
+    is above `thr` until it falls back below `off_thr`.
+
+    The data are processed chunk by chunk within each epoch of the time support, with `overlap` samples on each side
+    that are discarded after filtering. Only the chunk being processed is loaded in memory, which makes it possible
+    to detect events on lazily loaded recordings. The filter and the Hilbert transform are not local, so the chunked
+    envelope is an approximation of the envelope of the whole epoch. It improves with `overlap` relative to the
+    slowest period of the band and events close to a threshold can differ when `overlap` is short.
+    Events are never merged across the gap between two epochs.
+
+    Parameters
+    ----------
+    data : Tsd or TsdFrame
+        The signal. For a TsdFrame, the envelope is averaged over the columns.
+    cutoff : (Numeric, Numeric)
+        Cutoff frequencies of the band-pass filter in Hz.
+    thr : float
+        Threshold to start an event. In standard deviations of the envelope if `zscore` is True.
+    off_thr : float, optional
+        Threshold to end an event. Default is `thr`. Should be lower than `thr`.
+    fs : float, optional
+        The sampling frequency of the signal in Hz. If not provided, it will be inferred from the time axis of the data.
+    order : int, optional
+        The order of the Butterworth filter. Default is 4.
+    smooth_std : float, optional
+        Standard deviation of the gaussian kernel smoothing the envelope, in `time_units`. Default is no smoothing.
+    zscore : bool, optional
+        If True [default], thresholds are in standard deviations above the mean of the envelope.
+        The mean and standard deviation are computed with a first pass over the data.
+    min_duration : float, optional
+        Events shorter than min_duration are dropped, in `time_units`.
+    max_gap : float, optional
+        Events separated by less than max_gap are merged, in `time_units`.
+    time_units : str, optional
+        Time units of `smooth_std`, `min_duration` and `max_gap` ('us', 'ms', 's' [default])
+    chunk_size : int, optional
+        Number of samples processed at once. Default is 100000.
+    overlap : int, optional
+        Number of samples added on each side of a chunk and discarded after filtering.
+        Default is 4 periods of the lowest cutoff frequency plus 4 standard deviations of the smoothing kernel.
+        Increase it for a closer approximation of the envelope computed on the whole epoch.
+
+    Returns
+    -------
+    IntervalSet
+        The detected events with the metadata columns `peak_time` and `peak_amplitude`
+        (in units of the thresholds).
+
+    Raises
+    ------
+    ValueError
+        If `data` is not a Tsd or TsdFrame.
+        If `cutoff` is not a tuple of two numbers.
+        If `off_thr` is greater than `thr`.
+        If `chunk_size` or `overlap` are not valid.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> import numpy as np
+    >>> t = np.arange(0, 100, 1 / 1250)
+    >>> lfp = nap.Tsd(t=t, d=np.random.randn(len(t)))
+    >>> ripples = nap.detect_oscillatory_events(
+    ...     lfp, (100, 250), thr=5, off_thr=2, smooth_std=0.004,
+    ...     min_duration=0.015, max_gap=0.01, time_units="s"
+    ... )
+    >>> ripples.peak_time
+    """
+    if not isinstance(data, (nap.Tsd, nap.TsdFrame)):
+        raise ValueError(
+            f"Invalid value: {data}. First argument should be of type Tsd or TsdFrame"
+        )
+    if (
+        not isinstance(cutoff, Iterable)
+        or len(cutoff) != 2
+        or not all(isinstance(fq, Number) for fq in cutoff)
+    ):
+        raise ValueError(
+            f"bandpass filter require a tuple of two numbers. {cutoff} provided instead."
+        )
+    off_thr = thr if off_thr is None else off_thr
+    if off_thr > thr:
+        raise ValueError("off_thr should be lower than thr.")
+    if not isinstance(chunk_size, (int, np.integer)) or chunk_size <= 0:
+        raise ValueError("chunk_size should be a strictly positive integer.")
+    if overlap is not None and (
+        not isinstance(overlap, (int, np.integer)) or overlap < 0
+    ):
+        raise ValueError("overlap should be a positive integer.")
+
+    if fs is None:
+        fs = data.rate
+
+    def to_seconds(x):
+        if x is None:
+            return None
+        return nap.TsIndex.format_timestamps(np.array([x]), time_units)[0]
+
+    smooth_std = to_seconds(smooth_std)
+    min_duration = to_seconds(min_duration)
+    max_gap = to_seconds(max_gap)
+
+    sos = _get_butter_coefficients(np.array(cutoff, dtype=float), "bandpass", fs, order)
+    sigma = 0.0 if smooth_std is None else smooth_std * fs
+    if overlap is None:
+        overlap = int(np.ceil(4 * fs / min(cutoff) + 4 * sigma))
+
+    # First pass for the statistics of the envelope
+    mean, std = 0.0, 1.0
+    if zscore:
+        n, total, total2 = 0, 0.0, 0.0
+        for _, env, _ in _iter_envelope(data, sos, sigma, chunk_size, overlap):
+            n += len(env)
+            total += env.sum()
+            total2 += np.sum(env**2)
+        if n > 0:
+            mean = total / n
+            std = np.sqrt(max(total2 / n - mean**2, 0.0)) or 1.0
+
+    # Second pass for the detection
+    state = np.array([0.0, 0.0, 0.0, 0.0, np.nan])
+    events = []
+    for t, env, last in _iter_envelope(data, sos, sigma, chunk_size, overlap):
+        x = (env - mean) / std
+        events.append(_jitstream_threshold(t, x, thr, off_thr, state))
+        if last:
+            if state[0]:  # Closing the event at the end of the epoch
+                events.append(tuple(np.array([state[i]]) for i in [1, 4, 2, 3]))
+            state = np.array([0.0, 0.0, 0.0, 0.0, np.nan])
+
+    if len(events):
+        starts, ends, peak_times, peak_values = [
+            np.concatenate(x) for x in zip(*events)
+        ]
+    else:
+        starts = ends = peak_times = peak_values = np.array([])
+
+    epochs = np.searchsorted(data.time_support.start, starts, side="right") - 1
+    starts, ends, peak_times, peak_values = _merge_events(
+        starts, ends, peak_times, peak_values, epochs, max_gap, min_duration
+    )
+
+    return nap.IntervalSet(
+        start=starts,
+        end=ends,
+        metadata={"peak_time": peak_times, "peak_amplitude": peak_values},
+    )
@@ -1,13 +1,22 @@
 """Filtering module."""
 
 import inspect
+import os
 from collections.abc import Iterable
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from numbers import Number
 
 import numpy as np
 import pandas as pd
-from scipy.signal import butter, sosfiltfilt, sosfreqz
+from scipy.signal import (
+    butter,
+    oaconvolve,
+    sosfilt,
+    sosfilt_zi,
+    sosfiltfilt,
+    sosfreqz,
+)
 
 from .. import core as nap
 
@@ -53,19 +62,105 @@ def _validate_filtering_inputs(func):
                     "Invalid value for 'transition_bandwidth'. 'transition_bandwidth' should be of type float"
                 )
 
+        if "n_jobs" in kwargs:
+            _check_n_jobs(kwargs["n_jobs"])
+
         # Call the original function with validated inputs
         return func(**kwargs)
 
     return wrapper
 
 
+def _check_n_jobs(n_jobs):
+    if n_jobs is not None and (
+        not isinstance(n_jobs, (int, np.integer)) or n_jobs <= 0
+    ):
+        raise ValueError(
+            "Invalid value for 'n_jobs': Parameter 'n_jobs' should be a strictly positive int or None"
+        )
+
+
+def _freeze(cutoff):
+    """Hashable version of the cutoff frequencies for the filter cache."""
+    cutoff = np.asarray(cutoff, dtype=float)
+    return float(cutoff) if cutoff.ndim == 0 else tuple(cutoff.tolist())
+
+
+@lru_cache(maxsize=128)
+def _design_filter(cutoff, filter_type, sampling_frequency, mode, order, bandwidth):
+    """
+    Design a filter once per (cutoff, fs, order, mode) and cache it.
+    The cached array is shared, callers should use the copies returned by
+    `_get_butter_coefficients` and `_get_windowed_sinc_kernel`.
+    """
+    cutoff = np.array(cutoff)
+    if mode == "butter":
+        coefs = butter(
+            order, cutoff, btype=filter_type, fs=sampling_frequency, output="sos"
+        )
+    else:
+        coefs = _windowed_sinc_kernel(
+            cutoff, filter_type, sampling_frequency, bandwidth
+        )
+    coefs.setflags(write=False)
+    return coefs
+
+
 def _get_butter_coefficients(cutoff, filter_type, sampling_frequency, order=4):
     """Calls scipy butter"""
-    return butter(order, cutoff, btype=filter_type, fs=sampling_frequency, output="sos")
+    return _design_filter(
+        _freeze(cutoff), filter_type, float(sampling_frequency), "butter", order, None
+    ).copy()
+
+
+def _get_padlen(sos):
+    """Default padding of scipy sosfiltfilt."""
+    ntaps = 2 * len(sos) + 1
+    ntaps -= min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+    return 3 * ntaps
+
+
+def _sosfiltfilt(sos, values, slices, out, n_jobs=1):
+    """
+    Zero-phase filtering of `values[slc]` into `out[slc]` for each slice (i.e. epoch).
+
+    With several threads, the work is split over the epochs and over blocks of
+    channels. scipy releases the GIL in `sosfilt`, so the threads run in parallel.
+    Each block is filtered in float64, since second-order sections of low cutoffs are
+    unstable in single precision at high sampling rates, and only the result is stored
+    in the dtype of `out` (e.g. float32). Lazy arrays that are not numpy arrays (e.g. HDF5 datasets)
+    are only split over epochs so that each epoch is read once.
+    """
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    out = out.reshape(out.shape[0], -1)
+    sos = sos.astype(np.float64)
+
+    n_blocks = 1
+    if isinstance(values, np.ndarray):
+        values = values.reshape(values.shape[0], -1)
+        n_blocks = max(1, min(n_jobs, values.shape[1]))
+    edges = np.linspace(0, out.shape[1], n_blocks + 1).astype(int)
+    tasks = [(slc, c0, c1) for slc in slices for c0, c1 in zip(edges, edges[1:])]
+
+    def run(task):
+        slc, c0, c1 = task
+        if n_blocks == 1:
+            block = np.asarray(values[slc]).reshape(out[slc].shape)
+        else:
+            block = values[slc, c0:c1]
+        out[slc, c0:c1] = sosfiltfilt(sos, block.astype(np.float64), axis=0)
+
+    if n_jobs == 1 or len(tasks) == 1:
+        for task in tasks:
+            run(task)
+    else:
+        with ThreadPoolExecutor(max_workers=min(n_jobs, len(tasks))) as pool:
+            list(pool.map(run, tasks))
 
 
 def _compute_butterworth_filter(
-    data, cutoff, sampling_frequency=None, filter_type="bandpass", order=4
+    data, cutoff, sampling_frequency=None, filter_type="bandpass", order=4, n_jobs=1
 ):
     """
     Apply a Butterworth filter to the provided signal.
@@ -84,10 +179,12 @@ def _compute_butterworth_filter(
         )
 
     else:
-        out = np.zeros_like(data.d)
-        for ep in data.time_support:
-            slc = data.get_slice(start=ep.start[0], end=ep.end[0])
-            out[slc] = sosfiltfilt(sos, data.d[slc], axis=0)
+        out = np.zeros(data.shape, dtype=np.result_type(data.dtype, np.float32))
+        slices = [
+            data.get_slice(start=s, end=e)
+            for s, e in zip(data.time_support.start, data.time_support.end)
+        ]
+        _sosfiltfilt(sos, data.d, slices, out, n_jobs)
 
     kwargs = dict(t=data.t, d=out, time_support=data.time_support)
     if isinstance(data, nap.TsdFrame):
@@ -114,6 +211,18 @@ def _compute_spectral_inversion(kernel):
 def _get_windowed_sinc_kernel(
     fc, filter_type, sampling_frequency, transition_bandwidth=0.02
 ):
+    """Get the (cached) windowed-sinc kernel."""
+    return _design_filter(
+        _freeze(fc),
+        filter_type,
+        float(sampling_frequency),
+        "sinc",
+        None,
+        float(transition_bandwidth),
+    ).copy()
+
+
+def _windowed_sinc_kernel(fc, filter_type, sampling_frequency, transition_bandwidth):
     """
     Get the windowed-sinc kernel.
     Smith, S. (2003). Digital signal processing: a practical guide for engineers and scientists.
@@ -187,6 +296,15 @@ def _compute_windowed_sinc_filter(
     return data.convolve(kernel)
 
 
+def _check_nan(values):
+    if np.any(np.isnan(values)):
+        raise ValueError(
+            "The input signal contains NaN values, which are not supported for filtering. "
+            "Please remove or handle NaNs before applying the filter. "
+            "You can use the `dropna()` method to drop all NaN values."
+        )
+
+
 @_validate_filtering_inputs
 def _compute_filter(
     data,
@@ -195,6 +313,7 @@ def _compute_filter(
     mode="butter",
     order=4,
     transition_bandwidth=0.02,
+    n_jobs=1,
     filter_type="bandpass",
 ):
     """
@@ -205,12 +324,7 @@ def _compute_filter(
             f"Invalid value: {data}. First argument should be of type Tsd, TsdFrame or TsdTensor"
         )
 
-    if np.any(np.isnan(data)):
-        raise ValueError(
-            "The input signal contains NaN values, which are not supported for filtering. "
-            "Please remove or handle NaNs before applying the filter. "
-            "You can use the `dropna()` method to drop all NaN values."
-        )
+    _check_nan(data)
 
     if fs is None:
         fs = data.rate
@@ -219,7 +333,7 @@ def _compute_filter(
 
     if mode == "butter":
         return _compute_butterworth_filter(
-            data, cutoff, fs, filter_type=filter_type, order=order
+            data, cutoff, fs, filter_type=filter_type, order=order, n_jobs=n_jobs
         )
     if mode == "sinc":
         return _compute_windowed_sinc_filter(
@@ -230,7 +344,13 @@ def _compute_filter(
 
 
 def apply_bandpass_filter(
-    data, cutoff, fs=None, mode="butter", order=4, transition_bandwidth=0.02
+    data,
+    cutoff,
+    fs=None,
+    mode="butter",
+    order=4,
+    transition_bandwidth=0.02,
+    n_jobs=1,
 ):
     """
     Apply a band-pass filter to the provided signal.
@@ -256,6 +376,9 @@ def apply_bandpass_filter(
         The transition bandwidth. 0.2 corresponds to 20% of the frequency band between 0 and the sampling frequency.
         The smaller the transition bandwidth, the larger the windowed-sinc kernel.
         Default is 0.02.
+    n_jobs : int, optional
+        Number of threads sharing the epochs and blocks of channels of the Butterworth filter.
+        Default is 1. If None, the number of CPUs is used.
 
     Returns
     -------
@@ -271,6 +394,7 @@ def apply_bandpass_filter(
         If `mode` is not "butter" or "sinc".
         If `order` is not an int.
         If "transition_bandwidth" is not a float.
+        If `n_jobs` is not a strictly positive int or None.
     Notes
     -----
     For the Butterworth filter, the cutoff frequency is defined as the frequency at which the amplitude of the signal
@@ -283,12 +407,19 @@ def apply_bandpass_filter(
         mode=mode,
         order=order,
         transition_bandwidth=transition_bandwidth,
+        n_jobs=n_jobs,
         filter_type="bandpass",
     )
 
 
 def apply_bandstop_filter(
-    data, cutoff, fs=None, mode="butter", order=4, transition_bandwidth=0.02
+    data,
+    cutoff,
+    fs=None,
+    mode="butter",
+    order=4,
+    transition_bandwidth=0.02,
+    n_jobs=1,
 ):
     """
     Apply a band-stop filter to the provided signal.
@@ -314,6 +445,9 @@ def apply_bandstop_filter(
         The transition bandwidth. 0.2 corresponds to 20% of the frequency band between 0 and the sampling frequency.
         The smaller the transition bandwidth, the larger the windowed-sinc kernel.
         Default is 0.02.
+    n_jobs : int, optional
+        Number of threads sharing the epochs and blocks of channels of the Butterworth filter.
+        Default is 1. If None, the number of CPUs is used.
 
     Returns
     -------
@@ -329,6 +463,7 @@ def apply_bandstop_filter(
         If `mode` is not "butter" or "sinc".
         If `order` is not an int.
         If "transition_bandwidth" is not a float.
+        If `n_jobs` is not a strictly positive int or None.
     Notes
     -----
     For the Butterworth filter, the cutoff frequency is defined as the frequency at which the amplitude of the signal
@@ -341,12 +476,19 @@ def apply_bandstop_filter(
         mode=mode,
         order=order,
         transition_bandwidth=transition_bandwidth,
+        n_jobs=n_jobs,
         filter_type="bandstop",
     )
 
 
 def apply_highpass_filter(
-    data, cutoff, fs=None, mode="butter", order=4, transition_bandwidth=0.02
+    data,
+    cutoff,
+    fs=None,
+    mode="butter",
+    order=4,
+    transition_bandwidth=0.02,
+    n_jobs=1,
 ):
     """
     Apply a high-pass filter to the provided signal.
@@ -372,6 +514,9 @@ def apply_highpass_filter(
         The transition bandwidth. 0.2 corresponds to 20% of the frequency band between 0 and the sampling frequency.
         The smaller the transition bandwidth, the larger the windowed-sinc kernel.
         Default is 0.02.
+    n_jobs : int, optional
+        Number of threads sharing the epochs and blocks of channels of the Butterworth filter.
+        Default is 1. If None, the number of CPUs is used.
 
     Returns
     -------
@@ -387,6 +532,7 @@ def apply_highpass_filter(
         If `mode` is not "butter" or "sinc".
         If `order` is not an int.
         If "transition_bandwidth" is not a float.
+        If `n_jobs` is not a strictly positive int or None.
     Notes
     -----
     For the Butterworth filter, the cutoff frequency is defined as the frequency at which the amplitude of the signal
@@ -399,12 +545,19 @@ def apply_highpass_filter(
         mode=mode,
         order=order,
         transition_bandwidth=transition_bandwidth,
+        n_jobs=n_jobs,
         filter_type="highpass",
     )
 
 
 def apply_lowpass_filter(
-    data, cutoff, fs=None, mode="butter", order=4, transition_bandwidth=0.02
+    data,
+    cutoff,
+    fs=None,
+    mode="butter",
+    order=4,
+    transition_bandwidth=0.02,
+    n_jobs=1,
 ):
     """
     Apply a low-pass filter to the provided signal.
@@ -430,6 +583,9 @@ def apply_lowpass_filter(
         The transition bandwidth. 0.2 corresponds to 20% of the frequency band between 0 and the sampling frequency.
         The smaller the transition bandwidth, the larger the windowed-sinc kernel.
         Default is 0.02.
+    n_jobs : int, optional
+        Number of threads sharing the epochs and blocks of channels of the Butterworth filter.
+        Default is 1. If None, the number of CPUs is used.
 
     Returns
     -------
@@ -445,6 +601,7 @@ def apply_lowpass_filter(
         If `mode` is not "butter" or "sinc".
         If `order` is not an int.
         If "transition_bandwidth" is not a float.
+        If `n_jobs` is not a strictly positive int or None.
     Notes
     -----
     For the Butterworth filter, the cutoff frequency is defined as the frequency at which the amplitude of the signal
@@ -457,10 +614,350 @@ def apply_lowpass_filter(
         mode=mode,
         order=order,
         transition_bandwidth=transition_bandwidth,
+        n_jobs=n_jobs,
         filter_type="lowpass",
     )
 
 
+def apply_filter_bank(
+    data,
+    bands,
+    fs=None,
+    mode="butter",
+    order=4,
+    transition_bandwidth=0.02,
+    n_jobs=1,
+):
+    """
+    Apply a bank of band-pass filters to the provided signal.
+
+    Each epoch of the time support is read once and filtered in every band, which
+    avoids one pass over the data per band (e.g. theta, gamma and ripples) when the
+    data are lazily loaded from disk. The filters are designed once and cached.
+    Mode can be :
+
+    - `"butter"` for Butterworth filter. In this case, `order` determines the order of the filter.
+    - `"sinc"` for Windowed-Sinc convolution. `transition_bandwidth` determines the transition bandwidth.
+
+    Parameters
+    ----------
+    data : Tsd, TsdFrame, or TsdTensor
+        The signal to be filtered.
+    bands : list of (Numeric, Numeric)
+        Cutoff frequencies in Hz of each band.
+    fs : float, optional
+        The sampling frequency of the signal in Hz. If not provided, it will be inferred from the time axis of the data.
+    mode : {'butter', 'sinc'}, optional
+        Filtering mode. Default is 'butter'.
+    order : int, optional
+        The order of the Butterworth filter. Higher values result in sharper frequency cutoffs.
+        Default is 4.
+    transition_bandwidth : float, optional
+        The transition bandwidth. 0.2 corresponds to 20% of the frequency band between 0 and the sampling frequency.
+        The smaller the transition bandwidth, the larger the windowed-sinc kernel.
+        Default is 0.02.
+    n_jobs : int, optional
+        Number of threads sharing the epochs and blocks of channels of the Butterworth filter.
+        Default is 1. If None, the number of CPUs is used.
+
+    Returns
+    -------
+    filtered_data : TsdFrame or TsdTensor
+        The filtered signal of shape (time, band) for a Tsd or (time, band, channels) otherwise.
+        The dtype is the one of the input for floating point data and float32 for integer data.
+
+    Raises
+    ------
+    ValueError
+        If `data` is not a Tsd, TsdFrame, or TsdTensor.
+        If a band is not a tuple of two floats.
+        If `fs` is not float or None.
+        If `mode` is not "butter" or "sinc".
+        If `order` is not an int.
+        If "transition_bandwidth" is not a float.
+        If `n_jobs` is not a strictly positive int or None.
+        If the signal contains NaN values.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> import numpy as np
+    >>> t = np.arange(0, 100, 1 / 1250)
+    >>> lfp = nap.TsdFrame(t=t, d=np.random.randn(len(t), 4))
+    >>> bands = nap.apply_filter_bank(lfp, [(6, 10), (30, 80), (100, 250)])
+    >>> bands.shape
+    (125000, 3, 4)
+    """
+    if not isinstance(data, nap.time_series.BaseTsd):
+        raise ValueError(
+            f"Invalid value: {data}. First argument should be of type Tsd, TsdFrame or TsdTensor"
+        )
+    if not isinstance(bands, Iterable) or len(bands) == 0:
+        raise ValueError(f"bands should be a list of tuples. {bands} provided instead.")
+    for band in bands:
+        if (
+            not isinstance(band, Iterable)
+            or len(band) != 2
+            or not all(isinstance(fq, Number) for fq in band)
+        ):
+            raise ValueError(
+                f"bandpass filter require a tuple of two numbers. {band} provided instead."
+            )
+    if fs is not None and not isinstance(fs, Number):
+        raise ValueError(
+            "Invalid value for 'fs'. Parameter 'fs' should be of type float or int"
+        )
+    if not isinstance(order, int):
+        raise ValueError(
+            "Invalid value for 'order': Parameter 'order' should be of type int"
+        )
+    if not isinstance(transition_bandwidth, float):
+        raise ValueError(
+            "Invalid value for 'transition_bandwidth'. 'transition_bandwidth' should be of type float"
+        )
+    _check_n_jobs(n_jobs)
+    if mode not in ["butter", "sinc"]:
+        raise ValueError("Unrecognized filter mode. Choose either 'butter' or 'sinc'")
+
+    if fs is None:
+        fs = data.rate
+
+    if mode == "butter":
+        filters = [
+            _get_butter_coefficients(np.array(band, dtype=float), "bandpass", fs, order)
+            for band in bands
+        ]
+    else:
+        filters = [
+            _get_windowed_sinc_kernel(
+                np.array(band, dtype=float), "bandpass", fs, transition_bandwidth
+            )
+            for band in bands
+        ]
+
+    time_array = data.index.values
+    values = data.values
+    shape = data.shape
+    out = np.zeros(
+        (shape[0], len(filters), int(np.prod(shape[1:]))),
+        dtype=np.result_type(data.dtype, np.float32),
+    )
+
+    for s, e in zip(data.time_support.start, data.time_support.end):
+        idx_s = np.searchsorted(time_array, s)
+        idx_e = np.searchsorted(time_array, e, side="right")
+        if idx_e == idx_s:
+            continue
+
+        # Single read of the epoch for all the bands
+        block = np.asarray(values[idx_s:idx_e]).reshape(idx_e - idx_s, -1)
+        _check_nan(block)
+
+        for i, f in enumerate(filters):
+            if mode == "butter":
+                _sosfiltfilt(f, block, [slice(None)], out[idx_s:idx_e, i], n_jobs)
+            else:
+                out[idx_s:idx_e, i] = oaconvolve(block, f[:, None], mode="same", axes=0)
+
+    out = out.reshape((shape[0], len(filters), *shape[1:]))
+    nap_class = nap.TsdFrame if out.ndim == 2 else nap.TsdTensor
+    return nap_class(t=time_array, d=out, time_support=data.time_support)
+
+
+class StreamingFilter:
+    """
+    Stateful Butterworth filter for chunked and real-time data.
+
+    The filter is designed from the same parameters as `apply_lowpass_filter`,
+    `apply_highpass_filter`, `apply_bandpass_filter` and `apply_bandstop_filter`
+    with `mode="butter"`. Chunks are passed one after the other to `process`.
+
+    - Causal mode (default) : the state of `sosfilt` is carried over from one chunk to the next.
+      There is no delay and the output is the same as filtering the whole signal at once with `sosfilt`.
+      The state is initialized to the steady state of the first sample.
+    - Zero-phase mode : the chunks are buffered and filtered forward and backward with `overlap` samples
+      of context on each side that are discarded (overlap-discard). The output is delayed by `overlap`
+      samples and matches `sosfiltfilt` on the whole signal up to the decay of the filter over `overlap` samples.
+      Call `flush` at the end of the stream to get the last samples.
+
+    The coefficients and the state of the filter are kept in float64 and only the output
+    is cast to the dtype of the chunk (float32 or float64), so low cutoffs at high sampling
+    rates stay stable for float32 streams.
+
+    In zero-phase mode, each call to `process` filters the buffered context together with the
+    chunk, i.e. about `2 * overlap + len(chunk)` samples. The cost per output sample is therefore
+    `1 + 2 * overlap / len(chunk)` times that of a single `sosfiltfilt` and chunks should be large
+    compared to `overlap`. The default `overlap` grows as `fs / cutoff`, so narrow or very low
+    frequency bands at high sampling rates need long chunks or an explicit smaller `overlap`
+    (at the cost of accuracy at the edges of the chunks).
+
+    Parameters
+    ----------
+    cutoff : Numeric or tuple of Numeric
+        Cutoff frequency in Hz. Tuple of two numbers for "bandpass" and "bandstop".
+    fs : float
+        The sampling frequency of the signal in Hz.
+    filter_type : str
+        Can be "lowpass", "highpass", "bandpass" or "bandstop"
+    order : int, optional
+        The order of the Butterworth filter. Default is 4.
+    zero_phase : bool, optional
+        If True, zero-phase filtering with overlap-discard. Default is False (causal filtering).
+    overlap : int, optional
+        Number of samples of context on each side of the zero-phase filter.
+        Default is 10 periods of the lowest cutoff frequency or of the bandwidth if it is narrower.
+        Larger values are more accurate but each call to `process` costs `2 * overlap` extra samples.
+
+    Attributes
+    ----------
+    delay : int
+        Number of samples by which the output lags the input (0 in causal mode).
+
+    Raises
+    ------
+    ValueError
+        If `cutoff` is not a number for "lowpass" and "highpass" filters or a tuple of two numbers
+        for "bandpass" and "bandstop" filters.
+        If `fs` is not a float or an int.
+        If `order` is not an int.
+        If `overlap` is not a positive int.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> import numpy as np
+    >>> filt = nap.StreamingFilter((100, 250), fs=1250, filter_type="bandpass")
+    >>> for chunk in stream:
+    ...     ripple_band = filt.process(chunk)
+    """
+
+    @_validate_filtering_inputs
+    def __init__(
+        self, cutoff, fs, filter_type, order=4, zero_phase=False, overlap=None
+    ):
+        if fs is None:
+            raise ValueError(
+                "Invalid value for 'fs'. Parameter 'fs' should be of type float or int"
+            )
+        if overlap is not None and (
+            not isinstance(overlap, (int, np.integer)) or overlap < 0
+        ):
+            raise ValueError("overlap should be a positive integer.")
+
+        cutoff = np.array(cutoff, dtype=float)
+        self.sos = _get_butter_coefficients(cutoff, filter_type, fs, order)
+        self.zero_phase = bool(zero_phase)
+        if overlap is None:
+            # The impulse response decays over a few periods of the slowest component
+            slowest = (
+                np.min(cutoff)
+                if cutoff.ndim == 0
+                else min(cutoff.min(), np.ptp(cutoff))
+            )
+            overlap = max(int(np.ceil(10 * fs / slowest)), _get_padlen(self.sos))
+        self.delay = overlap if self.zero_phase else 0
+        self.reset()
+
+    def reset(self):
+        """Reset the state of the filter to start a new stream."""
+        self._zi = None
+        self._values = None
+        self._t = None
+        self._left = 0
+
+    @staticmethod
+    def _unpack(chunk):
+        """Values, timestamps and output constructor of a chunk."""
+        if isinstance(chunk, nap.time_series.BaseTsd):
+            kwargs = {}
+            if isinstance(chunk, nap.TsdFrame):
+                kwargs["columns"] = chunk.columns
+
+            def wrap(t, d):
+                return chunk.__class__(t=t, d=d, **kwargs)
+
+            return np.asarray(chunk.values), chunk.index.values, wrap
+        return np.asarray(chunk), None, lambda t, d: d
+
+    def process(self, chunk):
+        """
+        Filter the next chunk of the stream.
+
+        Parameters
+        ----------
+        chunk : numpy.ndarray, Tsd, TsdFrame or TsdTensor
+            The next samples, with time as the first dimension.
+
+        Returns
+        -------
+        numpy.ndarray, Tsd, TsdFrame or TsdTensor
+            The filtered samples, with the same type as the chunk. In causal mode, the output
+            has the same length as the chunk. In zero-phase mode, the output is the input
+            delayed by `delay` samples and can be empty.
+        """
+        values, t, wrap = self._unpack(chunk)
+        dtype = np.result_type(values.dtype, np.float32)
+        # Filtering in float64, only the output is cast
+        values = values.astype(np.float64, copy=False)
+
+        if not self.zero_phase:
+            if len(values) == 0:
+                return wrap(t, values.astype(dtype))
+            if self._zi is None:
+                zi = sosfilt_zi(self.sos)
+                self._zi = zi.reshape(zi.shape + (1,) * (values.ndim - 1)) * values[0]
+            out, self._zi = sosfilt(self.sos, values, axis=0, zi=self._zi)
+            return wrap(t, out.astype(dtype, copy=False))
+
+        self._wrap = wrap
+        self._dtype = dtype
+        if self._values is None:
+            self._values, self._t = values, t
+        else:
+            self._values = np.concatenate([self._values, values])
+            if t is not None:
+                self._t = np.concatenate([self._t, t])
+
+        end = len(self._values) - self.delay
+        if end <= self._left:
+            return wrap(
+                self._t[0:0] if t is not None else None,
+                self._values[0:0].astype(dtype),
+            )
+        out = self._filtfilt(self._values)[self._left : end].astype(dtype)
+        t_out = self._t[self._left : end] if t is not None else None
+
+        # The last `delay` emitted samples are kept as left context
+        keep = max(end - self.delay, 0)
+        self._values = self._values[keep:]
+        self._t = self._t[keep:] if t is not None else None
+        self._left = end - keep
+        return wrap(t_out, out)
+
+    def flush(self):
+        """
+        Return the samples still buffered at the end of the stream and reset the filter.
+
+        Returns
+        -------
+        numpy.ndarray, Tsd, TsdFrame or TsdTensor or None
+            The last `delay` filtered samples in zero-phase mode. None in causal mode
+            or if nothing was buffered.
+        """
+        if not self.zero_phase or self._values is None:
+            self.reset()
+            return None
+        out = self._filtfilt(self._values)[self._left :].astype(self._dtype)
+        t = self._t[self._left :] if self._t is not None else None
+        out = self._wrap(t, out)
+        self.reset()
+        return out
+
+    def _filtfilt(self, values):
+        padlen = min(_get_padlen(self.sos), len(values) - 1)
+        return sosfiltfilt(self.sos, values, axis=0, padlen=padlen)
+
+
 @_validate_filtering_inputs
 def get_filter_frequency_response(
     cutoff, fs, filter_type, mode, order=4, transition_bandwidth=0.02
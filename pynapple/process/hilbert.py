@@ -0,0 +1,145 @@
+"""Analytic signal (Hilbert transform) of time series.
+
+The analytic signal is computed with FFTs of fast length, per epoch and by batches of
+channels. Long epochs can be processed chunk by chunk (overlap-discard) so that only
+one chunk of lazily loaded data is in memory at a time.
+"""
+
+import numpy as np
+from scipy.fft import ifft, next_fast_len, rfft
+
+from .. import core as nap
+
+_HILBERT_MEMORY = 2**27
+
+
+def _analytic_signal(block, dtype):
+    """
+    Analytic signal of a (time, channels) block along the time axis.
+
+    The block is zero-padded to the next fast FFT length and processed by batches
+    of channels bounded by `_HILBERT_MEMORY`.
+    """
+    n, n_channels = block.shape
+    n_fft = next_fast_len(n, real=True)
+    ctype = np.result_type(dtype, np.complex64)
+
+    # One-sided spectrum of the analytic signal
+    h = np.full(n_fft // 2 + 1, 2.0, dtype=dtype)
+    h[0] = 1.0
+    if n_fft % 2 == 0:
+        h[-1] = 1.0
+
+    out = np.empty((n, n_channels), dtype=ctype)
+    batch = max(1, _HILBERT_MEMORY // (np.dtype(ctype).itemsize * n_fft))
+    for c in range(0, n_channels, batch):
+        X = rfft(block[:, c : c + batch], n=n_fft, axis=0)
+        X *= h[:, None]
+        out[:, c : c + batch] = ifft(X, n=n_fft, axis=0)[0:n]
+    return out
+
+
+def compute_hilbert(sig, ep=None, chunk_size=None, overlap=None, dtype=np.float32):
+    """
+    Compute the instantaneous amplitude and phase of a signal with the Hilbert transform.
+
+    The analytic signal is computed independently within each epoch of `ep`, with an FFT
+    zero-padded to the next fast length and by batches of channels. The signal should be
+    band-limited (e.g. band-pass filtered) for the phase to be meaningful.
+
+    If `chunk_size` is set, epochs longer than `chunk_size` samples are processed chunk by chunk
+    with `overlap` samples on each side that are discarded (overlap-discard). Only one chunk is
+    loaded in memory at a time, which makes it possible to process lazily loaded recordings.
+    Since the Hilbert transform is not local, the chunked result is an approximation that
+    improves with `overlap` relative to the slowest period of the signal.
+
+    Parameters
+    ----------
+    sig : Tsd or TsdFrame
+        The signal.
+    ep : IntervalSet, optional
+        The epochs on which to compute the transform. Default is the time support of `sig`.
+    chunk_size : int, optional
+        Maximum number of samples transformed at once. Default is the whole epoch.
+    overlap : int, optional
+        Number of samples added on each side of a chunk and discarded. Default is `chunk_size // 4`.
+    dtype : numpy.dtype, optional
+        Precision of the computation and of the output, float32 [default] or float64.
+
+    Returns
+    -------
+    amplitude : Tsd or TsdFrame
+        The instantaneous amplitude (envelope) of the signal.
+    phase : Tsd or TsdFrame
+        The instantaneous phase of the signal in radians, between -pi and pi.
+
+    Raises
+    ------
+    TypeError
+        If `sig` is not a Tsd or TsdFrame or `ep` is not an IntervalSet.
+    ValueError
+        If `chunk_size` or `overlap` are not valid or `dtype` is not float32 or float64.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> import numpy as np
+    >>> t = np.arange(0, 100, 1 / 1250)
+    >>> lfp = nap.TsdFrame(t=t, d=np.random.randn(len(t), 4))
+    >>> theta = nap.apply_bandpass_filter(lfp, (6, 10))
+    >>> amplitude, phase = nap.compute_hilbert(theta)
+    """
+    if not isinstance(sig, (nap.Tsd, nap.TsdFrame)):
+        raise TypeError("sig must be either a Tsd or a TsdFrame object.")
+    if not (ep is None or isinstance(ep, nap.IntervalSet)):
+        raise TypeError("ep param must be a pynapple IntervalSet object, or None")
+    if chunk_size is not None and (
+        not isinstance(chunk_size, (int, np.integer)) or chunk_size <= 0
+    ):
+        raise ValueError("chunk_size should be a strictly positive integer or None.")
+    if overlap is not None and (
+        not isinstance(overlap, (int, np.integer)) or overlap < 0
+    ):
+        raise ValueError("overlap should be a positive integer.")
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64.")
+
+    if ep is None:
+        ep = sig.time_support
+    time_array = sig.index.values
+    values = sig.values
+    idx_s = np.searchsorted(time_array, ep.start)
+    idx_e = np.searchsorted(time_array, ep.end, side="right")
+    if chunk_size is None:
+        chunk_size = max(np.max(idx_e - idx_s, initial=0), 1)
+    if overlap is None:
+        overlap = chunk_size // 4
+
+    n_channels = int(np.prod(sig.shape[1:]))
+    n = np.sum(idx_e - idx_s)
+    amplitude = np.zeros((n, n_channels), dtype=dtype)
+    phase = np.zeros((n, n_channels), dtype=dtype)
+
+    k = 0
+    for s, e in zip(idx_s, idx_e):
+        for b0 in range(s, e, chunk_size):
+            b1 = min(b0 + chunk_size, e)
+            lo = max(b0 - overlap, s)
+            hi = min(b1 + overlap, e)
+
+            block = np.asarray(values[lo:hi], dtype=dtype).reshape(hi - lo, n_channels)
+            z = _analytic_signal(block, dtype)[b0 - lo : b1 - lo]
+            amplitude[k : k + b1 - b0] = np.abs(z)
+            phase[k : k + b1 - b0] = np.angle(z)
+            k += b1 - b0
+
+    t = np.concatenate([time_array[s:e] for s, e in zip(idx_s, idx_e)])
+    kwargs = dict(t=t, time_support=ep)
+    if isinstance(sig, nap.TsdFrame):
+        kwargs["columns"] = sig.columns
+    else:
+        amplitude, phase = amplitude[:, 0], phase[:, 0]
+    return (
+        sig.__class__(d=amplitude, **kwargs),
+        sig.__class__(d=phase, **kwargs),
+    )
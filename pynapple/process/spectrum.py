@@ -10,9 +10,12 @@ from numbers import Number
 import numpy as np
 import pandas as pd
 from scipy import signal
+from scipy.fft import rfft, rfftfreq
 
 from .. import core as nap
 
+_SPECTRUM_MEMORY = 2**27
+
 
 def compute_power_spectral_density(
     sig, fs=None, ep=None, full_range=False, norm=False, n=None
@@ -205,3 +208,395 @@ def compute_mean_power_spectral_density(
     if not full_range:
         return ret.loc[ret.index >= 0]
     return ret
+
+
+def _segment_starts(time_array, ep, N, step):
+    """First sample and number of segments of `N` samples spaced by `step` in each epoch."""
+    idx_s = np.searchsorted(time_array, ep.start)
+    idx_e = np.searchsorted(time_array, ep.end, side="right")
+    n_segments = np.maximum((idx_e - idx_s - N) // step + 1, 0)
+    return idx_s, n_segments
+
+
+def _iter_segment_power(sig, tapers, step, ep, dtype):
+    """
+    Yield the power of the tapered segments of all the epochs, batch by batch.
+
+    The segments of `tapers.shape[1]` samples, spaced by `step` samples, are a strided
+    view of the data. They are loaded and transformed with one batched `rfft` across
+    segments, tapers and channels, by batches bounded by `_SPECTRUM_MEMORY`.
+    Each segment is detrended by removing its mean.
+
+    Yields
+    ------
+    numpy.ndarray
+        First sample of each segment of the batch.
+    numpy.ndarray
+        Power of shape (n_segments, n_channels, n_frequencies), averaged over tapers.
+    """
+    n_tapers, N = tapers.shape
+    values = sig.values
+    n_channels = int(np.prod(sig.shape[1:]))
+    itemsize = np.dtype(dtype).itemsize
+    batch = max(1, _SPECTRUM_MEMORY // (2 * itemsize * n_tapers * n_channels * N))
+
+    for idx_s, n_segments in zip(*_segment_starts(sig.index.values, ep, N, step)):
+        for b in range(0, n_segments, batch):
+            nb = min(batch, n_segments - b)
+            lo = idx_s + b * step
+            data = np.asarray(values[lo : lo + (nb - 1) * step + N], dtype=dtype)
+            data = data.reshape(len(data), n_channels)
+            # (segments, channels, time)
+            segments = np.lib.stride_tricks.sliding_window_view(data, N, axis=0)[::step]
+            segments = segments - segments.mean(-1, keepdims=True)
+            X = rfft(segments[:, None] * tapers[None, :, None], axis=-1)
+            power = (X.real**2 + X.imag**2).mean(1)
+            yield lo + np.arange(nb) * step, power
+
+
+def _segment_power(sig, tapers, step, ep, dtype):
+    """
+    Average power of the tapered segments of all the epochs.
+
+    Returns
+    -------
+    numpy.ndarray
+        Power of shape (n_frequencies, n_channels), averaged over segments and tapers.
+    int
+        Number of segments.
+    """
+    total = np.zeros((int(np.prod(sig.shape[1:])), tapers.shape[1] // 2 + 1))
+    count = 0
+    for starts, power in _iter_segment_power(sig, tapers, step, ep, dtype):
+        total += power.sum(0)
+        count += len(starts)
+    return (total / max(count, 1)).T, count
+
+
+def _one_sided_scale(N, fs):
+    """Scaling of the power of unit-energy tapers to a one-sided density."""
+    scale = np.full(N // 2 + 1, 2 / fs)
+    scale[0] = 1 / fs
+    if N % 2 == 0:
+        scale[-1] = 1 / fs
+    return scale
+
+
+def _unit_energy(tapers):
+    tapers = np.atleast_2d(tapers).astype(np.float64)
+    return tapers / np.sqrt(np.sum(tapers**2, axis=1, keepdims=True))
+
+
+def _check_segment_inputs(sig, ep, fs, overlap, dtype):
+    if not isinstance(sig, (nap.Tsd, nap.TsdFrame)):
+        raise TypeError("sig must be either a Tsd or a TsdFrame object.")
+    if not (ep is None or isinstance(ep, nap.IntervalSet)):
+        raise TypeError("ep param must be a pynapple IntervalSet object, or None")
+    if not (fs is None or isinstance(fs, Number)):
+        raise TypeError("fs must be of type float or int")
+    if not isinstance(overlap, Number) or not 0 <= overlap < 1:
+        raise ValueError("overlap must be a number between 0 (included) and 1.")
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64.")
+
+
+def _get_segment_length(duration, fs, name):
+    N = int(np.round(duration * fs))
+    if N < 2:
+        raise RuntimeError(
+            f"{name}={duration} is shorter than two samples. Try increasing {name}"
+        )
+    return N
+
+
+def _segment_spectrum(sig, interval_size, tapers_fn, overlap, fs, ep, time_unit, dtype):
+    """Common part of the Welch and multitaper estimators."""
+    _check_segment_inputs(sig, ep, fs, overlap, dtype)
+    if ep is None:
+        ep = sig.time_support
+    if fs is None:
+        fs = sig.rate
+
+    interval_size = nap.TsIndex.format_timestamps(np.array([interval_size]), time_unit)[
+        0
+    ]
+    N = _get_segment_length(interval_size, fs, "interval_size")
+    step = max(1, int(np.round(N * (1 - overlap))))
+
+    tapers = _unit_energy(tapers_fn(N))
+    power, count = _segment_power(sig, tapers.astype(dtype), step, ep, dtype)
+    if count == 0:
+        raise RuntimeError(
+            f"No epoch is longer than interval_size={interval_size}. Try decreasing interval_size"
+        )
+
+    power = (power * _one_sided_scale(N, fs)[:, None]).astype(dtype)
+    freqs = rfftfreq(N, 1 / fs)
+    if isinstance(sig, nap.TsdFrame):
+        return pd.DataFrame(power, index=freqs, columns=sig.columns)
+    return pd.DataFrame(power, index=freqs)
+
+
+def compute_welch_power_spectral_density(
+    sig,
+    interval_size,
+    overlap=0.5,
+    fs=None,
+    ep=None,
+    window="hann",
+    time_unit="s",
+    dtype=np.float64,
+):
+    """
+    Compute the power spectral density with the Welch method.
+
+    The signal is cut into overlapping segments of duration `interval_size` within each epoch.
+    Each segment is detrended, multiplied by a window and its power spectrum is computed with a real FFT.
+    The power is averaged over the segments of all the epochs.
+    The segments are processed in batches with one FFT per batch.
+
+    Note that this function assumes a constant sampling rate for `sig`.
+
+    Parameters
+    ----------
+    sig : pynapple.Tsd or pynapple.TsdFrame
+        Signal with equispaced samples
+    interval_size : Number
+        Duration of the segments
+    overlap : float, optional
+        Fraction of overlap between consecutive segments, between 0 and 1. Default is 0.5.
+    fs : None, optional
+        Sampling frequency of `sig`. If `None`, `fs` is equal to `sig.rate`
+    ep : None or pynapple.IntervalSet, optional
+        The `IntervalSet` to calculate the power spectral density on. Can be any length.
+    window : str or tuple, optional
+        Window applied to each segment, passed to `scipy.signal.get_window`. Default is 'hann'.
+    time_unit : str, optional
+        Time units for parameter `interval_size`. Can be ('s'[default], 'ms', 'us')
+    dtype : numpy.dtype, optional
+        Precision of the computation and of the output, float32 or float64 [default].
+
+    Returns
+    -------
+    pandas.DataFrame
+        One-sided power spectral density (in units**2/Hz), indexes are frequencies.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pynapple as nap
+    >>> t = np.arange(0, 100, 1/1000)
+    >>> signal = nap.Tsd(d=np.sin(t * 50 * np.pi * 2), t=t)
+    >>> psd = nap.compute_welch_power_spectral_density(signal, 1.0)
+
+    Raises
+    ------
+    RuntimeError
+        If no epoch is longer than `interval_size`.
+    TypeError
+        If `ep` or `sig` are not respectively pynapple time series or interval set.
+    ValueError
+        If `overlap` is not between 0 and 1 or `dtype` is not float32 or float64.
+    """
+    return _segment_spectrum(
+        sig,
+        interval_size,
+        lambda N: signal.get_window(window, N),
+        overlap,
+        fs,
+        ep,
+        time_unit,
+        dtype,
+    )
+
+
+def compute_multitaper_power_spectral_density(
+    sig,
+    interval_size,
+    time_bandwidth=4.0,
+    n_tapers=None,
+    overlap=0.0,
+    fs=None,
+    ep=None,
+    time_unit="s",
+    dtype=np.float64,
+):
+    """
+    Compute the power spectral density with the multitaper method.
+
+    The signal is cut into segments of duration `interval_size` within each epoch.
+    Each segment is detrended and multiplied by discrete prolate spheroidal sequences (DPSS).
+    The power is averaged over the tapers and the segments of all the epochs.
+    The segments are processed in batches with one FFT per batch across segments, tapers and channels.
+
+    Note that this function assumes a constant sampling rate for `sig`.
+
+    Parameters
+    ----------
+    sig : pynapple.Tsd or pynapple.TsdFrame
+        Signal with equispaced samples
+    interval_size : Number
+        Duration of the segments
+    time_bandwidth : float, optional
+        Time-halfbandwidth product of the tapers. The frequency resolution is
+        2 * time_bandwidth / interval_size. Default is 4.
+    n_tapers : int, optional
+        Number of tapers. Default is 2 * time_bandwidth - 1.
+    overlap : float, optional
+        Fraction of overlap between consecutive segments, between 0 and 1. Default is 0.
+    fs : None, optional
+        Sampling frequency of `sig`. If `None`, `fs` is equal to `sig.rate`
+    ep : None or pynapple.IntervalSet, optional
+        The `IntervalSet` to calculate the power spectral density on. Can be any length.
+    time_unit : str, optional
+        Time units for parameter `interval_size`. Can be ('s'[default], 'ms', 'us')
+    dtype : numpy.dtype, optional
+        Precision of the computation and of the output, float32 or float64 [default].
+
+    Returns
+    -------
+    pandas.DataFrame
+        One-sided power spectral density (in units**2/Hz), indexes are frequencies.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pynapple as nap
+    >>> t = np.arange(0, 100, 1/1000)
+    >>> signal = nap.Tsd(d=np.sin(t * 50 * np.pi * 2), t=t)
+    >>> psd = nap.compute_multitaper_power_spectral_density(signal, 2.0, time_bandwidth=3)
+
+    Raises
+    ------
+    RuntimeError
+        If no epoch is longer than `interval_size`.
+    TypeError
+        If `ep` or `sig` are not respectively pynapple time series or interval set.
+    ValueError
+        If `time_bandwidth` or `n_tapers` are not strictly positive.
+        If `overlap` is not between 0 and 1 or `dtype` is not float32 or float64.
+    """
+    if not isinstance(time_bandwidth, Number) or time_bandwidth <= 0:
+        raise ValueError("time_bandwidth must be a strictly positive number.")
+    if n_tapers is None:
+        n_tapers = max(1, int(2 * time_bandwidth) - 1)
+    if not isinstance(n_tapers, (int, np.integer)) or n_tapers <= 0:
+        raise ValueError("n_tapers must be a strictly positive integer.")
+
+    return _segment_spectrum(
+        sig,
+        interval_size,
+        lambda N: signal.windows.dpss(N, time_bandwidth, Kmax=n_tapers),
+        overlap,
+        fs,
+        ep,
+        time_unit,
+        dtype,
+    )
+
+
+def compute_spectrogram(
+    sig,
+    window,
+    step=None,
+    fs=None,
+    ep=None,
+    window_type="hann",
+    time_unit="s",
+    dtype=np.float32,
+):
+    """
+    Compute the short-time Fourier spectrogram of a signal.
+
+    The power spectral density is computed in sliding windows of duration `window` spaced by `step`.
+    Windows do not cross the boundaries of the epochs. Each window is detrended and multiplied by
+    a `window_type` taper. The windows are strided views of the data that are transformed in batches
+    with one real FFT per batch, which makes the spectrogram a cheap first pass before a wavelet
+    decomposition.
+
+    The frequencies of the spectrogram are `numpy.fft.rfftfreq(n, 1 / fs)` with `n` the number
+    of samples of a window. They are the columns of the output for a Tsd.
+
+    Note that this function assumes a constant sampling rate for `sig`.
+
+    Parameters
+    ----------
+    sig : pynapple.Tsd or pynapple.TsdFrame
+        Signal with equispaced samples
+    window : Number
+        Duration of the sliding windows
+    step : Number, optional
+        Duration between two consecutive windows. Default is half the window.
+    fs : None, optional
+        Sampling frequency of `sig`. If `None`, `fs` is equal to `sig.rate`
+    ep : None or pynapple.IntervalSet, optional
+        The `IntervalSet` to calculate the spectrogram on. Default is the time support of `sig`.
+    window_type : str or tuple, optional
+        Taper applied to each window, passed to `scipy.signal.get_window`. Default is 'hann'.
+    time_unit : str, optional
+        Time units for parameters `window` and `step`. Can be ('s'[default], 'ms', 'us')
+    dtype : numpy.dtype, optional
+        Precision of the computation and of the output, float32 [default] or float64.
+
+    Returns
+    -------
+    pynapple.TsdFrame or pynapple.TsdTensor
+        One-sided power spectral density (in units**2/Hz) of shape (time, frequency) for a Tsd
+        or (time, frequency, channel) for a TsdFrame. Timestamps are the centers of the windows.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pynapple as nap
+    >>> t = np.arange(0, 100, 1/1000)
+    >>> signal = nap.Tsd(d=np.sin(t * 50 * np.pi * 2), t=t)
+    >>> sxx = nap.compute_spectrogram(signal, window=1.0, step=0.1)
+    >>> sxx.shape
+    (991, 501)
+
+    Raises
+    ------
+    RuntimeError
+        If no epoch is longer than `window` or if `window` is shorter than two samples.
+    TypeError
+        If `ep` or `sig` are not respectively pynapple time series or interval set.
+    ValueError
+        If `step` is not strictly positive or `dtype` is not float32 or float64.
+    """
+    _check_segment_inputs(sig, ep, fs, 0.0, dtype)
+    if step is not None and (not isinstance(step, Number) or step <= 0):
+        raise ValueError("step must be a strictly positive number.")
+    if ep is None:
+        ep = sig.time_support
+    if fs is None:
+        fs = sig.rate
+
+    window = nap.TsIndex.format_timestamps(np.array([window]), time_unit)[0]
+    if step is None:
+        step = window / 2
+    else:
+        step = nap.TsIndex.format_timestamps(np.array([step]), time_unit)[0]
+    N = _get_segment_length(window, fs, "window")
+    step = max(1, int(np.round(step * fs)))
+
+    n_windows = _segment_starts(sig.index.values, ep, N, step)[1].sum()
+    if n_windows == 0:
+        raise RuntimeError(
+            f"No epoch is longer than window={window}. Try decreasing window"
+        )
+
+    taper = _unit_energy(signal.get_window(window_type, N)).astype(dtype)
+    scale = _one_sided_scale(N, fs)[:, None].astype(dtype)
+    freqs = rfftfreq(N, 1 / fs)
+
+    out = np.zeros((n_windows, len(freqs), int(np.prod(sig.shape[1:]))), dtype=dtype)
+    t = np.zeros(n_windows)
+    k = 0
+    for starts, power in _iter_segment_power(sig, taper, step, ep, dtype):
+        out[k : k + len(starts)] = power.transpose(0, 2, 1) * scale
+        t[k : k + len(starts)] = sig.index.values[starts] + N / 2 / fs
+        k += len(starts)
+
+    if isinstance(sig, nap.Tsd):
+        return nap.TsdFrame(t=t, d=out[:, :, 0], time_support=ep, columns=freqs)
+    return nap.TsdTensor(t=t, d=out, time_support=ep)
@@ -10,10 +10,213 @@ import warnings
 
 import numpy as np
 import pandas as pd
+from numba import jit, prange
 
 from .. import core as nap
 
 
+@jit(nopython=True, parallel=True)
+def _jitnearest_sample(
+    times, offsets, target_times, target_start, target_end, starts, ends
+):
+    """
+    Index of the nearest target sample of each spike of a packed group, as in `value_from`,
+    or -1 if the spike is outside the epochs. Each unit is merged with the target in parallel.
+    """
+    out = np.full(times.shape[0], -1, dtype=np.int64)
+    m = starts.shape[0]
+    for u in prange(offsets.shape[0] - 1):
+        k = 0
+        i = 0
+        for j in range(offsets[u], offsets[u + 1]):
+            t = times[j]
+            while k < m and t > ends[k]:
+                k += 1
+            if k == m:
+                break
+            if t < starts[k] or target_start[k] == target_end[k]:
+                continue
+            i = max(i, target_start[k])
+            while i + 1 < target_end[k] and abs(target_times[i + 1] - t) <= abs(
+                target_times[i] - t
+            ):
+                i += 1
+            out[j] = i
+    return out
+
+
+def _digitize(values, bins):
+    """Bin index of each value as in np.histogram, or -1 if outside of the bins."""
+    nb_bins = len(bins) - 1
+    idx = np.searchsorted(bins, values, side="right") - 1
+    idx[values == bins[-1]] = nb_bins - 1
+    idx[(idx < 0) | (idx >= nb_bins)] = -1
+    return idx
+
+
+def _spike_sample_bins(group, feature, ep, sample_bins):
+    """
+    Unit index and feature bin of every spike, the bin being the one of the nearest feature sample
+    as in `group.value_from(feature, ep)`. The group is packed and merged with the feature in one pass.
+
+    Parameters
+    ----------
+    group : TsGroup
+        The group of neurons
+    feature : Tsd or TsdFrame
+        The feature restricted to ep
+    ep : IntervalSet
+        The epochs
+    sample_bins : numpy.ndarray
+        Bin of each sample of the feature, -1 if outside of the bins
+
+    Returns
+    -------
+    unit : numpy.ndarray
+        Unit index of the spikes falling in a bin
+    bins : numpy.ndarray
+        Feature bin of these spikes
+    """
+    times = [group[k].index.values for k in group.keys()]
+    offsets = np.hstack(([0], np.cumsum([len(t) for t in times]))).astype(np.int64)
+    times = np.hstack(times).astype(np.float64) if len(times) else np.zeros(0)
+    unit = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    target_times = feature.index.values
+    idx = _jitnearest_sample(
+        times,
+        offsets,
+        target_times,
+        np.searchsorted(target_times, ep.start).astype(np.int64),
+        np.searchsorted(target_times, ep.end, side="right").astype(np.int64),
+        ep.start,
+        ep.end,
+    )
+    keep = idx >= 0
+    unit, bins = unit[keep], sample_bins[idx[keep]]
+    keep = bins >= 0
+    return unit[keep], bins[keep]
+
+
+@jit(nopython=True)
+def _jitbin_sum(idx, values, nb_bins):
+    """
+    Count and sum of each column of values within each bin. NaNs are ignored.
+    Rows with idx outside [0, nb_bins) are skipped.
+    """
+    n, m = values.shape
+    count = np.zeros((nb_bins, m), dtype=np.int64)
+    total = np.zeros((nb_bins, m), dtype=np.float64)
+    for i in range(n):
+        b = idx[i]
+        if b < 0 or b >= nb_bins:
+            continue
+        for j in range(m):
+            x = values[i, j]
+            if not np.isnan(x):
+                count[b, j] += 1
+                total[b, j] += x
+    return count, total
+
+
+@jit(nopython=True)
+def _jitbin_sum_squares(idx, values, mean):
+    """Sum of squared deviations from the mean of each bin. NaNs are ignored."""
+    n, m = values.shape
+    nb_bins = mean.shape[0]
+    m2 = np.zeros(mean.shape, dtype=np.float64)
+    for i in range(n):
+        b = idx[i]
+        if b < 0 or b >= nb_bins:
+            continue
+        for j in range(m):
+            x = values[i, j]
+            if not np.isnan(x):
+                m2[b, j] += (x - mean[b, j]) ** 2
+    return m2
+
+
+def _continuous_tuning_curves(values, idx, nb_bins, error=None):
+    """
+    Mean of each column of values in each bin, with optional variance or SEM.
+    The data are read in place, rows outside of the bins are skipped.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Data of shape (n_samples, n_columns)
+    idx : numpy.ndarray
+        Bin index of each sample, -1 or nb_bins if outside the bins
+    nb_bins : int
+        Number of bins
+    error : str, optional
+        'var' or 'sem'
+
+    Returns
+    -------
+    tc : numpy.ndarray
+        Mean of shape (nb_bins, n_columns), 0 in empty bins. Float32 if values is float32.
+    err : numpy.ndarray or None
+        Variance or SEM of shape (nb_bins, n_columns), NaN in bins with less than 2 samples
+    """
+    values = np.asarray(values)
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    idx = np.asarray(idx, dtype=np.int64)
+    count, total = _jitbin_sum(idx, values, nb_bins)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(count > 0, total / count, 0.0)
+
+    tc = mean.astype(dtype)
+    if error is None:
+        return tc, None
+
+    # Second pass on the deviations from the mean for a stable variance
+    m2 = _jitbin_sum_squares(idx, values, mean)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        err = np.where(count > 1, m2 / (count - 1), np.nan)
+        if error == "sem":
+            err = np.sqrt(err / count)
+    return tc, err.astype(dtype)
+
+
+@jit(nopython=True)
+def _jitinfo_per_spike(count, occupancy):
+    """Mutual information in bits/spike from spike counts and occupancy of the bins."""
+    total = count.sum()
+    n = occupancy.sum()
+    si = 0.0
+    for i in range(count.shape[0]):
+        if count[i] > 0 and occupancy[i] > 0:
+            si += count[i] / total * np.log2(count[i] * n / (occupancy[i] * total))
+    return si
+
+
+@jit(nopython=True, parallel=True)
+def _jitshuffled_info(spike_samples, offsets, sample_bins, occupancy, shifts):
+    """
+    Mutual information of each unit for each circular shift of its spikes over the feature samples.
+    Spikes are given as the index of their nearest feature sample.
+    """
+    n_units, n_shuffles = shifts.shape
+    n_samples = sample_bins.shape[0]
+    nb_bins = occupancy.shape[0]
+    out = np.full((n_units, n_shuffles), np.nan)
+    for u in prange(n_units):
+        if offsets[u + 1] == offsets[u]:
+            continue
+        count = np.zeros(nb_bins)
+        for r in range(n_shuffles):
+            count[:] = 0
+            for j in range(offsets[u], offsets[u + 1]):
+                b = sample_bins[(spike_samples[j] + shifts[u, r]) % n_samples]
+                if b >= 0:
+                    count[b] += 1
+            if count.sum() > 0:
+                out[u, r] = _jitinfo_per_spike(count, occupancy)
+    return out
+
+
 def compute_discrete_tuning_curves(group, dict_ep):
     """
     Compute discrete tuning curves of a TsGroup using a dictionary of epochs.
@@ -77,6 +280,9 @@ def compute_1d_tuning_curves(group, feature, nb_bins, ep=None, minmax=None):
     """
     Computes 1-dimensional tuning curves relative to a 1d feature.
 
+    The feature is digitized once and each spike is assigned the bin of its nearest feature sample.
+    The counts of all the units are obtained with a single `np.bincount`.
+
     Parameters
     ----------
     group : TsGroup
@@ -126,21 +332,21 @@ def compute_1d_tuning_curves(group, feature, nb_bins, ep=None, minmax=None):
 
     idx = bins[0:-1] + np.diff(bins) / 2
 
-    tuning_curves = pd.DataFrame(index=idx, columns=list(group.keys()))
+    rate = feature.rate
+    feature = feature.restrict(ep)
+    sample_bins = _digitize(np.asarray(feature.values).ravel(), bins)
+    occupancy = np.bincount(sample_bins[sample_bins >= 0], minlength=nb_bins)
 
-    if isinstance(ep, nap.IntervalSet):
-        group_value = group.value_from(feature, ep)
-        occupancy, _ = np.histogram(feature.restrict(ep).values, bins)
-    else:
-        group_value = group.value_from(feature)
-        occupancy, _ = np.histogram(feature.values, bins)
+    # One bincount over the combined unit x bin index of all the spikes
+    unit, spike_bins = _spike_sample_bins(group, feature, ep, sample_bins)
+    count = np.bincount(
+        unit * nb_bins + spike_bins, minlength=len(group) * nb_bins
+    ).reshape(len(group), nb_bins)
 
-    for k in group_value:
-        count, _ = np.histogram(group_value[k].values, bins)
-        count = count / occupancy
-        #count[np.isnan(count)] = 0.0 # --> this would yield an incorrect tuning curve
-        tuning_curves[k] = count
-        tuning_curves[k] = count * feature.rate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tc = count.T / occupancy[:, None] * rate
+
+    tuning_curves = pd.DataFrame(index=idx, data=tc, columns=list(group.keys()))
 
     return tuning_curves
 
@@ -229,6 +435,109 @@ def compute_2d_tuning_curves(group, features, nb_bins, ep=None, minmax=None):
     return tc, xy
 
 
+def compute_nd_tuning_curves(group, features, bins, ep=None, minmax=None):
+    """
+    Computes n-dimensional tuning curves relative to a n-d features (e.g. position x head-direction x speed).
+
+    Each sample of the features is assigned a single linearized bin index. Occupancy and spike counts are
+    only stored for the visited bins, so that the memory does not grow with the number of bins per unit.
+
+    Parameters
+    ----------
+    group : TsGroup
+        The group of Ts/Tsd for which the tuning curves will be computed
+    features : TsdFrame
+        The n-d features (i.e. one column per dimension).
+    bins : int or list of int
+        Number of bins in each dimension. If an int, the same number of bins is used for all dimensions.
+    ep : IntervalSet, optional
+        The epoch on which tuning curves are computed.
+        If None, the epoch is the time support of the features.
+    minmax : tuple or list, optional
+        The min and max boundaries of the tuning curves given as:
+        (min0, max0, min1, max1, ...)
+        If None, the boundaries are inferred from the features
+
+    Returns
+    -------
+    tuple
+        A tuple containing: \n
+        tc (numpy.ndarray): The tuning curves with dimensions (n_units, *bins), NaN for unvisited bins.\n
+        centers (list): List of bins center in each dimension
+
+    Raises
+    ------
+    RuntimeError
+        If group is not a TsGroup object or if features is not a TsdFrame.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> tc, centers = nap.compute_nd_tuning_curves(group, features, bins=[20, 20, 12, 5])
+    >>> tc.shape
+    (n_units, 20, 20, 12, 5)
+    """
+    assert isinstance(group, nap.TsGroup), "group should be a TsGroup."
+    assert isinstance(features, nap.TsdFrame), "features should be a TsdFrame"
+    ndim = features.shape[1]
+
+    if isinstance(bins, int):
+        bins = [bins] * ndim
+    assert len(bins) == ndim and all(
+        isinstance(b, int) and b > 0 for b in bins
+    ), "bins should be an int or a list of int with one element per column of features."
+    shape = tuple(bins)
+
+    if ep is None:
+        ep = features.time_support
+    else:
+        assert isinstance(ep, nap.IntervalSet), "ep should be an IntervalSet"
+
+    rate = features.rate
+    features = features.restrict(ep)
+    values = np.asarray(features.values)
+
+    if minmax is not None:
+        assert (
+            isinstance(minmax, (tuple, list)) and len(minmax) == 2 * ndim
+        ), "minmax should be a tuple of 2 elements per column of features"
+
+    edges = []
+    sample_bins = np.zeros(values.shape, dtype=np.int64)
+    for i in range(ndim):
+        if minmax is None:
+            edges.append(
+                np.linspace(
+                    np.nanmin(values[:, i]), np.nanmax(values[:, i]), shape[i] + 1
+                )
+            )
+        else:
+            edges.append(np.linspace(minmax[2 * i], minmax[2 * i + 1], shape[i] + 1))
+        sample_bins[:, i] = _digitize(values[:, i], edges[i])
+
+    # Linearized bin index of each sample, compressed to the visited bins
+    inside = np.all(sample_bins >= 0, 1)
+    linear = np.full(len(values), -1, dtype=np.int64)
+    linear[inside] = np.ravel_multi_index(tuple(sample_bins[inside].T), shape)
+    visited, compressed = np.unique(linear[inside], return_inverse=True)
+    sample_idx = np.full(len(values), -1, dtype=np.int64)
+    sample_idx[inside] = compressed.ravel()
+
+    occupancy = np.bincount(sample_idx[inside], minlength=len(visited))
+    unit, spike_idx = _spike_sample_bins(group, features, ep, sample_idx)
+    count = np.bincount(
+        unit * len(visited) + spike_idx, minlength=len(group) * len(visited)
+    ).reshape(len(group), len(visited))
+
+    tc = np.full((len(group), np.prod(shape, dtype=np.int64)), np.nan)
+    tc[:, visited] = count / occupancy * rate
+    tc = tc.reshape((len(group),) + shape)
+
+    centers = [e[0:-1] + np.diff(e) / 2 for e in edges]
+
+    return tc, centers
+
+
 def compute_1d_mutual_info(tc, feature, ep=None, minmax=None, bitssec=False):
     """
     Mutual information as defined in
@@ -391,8 +700,259 @@ def compute_2d_mutual_info(tc, features, ep=None, minmax=None, bitssec=False):
         return SI
 
 
+def compute_tuning_significance(
+    group,
+    feature,
+    nb_bins,
+    n_shuffles=1000,
+    ep=None,
+    minmax=None,
+    bitssec=False,
+    min_shift=0.0,
+    max_shift=None,
+    seed=None,
+):
+    """
+    Significance of the mutual information between spikes and a 1d feature with circular shuffles.
+
+    The null distribution of each unit is obtained by circularly shifting its spikes relative to the feature,
+    wrapping the end of the epochs to the beginning as with `shift_timestamps`. The shifts are applied to the
+    index of the feature sample of each spike, so that each shuffle only recomputes the histogram of one unit.
+    Units are processed in parallel.
+
+    The mutual information is computed as in `compute_1d_mutual_info`, ignoring the bins that are not visited.
+
+    Parameters
+    ----------
+    group : TsGroup
+        The group of Ts/Tsd for which the mutual information will be computed
+    feature : Tsd
+        The 1-dimensional target feature (e.g. head-direction)
+    nb_bins : int
+        Number of bins in the tuning curves
+    n_shuffles : int, optional
+        Number of circular shuffles per unit. Default is 1000.
+    ep : IntervalSet, optional
+        The epoch on which the information is computed.
+        If None, the epoch is the time support of the feature.
+    minmax : tuple or list, optional
+        The min and max boundaries of the tuning curves.
+        If None, the boundaries are inferred from the target feature
+    bitssec : bool, optional
+        By default, the function return bits per spikes.
+        Set to true for bits per seconds
+    min_shift : float, optional
+        Minimum shift in seconds. Default is 0.
+    max_shift : float, optional
+        Maximum shift in seconds. Default is the duration of the epochs.
+    seed : int, optional
+        Seed of the random generator of the shifts.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The mutual information ('SI') and the p-value ('pvalue') of each unit. The p-value is the
+        fraction of shuffles with an information greater or equal to the observed one (with the observed value counted).
+    numpy.ndarray
+        The null distribution of shape (n_units, n_shuffles)
+
+    Raises
+    ------
+    RuntimeError
+        If group is not a TsGroup object.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> si, null = nap.compute_tuning_significance(group, position, nb_bins=40, n_shuffles=1000, min_shift=20)
+    >>> place_cells = si[si["pvalue"] < 0.01].index
+    """
+    assert isinstance(group, nap.TsGroup), "group should be a TsGroup."
+    assert isinstance(
+        feature, (nap.Tsd, nap.TsdFrame)
+    ), "feature should be a Tsd (or TsdFrame with 1 column only)"
+    if isinstance(feature, nap.TsdFrame):
+        assert (
+            feature.shape[1] == 1
+        ), "feature should be a Tsd (or TsdFrame with 1 column only)"
+    assert isinstance(nb_bins, int)
+    assert (
+        isinstance(n_shuffles, int) and n_shuffles > 0
+    ), "n_shuffles should be a strictly positive integer"
+
+    if ep is None:
+        ep = feature.time_support
+    else:
+        assert isinstance(ep, nap.IntervalSet), "ep should be an IntervalSet"
+
+    if minmax is None:
+        bins = np.linspace(np.min(feature), np.max(feature), nb_bins + 1)
+    else:
+        assert isinstance(minmax, tuple), "minmax should be a tuple of boundaries"
+        bins = np.linspace(minmax[0], minmax[1], nb_bins + 1)
+
+    rate = feature.rate
+    feature = feature.restrict(ep)
+    n_samples = len(feature)
+    sample_bins = _digitize(np.asarray(feature.values).ravel(), bins)
+    occupancy = np.bincount(sample_bins[sample_bins >= 0], minlength=nb_bins)
+
+    # Nearest feature sample of each spike, packed by unit
+    unit, spike_samples = _spike_sample_bins(
+        group, feature, ep, np.arange(n_samples, dtype=np.int64)
+    )
+    offsets = np.searchsorted(unit, np.arange(len(group) + 1)).astype(np.int64)
+
+    # Shifts in samples of the feature
+    duration = ep.tot_length("s")
+    max_shift = duration if max_shift is None else max_shift
+    shift_range = np.array([min_shift, max_shift]) / duration * n_samples
+    rng = np.random.default_rng(seed)
+    shifts = rng.integers(
+        int(np.floor(shift_range[0])),
+        max(int(np.ceil(shift_range[1])), int(np.floor(shift_range[0])) + 1),
+        size=(len(group), n_shuffles),
+    )
+
+    observed = _jitshuffled_info(
+        spike_samples,
+        offsets,
+        sample_bins,
+        occupancy,
+        np.zeros((len(group), 1), dtype=np.int64),
+    )[:, 0]
+    null = _jitshuffled_info(spike_samples, offsets, sample_bins, occupancy, shifts)
+
+    pvalue = (1 + np.sum(null >= observed[:, None], 1)) / (1 + n_shuffles)
+    pvalue[np.isnan(observed)] = np.nan
+
+    if bitssec:
+        # Mean firing rate over the binned samples
+        binned = np.bincount(
+            unit[sample_bins[spike_samples] >= 0], minlength=len(group)
+        )
+        fr = binned / occupancy.sum() * rate
+        observed = observed * fr
+        null = null * fr[:, None]
+
+    si = pd.DataFrame(
+        index=list(group.keys()),
+        data={"SI": observed, "pvalue": pvalue},
+    )
+
+    return si, null
+
+
+def _circular_stats(unit, phases, n_units):
+    """
+    Circular statistics of the spike phases of each unit, for every channel.
+
+    The spikes are sorted by unit so that the sums of cosines and sines of each unit
+    are differences of cumulative sums (one reduction for all units and channels).
+    """
+    offsets = np.searchsorted(unit, np.arange(n_units + 1))
+    n = np.diff(offsets).astype(np.float64)[:, None]
+    cs = np.zeros((len(unit) + 1, 2, phases.shape[1]))
+    cs[1:, 0] = np.cumsum(np.cos(phases), 0)
+    cs[1:, 1] = np.cumsum(np.sin(phases), 0)
+    C, S = np.moveaxis(cs[offsets[1:]] - cs[offsets[:-1]], 1, 0)
+
+    resultant = np.sqrt(C**2 + S**2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mrl = resultant / n
+        ppc = (resultant**2 - n) / (n * (n - 1))
+    preferred_phase = np.arctan2(S, C)
+    preferred_phase[np.isnan(mrl)] = np.nan
+    # Rayleigh test (Zar, Biostatistical Analysis, equation 27.4)
+    pvalue = np.exp(np.sqrt(1 + 4 * n + 4 * (n**2 - resultant**2)) - (1 + 2 * n))
+    pvalue = np.minimum(pvalue, 1.0)
+    pvalue[np.isnan(mrl)] = np.nan
+    return {
+        "n_spikes": np.broadcast_to(n.astype(np.int64), mrl.shape),
+        "mrl": mrl,
+        "preferred_phase": preferred_phase,
+        "pvalue": pvalue,
+        "ppc": ppc,
+    }
+
+
+def compute_phase_locking(group, phase, ep=None):
+    """
+    Phase locking of spikes to one or more oscillations (e.g. LFP channels).
+
+    Each spike is given the phase of the nearest sample, as with `group.value_from(phase, ep)`,
+    but all the units are merged with the phase in a single pass over the packed spike times.
+    The circular statistics of all the units and channels are then computed at once.
+
+    For each unit (and channel), the statistics are:
+
+    - `n_spikes` : the number of spikes within `ep`.
+    - `mrl` : the mean resultant length of the spike phases, between 0 and 1.
+    - `preferred_phase` : the circular mean of the spike phases, between -pi and pi.
+    - `pvalue` : the p-value of the Rayleigh test of uniformity.
+    - `ppc` : the pairwise phase consistency (Vinck et al, 2010), unbiased by the number of spikes.
+
+    Parameters
+    ----------
+    group : TsGroup
+        The group of Ts/Tsd of the spikes.
+    phase : Tsd or TsdFrame
+        The phase in radians (e.g. from `compute_hilbert`). A TsdFrame holds one phase per column
+        (e.g. channel).
+    ep : IntervalSet, optional
+        The epoch on which the phase locking is computed.
+        If None, the epoch is the time support of the phase.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The statistics (columns) of each unit (index). For a TsdFrame, the columns are a
+        MultiIndex (statistic, channel) so that `res["mrl"]` is a DataFrame of units by channels.
+        Statistics of units without spikes (or with less than 2 spikes for `ppc`) are NaN.
+
+    Raises
+    ------
+    RuntimeError
+        If group is not a TsGroup object or phase is not a Tsd or TsdFrame.
+
+    Examples
+    --------
+    >>> import pynapple as nap
+    >>> theta = nap.apply_bandpass_filter(lfp, (6, 10))
+    >>> amplitude, phase = nap.compute_hilbert(theta)
+    >>> locking = nap.compute_phase_locking(group, phase)
+    >>> locked = locking[locking["pvalue"] < 0.01].index
+    """
+    assert isinstance(group, nap.TsGroup), "group should be a TsGroup."
+    assert isinstance(
+        phase, (nap.Tsd, nap.TsdFrame)
+    ), "phase should be a Tsd or a TsdFrame"
+
+    if ep is None:
+        ep = phase.time_support
+    else:
+        assert isinstance(ep, nap.IntervalSet), "ep should be an IntervalSet"
+        phase = phase.restrict(ep)
+
+    # Nearest phase sample of each spike, packed by unit
+    unit, samples = _spike_sample_bins(
+        group, phase, ep, np.arange(len(phase), dtype=np.int64)
+    )
+    values = np.asarray(phase.values)
+    phases = values[samples].reshape(len(samples), -1)
+    stats = _circular_stats(unit, phases, len(group))
+
+    index = list(group.keys())
+    if isinstance(phase, nap.Tsd):
+        return pd.DataFrame(index=index, data={k: v[:, 0] for k, v in stats.items()})
+    columns = pd.MultiIndex.from_product([list(stats.keys()), phase.columns])
+    return pd.DataFrame(
+        index=index, data=np.hstack(list(stats.values())), columns=columns
+    )
+
+
 def compute_1d_tuning_curves_continuous(
-    tsdframe, feature, nb_bins, ep=None, minmax=None
+    tsdframe, feature, nb_bins, ep=None, minmax=None, error=None
 ):
     """
     Computes 1-dimensional tuning curves relative to a feature with continous data.
@@ -412,16 +972,22 @@ def compute_1d_tuning_curves_continuous(
     minmax : tuple or list, optional
         The min and max boundaries of the tuning curves.
         If None, the boundaries are inferred from the target feature
+    error : str, optional
+        If 'var' or 'sem', the variance or the standard error of the mean in each bin is also returned.
+        It is computed in the same pass as the mean. NaN for bins with less than 2 samples.
 
     Returns
     -------
     pandas.DataFrame
-        DataFrame to hold the tuning curves
+        DataFrame to hold the tuning curves. Float32 if the input is float32.
+    pandas.DataFrame, optional
+        The variance or SEM if `error` is not None
 
     Raises
     ------
     RuntimeError
         If tsdframe is not a Tsd or a TsdFrame object.
+        If error is not None, 'var' or 'sem'.
 
     """
     if not isinstance(tsdframe, (nap.Tsd, nap.TsdFrame)):
@@ -429,6 +995,9 @@ def compute_1d_tuning_curves_continuous(
     elif isinstance(tsdframe, nap.Tsd):
         tsdframe = tsdframe[:, np.newaxis]
 
+    if error not in (None, "var", "sem"):
+        raise RuntimeError("error should be None, 'var' or 'sem'.")
+
     assert isinstance(
         feature, (nap.Tsd, nap.TsdFrame)
     ), "feature should be a Tsd (or TsdFrame with 1 column only)"
@@ -440,28 +1009,30 @@ def compute_1d_tuning_curves_continuous(
 
     if isinstance(ep, nap.IntervalSet):
         feature = feature.restrict(ep)
-        tsdframe = tsdframe.restrict(ep)
-    else:
-        tsdframe = tsdframe.restrict(feature.time_support)
 
     if minmax is None:
         bins = np.linspace(np.min(feature), np.max(feature), nb_bins + 1)
     else:
         bins = np.linspace(minmax[0], minmax[1], nb_bins + 1)
 
+    # Bin of each row of tsdframe, -1 outside of the epochs. The data are not copied.
     align_times = tsdframe.value_from(feature)
-    idx = np.digitize(align_times.values, bins) - 1
-    tmp = tsdframe.as_dataframe().groupby(idx).mean()
-    tmp = tmp.reindex(np.arange(0, len(bins) - 1))
-    tmp.index = pd.Index(bins[0:-1] + np.diff(bins) / 2)
+    idx = np.full(len(tsdframe), -1, dtype=np.int64)
+    idx[np.searchsorted(tsdframe.index.values, align_times.index.values)] = (
+        np.digitize(align_times.values, bins) - 1
+    )
+    tc, err = _continuous_tuning_curves(tsdframe.values, idx, nb_bins, error)
 
-    tmp = tmp.fillna(0)
+    index = pd.Index(bins[0:-1] + np.diff(bins) / 2)
+    tc = pd.DataFrame(index=index, data=tc, columns=tsdframe.columns)
 
-    return pd.DataFrame(tmp)
+    if error is None:
+        return tc
+    return tc, pd.DataFrame(index=index, data=err, columns=tsdframe.columns)
 
 
 def compute_2d_tuning_curves_continuous(
-    tsdframe, features, nb_bins, ep=None, minmax=None
+    tsdframe, features, nb_bins, ep=None, minmax=None, error=None
 ):
     """
     Computes 2-dimensional tuning curves relative to a 2d feature with continous data.
@@ -482,18 +1053,23 @@ def compute_2d_tuning_curves_continuous(
         The min and max boundaries of the tuning curves.
         Should be a tuple of minx, maxx, miny, maxy
         If None, the boundaries are inferred from the target feature
+    error : str, optional
+        If 'var' or 'sem', the variance or the standard error of the mean in each bin is also returned.
+        It is computed in the same pass as the mean. NaN for bins with less than 2 samples.
 
     Returns
     -------
     tuple
         A tuple containing: \n
         tc (dict): Dictionary of the tuning curves with dimensions (nb_bins, nb_bins).\n
-        xy (list): List of bins center in the two dimensions
+        xy (list): List of bins center in the two dimensions\n
+        err (dict): Dictionary of the variance or SEM, only if `error` is not None.
 
     Raises
     ------
     RuntimeError
         If tsdframe is not a Tsd/TsdFrame or if features is not 2 columns
+        If error is not None, 'var' or 'sem'.
 
     """
     if not isinstance(tsdframe, (nap.Tsd, nap.TsdFrame)):
@@ -501,6 +1077,9 @@ def compute_2d_tuning_curves_continuous(
     elif isinstance(tsdframe, nap.Tsd):
         tsdframe = tsdframe[:, np.newaxis]
 
+    if error not in (None, "var", "sem"):
+        raise RuntimeError("error should be None, 'var' or 'sem'.")
+
     assert isinstance(
         features, nap.TsdFrame
     ), "features should be a TsdFrame with 2 columns"
@@ -509,9 +1088,8 @@ def compute_2d_tuning_curves_continuous(
 
     if isinstance(ep, nap.IntervalSet):
         features = features.restrict(ep)
-        tsdframe = tsdframe.restrict(ep)
     else:
-        tsdframe = tsdframe.restrict(features.time_support)
+        ep = features.time_support
 
     if isinstance(nb_bins, int):
         nb_bins = (nb_bins, nb_bins)
@@ -535,18 +1113,25 @@ def compute_2d_tuning_curves_continuous(
         idxs[c] = np.digitize(align_times.values.flatten(), bins) - 1
         binsxy[c] = bins
 
-    idxs = pd.DataFrame(idxs)
-
-    tc_np = np.zeros((tsdframe.shape[1], nb_bins[0], nb_bins[1])) * np.nan
-
-    for k, tmp in idxs.groupby(cols):
-        if (0 <= k[0] < nb_bins[0]) and (0 <= k[1] < nb_bins[1]):
-            tc_np[:, k[0], k[1]] = np.mean(tsdframe[tmp.index.values].values, 0)
+    # Linear index of the 2d bins for each row of tsdframe, -1 outside. The data are not copied.
+    ix, iy = idxs[cols[0]], idxs[cols[1]]
+    inside = (ix >= 0) & (ix < nb_bins[0]) & (iy >= 0) & (iy < nb_bins[1])
+    idx = np.full(len(tsdframe), -1, dtype=np.int64)
+    idx[np.searchsorted(tsdframe.index.values, align_times.index.values)] = np.where(
+        inside, ix * nb_bins[1] + iy, -1
+    )
 
-    tc_np[np.isnan(tc_np)] = 0.0
+    tc_np, err_np = _continuous_tuning_curves(
+        tsdframe.values, idx, nb_bins[0] * nb_bins[1], error
+    )
+    tc_np = tc_np.T.reshape(tsdframe.shape[1], nb_bins[0], nb_bins[1])
 
     xy = [binsxy[c][0:-1] + np.diff(binsxy[c]) / 2 for c in binsxy.keys()]
 
     tc = {c: tc_np[i] for i, c in enumerate(tsdframe.columns)}
 
-    return tc, xy
+    if error is None:
+        return tc, xy
+
+    err_np = err_np.T.reshape(tsdframe.shape[1], nb_bins[0], nb_bins[1])
+    return tc, xy, {c: err_np[i] for i, c in enumerate(tsdframe.columns)}
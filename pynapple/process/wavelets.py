@@ -9,9 +9,13 @@ the function `nap.generate_morlet_filterbank` to plot the wavelets.
 """
 
 import numpy as np
+from scipy.fft import fft, ifft, next_fast_len
 
 from .. import core as nap
 
+# Memory budget (in bytes) of the temporary arrays of the wavelet transform
+_CWT_MEMORY = 2**28
+
 
 def _morlet(M=1024, gaussian_width=1.5, window_length=1.0, precision=8):
     """
@@ -41,12 +45,118 @@ def _morlet(M=1024, gaussian_width=1.5, window_length=1.0, precision=8):
     )
 
 
+# Transformation of the complex coefficients before writing the output
+_OUTPUTS = {
+    "complex": None,
+    "power": lambda y: y.real**2 + y.imag**2,
+    "amplitude": np.abs,
+    "phase": np.angle,
+}
+
+
+def _fft_convolve_epoch(
+    values,
+    idx_s,
+    idx_e,
+    filter_bank,
+    out,
+    offset,
+    chunk_size=None,
+    batch_size=None,
+    step=1,
+    transform=None,
+):
+    """
+    Convolve each channel of one epoch with each wavelet of the filter bank in the frequency domain.
+
+    The alignment is the same as `Tsd.convolve` with trim='both' (zeros outside of the epoch).
+    The epoch is processed by chunks of time (overlap-discard) and by batches of frequencies
+    to bound the size of the temporary arrays. Only the chunk being processed is read from `values`
+    and each block is written into `out` with a slice assignment, so both can be lazy arrays
+    (memmap, HDF5, Zarr).
+
+    Parameters
+    ----------
+    values : array-like
+        Signal of shape (n_time, ...)
+    idx_s, idx_e : int
+        Indices of the epoch in values
+    filter_bank : numpy.ndarray
+        Complex wavelets of shape (n_kernel, n_freqs)
+    out : array-like
+        Output of shape (n_out, n_freqs, ...), filled in place
+    offset : int
+        Index in out of the first output sample of the epoch
+    chunk_size : int, optional
+        Number of samples computed at once.
+    batch_size : int, optional
+        Number of frequencies computed at once.
+    step : int, optional
+        Only one sample every `step` is written, starting with the first sample of the epoch.
+    transform : callable, optional
+        Applied to the complex coefficients before writing.
+    """
+    n_time = idx_e - idx_s
+    n_channels = int(np.prod(values.shape[1:]))
+    k, n_freqs = filter_bank.shape
+    c0 = (k - 1) // 2
+    itemsize = np.dtype(filter_bank.dtype).itemsize
+
+    if chunk_size is None:
+        chunk_size = max(k, _CWT_MEMORY // (itemsize * n_channels) - k)
+    kernels = {}  # FFT of the filter bank for each FFT length
+
+    for a in range(0, n_time, chunk_size):
+        b = min(a + chunk_size, n_time)
+        first = -(-a // step) * step  # First written sample of the chunk
+        if first >= b:
+            continue
+        # Input samples needed for the output samples [a, b)
+        lo = max(a + c0 - k + 1, 0)
+        hi = min(b + c0, n_time)
+        n_fft = next_fast_len(hi - lo + k - 1)
+
+        data = np.asarray(values[idx_s + lo : idx_s + hi]).reshape(hi - lo, -1)
+        X = fft(data, n=n_fft, axis=0)
+        if n_fft not in kernels:
+            if len(kernels) > 2:
+                kernels.clear()
+            kernels[n_fft] = fft(filter_bank, n=n_fft, axis=0)
+        H = kernels[n_fft]
+
+        batch = batch_size
+        if batch is None:
+            batch = max(1, _CWT_MEMORY // (itemsize * n_fft * n_channels))
+        rows = slice(offset + first // step, offset + (b - 1) // step + 1)
+        for f in range(0, n_freqs, batch):
+            Y = ifft(X[:, None, :] * H[:, f : f + batch, None], axis=0)
+            Y = Y[first + c0 - lo : b + c0 - lo : step]
+            if transform is not None:
+                Y = transform(Y)
+            out[rows, f : f + batch] = Y.reshape(Y.shape[0:2] + tuple(out.shape[2:]))
+
+
 def compute_wavelet_transform(
-    sig, freqs, fs=None, gaussian_width=1.5, window_length=1.0, precision=16, norm="l1"
+    sig,
+    freqs,
+    fs=None,
+    gaussian_width=1.5,
+    window_length=1.0,
+    precision=16,
+    norm="l1",
+    chunk_size=None,
+    batch_size=None,
+    output="complex",
+    output_rate=None,
+    out=None,
 ):
     """
     Compute the time-frequency representation of a signal using Morlet wavelets.
 
+    The convolution with each wavelet is computed in the frequency domain: one FFT of the signal per chunk
+    of each epoch, multiplied by the FFT of each wavelet and inverse transformed. The output is complex64
+    if the signal is float32 and complex128 otherwise.
+
     Parameters
     ----------
     sig : pynapple.Tsd or pynapple.TsdFrame or pynapple.TsdTensor
@@ -67,12 +177,34 @@ def compute_wavelet_transform(
         - None - no normalization
         - 'l1' - (default) divide by the sum of amplitudes
         - 'l2' - divide by the square root of the sum of amplitudes
+    chunk_size : int, optional
+        Number of time points transformed at once within each epoch. By default, it is chosen to keep
+        the temporary arrays within a fixed memory budget.
+    batch_size : int, optional
+        Number of frequencies transformed at once. By default, it is chosen to keep the temporary arrays
+        within a fixed memory budget.
+    output : {'complex', 'power', 'amplitude', 'phase'}, optional
+        The complex coefficients (default) or their power, amplitude or phase as float32.
+    output_rate : float, optional
+        If given, the output is decimated in time after the transform by keeping one sample every
+        `round(fs / output_rate)` samples, starting at the beginning of each epoch.
+    out : array-like, optional
+        Array filled chunk by chunk with the output, e.g. a `numpy.memmap`, an HDF5 or a Zarr dataset.
+        Its shape should be (n_out, len(freqs), *sig.shape[1:]), with n_out the number of samples after
+        decimation, and its dtype should match the output. The returned object is backed by it without loading it.
 
     Returns
     -------
     pynapple.TsdFrame or pynapple.TsdTensor
         Time frequency representation of the input signal.
 
+    Raises
+    ------
+    ValueError
+        If `output` is not valid.
+        If `output_rate` is not strictly positive.
+        If `out` does not have the shape of the output.
+
     Examples
     --------
     >>> import numpy as np
@@ -103,36 +235,74 @@ def compute_wavelet_transform(
     if norm is not None and norm not in ["l1", "l2"]:
         raise ValueError("norm parameter must be 'l1', 'l2', or None.")
 
+    for name, value in [("chunk_size", chunk_size), ("batch_size", batch_size)]:
+        if value is not None and (not isinstance(value, int) or value <= 0):
+            raise ValueError(f"{name} must be a strictly positive integer or None.")
+
+    if output not in _OUTPUTS:
+        raise ValueError(
+            "output parameter must be 'complex', 'power', 'amplitude' or 'phase'."
+        )
+
     if fs is None:
         fs = sig.rate
 
-    output_shape = (sig.shape[0], len(freqs), *sig.shape[1:])
-    sig = np.reshape(sig, (sig.shape[0], -1))
+    step = 1
+    if output_rate is not None:
+        if not isinstance(output_rate, (int, float, np.number)) or output_rate <= 0:
+            raise ValueError("output_rate must be a strictly positive number.")
+        step = max(1, int(np.round(fs / output_rate)))
 
     filter_bank = generate_morlet_filterbank(
         freqs, fs, gaussian_width, window_length, precision
-    )
-    convolved_real = sig.convolve(filter_bank.real().values)
-    convolved_imag = sig.convolve(filter_bank.imag().values)
-    convolved = convolved_real.values + convolved_imag.values * 1j
+    ).values
 
     if norm == "l1":
-        coef = convolved / (fs / freqs)
+        filter_bank = filter_bank / (fs / freqs)
     elif norm == "l2":
-        coef = convolved / (fs / np.sqrt(freqs))
-    else:
-        coef = convolved
-    cwt = np.expand_dims(coef, -1) if len(coef.shape) == 2 else coef
-
-    if len(output_shape) == 2:
-        return nap.TsdFrame(
-            t=sig.index, d=cwt.reshape(output_shape), time_support=sig.time_support
-        )
+        filter_bank = filter_bank / (fs / np.sqrt(freqs))
 
-    return nap.TsdTensor(
-        t=sig.index, d=cwt.reshape(output_shape), time_support=sig.time_support
+    filter_bank = filter_bank.astype(
+        np.complex64 if sig.dtype == np.float32 else np.complex128
     )
 
+    # Output samples of each epoch after decimation
+    time_array = sig.index.values
+    idx_s = np.searchsorted(time_array, sig.time_support.start)
+    idx_e = np.searchsorted(time_array, sig.time_support.end, side="right")
+    n_out = -(-(idx_e - idx_s) // step)
+    offsets = np.hstack(([0], np.cumsum(n_out)))
+    t = np.hstack([time_array[s:e:step] for s, e in zip(idx_s, idx_e)])
+
+    output_shape = (len(t), len(freqs), *sig.shape[1:])
+    if out is None:
+        dtype = filter_bank.dtype if output == "complex" else np.float32
+        cwt = np.zeros(output_shape, dtype=dtype)
+    else:
+        if tuple(out.shape) != output_shape:
+            raise ValueError(
+                f"out should be of shape {output_shape}, got {tuple(out.shape)}."
+            )
+        cwt = out
+
+    for i in range(len(idx_s)):
+        if idx_e[i] > idx_s[i]:
+            _fft_convolve_epoch(
+                sig.values,
+                idx_s[i],
+                idx_e[i],
+                filter_bank,
+                cwt,
+                offsets[i],
+                chunk_size,
+                batch_size,
+                step,
+                _OUTPUTS[output],
+            )
+
+    nap_class = nap.TsdFrame if cwt.ndim == 2 else nap.TsdTensor
+    return nap_class(t=t, d=cwt, time_support=sig.time_support, load_array=out is None)
+
 
 def generate_morlet_filterbank(
     freqs, fs, gaussian_width=1.5, window_length=1.0, precision=16
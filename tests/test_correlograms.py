@@ -159,6 +159,53 @@ class Test_Correlograms:
             cc2[(0,2)].values
             )
 
+    def test_crosscorrelogram_array(self, group):
+        cc = nap.compute_crosscorrelogram(group, 1, 100, norm=False)
+        arr, times = nap.compute_crosscorrelogram(group, 1, 100, norm=False, output="array")
+        assert arr.shape == (201, 4, 4)
+        np.testing.assert_array_almost_equal(times, np.arange(-100, 101, 1))
+        for i, n in enumerate(group.keys()):
+            assert np.all(np.isnan(arr[:, i, i]))
+            for j, m in enumerate(group.keys()):
+                if i != j:
+                    expected = nap.process.correlograms._cross_correlogram(
+                        group[n].index, group[m].index, 1, 100
+                    )[0]
+                    np.testing.assert_array_almost_equal(arr[:, i, j], expected)
+        for i, j in cc.columns:
+            np.testing.assert_array_almost_equal(arr[:, i, j], cc[(i, j)].values)
+
+        groups = (group[[0, 1]], group[[2, 3]])
+        cc = nap.compute_crosscorrelogram(groups, 1, 100)
+        arr, times = nap.compute_crosscorrelogram(groups, 1, 100, output="array")
+        assert arr.shape == (201, 2, 2)
+        for i, n in enumerate(groups[0].keys()):
+            for j, m in enumerate(groups[1].keys()):
+                np.testing.assert_array_almost_equal(arr[:, i, j], cc[(n, m)].values)
+
+    def test_crosscorrelogram_output_error(self, group):
+        with pytest.raises(ValueError, match="Output bla is not accepted"):
+            nap.compute_crosscorrelogram(group, 1, 100, output="bla")
+
+    def test_crosscorrelogram_fft(self, group):
+        cc = nap.compute_crosscorrelogram(group, 1, 100)
+        cc2 = nap.compute_crosscorrelogram(group, 1, 100, method="fft")
+        pd.testing.assert_frame_equal(cc, cc2)
+
+        ep = nap.IntervalSet(start=[0, 50.5], end=[40, 99])
+        cc = nap.compute_crosscorrelogram(group, 1, 10, ep=ep)
+        cc2 = nap.compute_crosscorrelogram(group, 1, 10, ep=ep, method="fft")
+        pd.testing.assert_frame_equal(cc, cc2)
+
+        groups = (group[[0, 1]], group[[2, 3]])
+        cc = nap.compute_crosscorrelogram(groups, 1, 100)
+        cc2 = nap.compute_crosscorrelogram(groups, 1, 100, method="fft")
+        pd.testing.assert_frame_equal(cc, cc2)
+
+    def test_crosscorrelogram_method_error(self, group):
+        with pytest.raises(ValueError, match="Method bla is not accepted"):
+            nap.compute_crosscorrelogram(group, 1, 100, method="bla")
+
     def test_eventcorrelogram(self, group):
         cc = nap.compute_eventcorrelogram(group, group[0], 1, 100, norm=False)
         cc2 = nap.compute_crosscorrelogram(group, 1, 100, norm=False)
@@ -196,3 +243,205 @@ class Test_Correlograms:
         with pytest.raises(RuntimeError) as e_info:
             nap.compute_eventcorrelogram([1,2,3], group[0], 1, 100)
         assert str(e_info.value) == "Unknown format for group"
+
+
+def test_crosscorrelogram_all_pairs():
+    group = nap.TsGroup(
+        {i: nap.Ts(t=np.sort(np.random.uniform(0, 100, 100 + 20 * i))) for i in range(6)}
+    )
+    cc = nap.compute_crosscorrelogram(group, 0.01, 0.5, norm=False)
+    assert cc.shape[1] == 15
+    for i, j in cc.columns:
+        expected, times = nap.process.correlograms._cross_correlogram(
+            group[i].index, group[j].index, 0.01, 0.5
+        )
+        np.testing.assert_array_almost_equal(cc.index.values, times)
+        np.testing.assert_array_almost_equal(cc[(i, j)].values, expected)
+
+    cc = nap.compute_crosscorrelogram(nap.TsGroup({0: nap.Ts(t=np.arange(10))}), 1, 5)
+    assert isinstance(cc, pd.DataFrame)
+    assert cc.shape == (11, 0)
+
+
+@pytest.mark.parametrize("n_surrogates", [0, 5])
+def test_crosscorrelogram_array_mirror(monkeypatch, n_surrogates):
+    rng = np.random.default_rng(0)
+    group = nap.TsGroup({i: nap.Ts(t=np.sort(rng.uniform(0, 100, 2000))) for i in range(3)})
+    pairs = []
+    for name in ["_cross_correlogram_pairs", "_cross_correlogram_surrogates"]:
+        kernel = getattr(nap.process.correlograms, name)
+        monkeypatch.setattr(
+            nap.process.correlograms,
+            name,
+            lambda times, offsets, p, *args, kernel=kernel: pairs.append(p.tolist()) or kernel(times, offsets, p, *args),
+        )
+    out = nap.compute_crosscorrelogram(
+        group, 0.001, 0.02, norm=False, output="array", n_surrogates=n_surrogates, jitter=0.01
+    )
+    arr = out[0][0] if n_surrogates else out[0]
+    if n_surrogates == 0:
+        # Only the 3 unordered pairs are computed
+        assert len(pairs) == 1 and sorted(pairs[0]) == [[0, 1], [0, 2], [1, 2]]
+    else:
+        # The surrogates of (j, i) jitter i, all the ordered pairs are computed
+        assert len(pairs) == 1 and sorted(pairs[0]) == [[i, j] for i in range(3) for j in range(3) if i != j]
+    for i in range(3):
+        for j in range(3):
+            if i != j:
+                expected = nap.process.correlograms._cross_correlogram(
+                    group[i].index, group[j].index, 0.001, 0.02
+                )[0]
+                np.testing.assert_array_almost_equal(arr[:, i, j], expected)
+    if n_surrogates:
+        for v in out[1].values():
+            assert np.all(np.isnan(v[:, [0, 1, 2], [0, 1, 2]]))
+            assert not np.any(np.isnan(v[:, 0, 1]))
+            assert not np.any(np.isnan(v[:, 1, 0]))
+
+
+def test_crosscorrelogram_fft_approximation():
+    rng = np.random.default_rng(0)
+    group = nap.TsGroup(
+        {i: nap.Ts(t=np.sort(rng.uniform(0, 100, 2000))) for i in range(3)}
+    )
+    cc = nap.compute_crosscorrelogram(group, 0.001, 0.1, norm=False)
+    cc2 = nap.compute_crosscorrelogram(group, 0.001, 0.1, norm=False, method="fft")
+    assert cc.shape == cc2.shape
+    np.testing.assert_array_almost_equal(cc.index.values, cc2.index.values)
+    # Same total number of coincidences, up to the window edges
+    np.testing.assert_allclose(cc.values.sum(0), cc2.values.sum(0), rtol=0.02)
+
+
+def test_crosscorrelogram_fft_memory(monkeypatch):
+    rng = np.random.default_rng(0)
+    group = nap.TsGroup(
+        {i: nap.Ts(t=np.sort(rng.uniform(0, 100, 2000))) for i in range(3)}
+    )
+    cc = nap.compute_crosscorrelogram(group, 0.001, 0.1, method="direct")
+    cc_fft = nap.compute_crosscorrelogram(group, 0.001, 0.1, method="fft")
+    assert not cc_fft.equals(cc)
+
+    # 3 units binned at 1 ms during 100 s take about 5 MB
+    monkeypatch.setattr(nap.process.correlograms, "_CORRELOGRAM_MEMORY", 2**22)
+    pd.testing.assert_frame_equal(nap.compute_crosscorrelogram(group, 0.001, 0.1, method="fft"), cc)
+    monkeypatch.setattr(nap.process.correlograms, "_CORRELOGRAM_MEMORY", 2**23)
+    pd.testing.assert_frame_equal(nap.compute_crosscorrelogram(group, 0.001, 0.1, method="fft"), cc_fft)
+
+
+def surrogate_group():
+    rng = np.random.default_rng(0)
+    t1 = np.sort(rng.uniform(0, 100, 2000))
+    t2 = np.sort(np.concatenate([rng.uniform(0, 100, 1500), t1[::4] + 0.0025]))
+    t3 = np.sort(rng.uniform(0, 100, 1000))
+    return nap.TsGroup({0: nap.Ts(t1), 1: nap.Ts(t2), 2: nap.Ts(t3)})
+
+
+@pytest.mark.parametrize(
+    "surrogate, jitter",
+    [("jitter", 10), ("interval_jitter", 10), ("shift", None), ("shift", 5000)],
+)
+def test_crosscorrelogram_surrogates(surrogate, jitter):
+    group = surrogate_group()
+    cc, sur = nap.compute_crosscorrelogram(
+        group, 1, 20, n_surrogates=200, surrogate=surrogate, jitter=jitter,
+        time_units="ms", seed=1,
+    )
+    pd.testing.assert_frame_equal(cc, nap.compute_crosscorrelogram(group, 1, 20, time_units="ms"))
+    assert list(sur.keys()) == ["mean", "lower", "upper", "pvalue"]
+    for v in sur.values():
+        assert isinstance(v, pd.DataFrame)
+        pd.testing.assert_index_equal(v.index, cc.index)
+        pd.testing.assert_index_equal(v.columns, cc.columns)
+    assert np.all(sur["lower"].values <= sur["mean"].values)
+    assert np.all(sur["mean"].values <= sur["upper"].values)
+    assert np.all((sur["pvalue"].values > 0) & (sur["pvalue"].values <= 1))
+
+    # Synchronous spikes at 2 ms
+    assert sur["pvalue"][(0, 1)].values[22] < 0.01
+    # Independent trains
+    np.testing.assert_allclose(sur["mean"][(0, 2)].values.mean(), 1, atol=0.1)
+    assert np.mean(sur["pvalue"][(0, 2)].values < 0.05) < 0.2
+
+    # Reproducibility
+    _, sur2 = nap.compute_crosscorrelogram(
+        group, 1, 20, n_surrogates=200, surrogate=surrogate, jitter=jitter,
+        time_units="ms", seed=1,
+    )
+    for k in sur:
+        pd.testing.assert_frame_equal(sur[k], sur2[k])
+
+
+def test_crosscorrelogram_surrogates_array():
+    group = surrogate_group()
+    cc, sur = nap.compute_crosscorrelogram(
+        group, 0.001, 0.02, n_surrogates=20, jitter=0.01, output="array", seed=1
+    )
+    assert cc[0].shape == (41, 3, 3)
+    for v in sur.values():
+        assert v.shape == (41, 3, 3)
+        assert np.all(np.isnan(v[:, 0, 0]))
+
+    _, sur2 = nap.compute_crosscorrelogram(
+        group, 0.001, 0.02, n_surrogates=20, jitter=0.01, seed=1, norm=False
+    )
+    assert sur2["mean"].shape == (41, 3)
+
+
+@pytest.mark.parametrize("output", ["dataframe", "array"])
+def test_crosscorrelogram_surrogates_return_type(output):
+    rng = np.random.default_rng(0)
+    group = nap.TsGroup({i: nap.Ts(t=np.sort(rng.uniform(0, 100, 1000))) for i in range(3)})
+    out = nap.compute_crosscorrelogram(group, 0.001, 0.02, output=output)
+    out_sur = nap.compute_crosscorrelogram(
+        group, 0.001, 0.02, output=output, n_surrogates=5, jitter=0.01, seed=1
+    )
+    assert isinstance(out_sur, tuple) and len(out_sur) == 2
+    assert isinstance(out_sur[1], dict)
+    if output == "dataframe":
+        assert isinstance(out, pd.DataFrame)
+        pd.testing.assert_frame_equal(out_sur[0], out)
+    else:
+        assert isinstance(out, tuple) and len(out) == 2
+        np.testing.assert_array_equal(out_sur[0][0], out[0])
+        np.testing.assert_array_equal(out_sur[0][1], out[1])
+
+
+@pytest.mark.parametrize("mode, jitter", [(0, 0.5), (0, 50.0), (1, 0.7), (2, 50.0)])
+def test_surrogate_timestamps_within_epochs(mode, jitter):
+    starts = np.array([0.0, 10.0, 30.0])
+    ends = np.array([2.0, 11.0, 35.0])
+    t = np.sort(np.concatenate([np.linspace(s, e, 50) for s, e in zip(starts, ends)]))
+    np.random.seed(0)
+    for _ in range(20):
+        new_t = nap.process.correlograms._surrogate_timestamps(t, mode, jitter, starts, ends)
+        assert len(new_t) == len(t)
+        k = np.searchsorted(starts, new_t, side="right") - 1
+        assert np.all(k >= 0)
+        assert np.all(new_t <= ends[k])
+
+
+def test_surrogate_timestamps_shift_skips_gaps():
+    starts = np.array([0.0, 10.0])
+    ends = np.array([2.0, 11.0])
+    t = np.array([0.5, 1.0, 10.5])
+    np.random.seed(0)
+    for _ in range(20):
+        new_t = nap.process.correlograms._surrogate_timestamps(t, 2, 3.0, starts, ends)
+        # Circular shift of the time elapsed within the epochs
+        u = np.where(new_t < 10, new_t, new_t - 8)
+        d = np.sort(np.diff(np.concatenate([u, u[0:1] + 3])))
+        np.testing.assert_allclose(d, [0.5, 1.0, 1.5])
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        (dict(n_surrogates=-1), "n_surrogates should be a positive integer."),
+        (dict(n_surrogates=10, jitter=1, method="fft"), "Surrogates are only available with method 'direct'."),
+        (dict(n_surrogates=10, surrogate="bla"), "Surrogate bla is not accepted."),
+        (dict(n_surrogates=10, surrogate="jitter"), "jitter should be provided for surrogate 'jitter'."),
+    ],
+)
+def test_crosscorrelogram_surrogates_errors(kwargs, expected):
+    with pytest.raises(ValueError, match=expected):
+        nap.compute_crosscorrelogram(surrogate_group(), 0.001, 0.02, **kwargs)
@@ -187,3 +187,284 @@ def test_decoded_2d_raise_errors():
     with pytest.raises(Exception) as e_info:
         nap.decode_2d(tc, group, ep, 1, xy)
     assert str(e_info.value) == "Difference indexes for tuning curves and group keys"
+
+
+def get_testing_set_poisson(n_neurons=20, n_bins=30, duration=200):
+    rng = np.random.default_rng(42)
+    centers = rng.uniform(0, 1, n_neurons)
+    x = np.linspace(0, 1, n_bins)
+    rates = 1 + 20 * np.exp(-((x[:, None] - centers[None, :]) ** 2) / 0.01)
+    tc = pd.DataFrame(index=x, data=rates, columns=np.arange(n_neurons))
+    group = nap.TsGroup(
+        {
+            i: nap.Ts(np.sort(rng.uniform(0, duration, rng.poisson(5 * duration))))
+            for i in range(n_neurons)
+        }
+    )
+    ep = nap.IntervalSet(start=0, end=duration)
+    return tc, group, ep
+
+
+def decode_1d_product(tc, group, ep, bin_size):
+    # Reference implementation with the product of likelihoods
+    count = group.count(bin_size, ep).values
+    tcv = tc.values
+    p1 = np.exp(-bin_size * tcv.sum(1))
+    p2 = np.prod(tcv[None, :, :] ** count[:, None, :], axis=2)
+    occupancy = np.ones(len(tc)) / len(tc)
+    p = p1 * p2 * occupancy
+    return p / p.sum(1, keepdims=True)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("chunk_size", [None, 7, 1000])
+def test_decode_1d_log_domain(dtype, chunk_size):
+    tc, group, ep = get_testing_set_poisson(n_neurons=4)
+    expected = decode_1d_product(tc, group, ep, 0.1)
+    decoded, proba = nap.decode_1d(
+        tc, group, ep, bin_size=0.1, dtype=dtype, chunk_size=chunk_size
+    )
+    assert proba.values.dtype == dtype
+    np.testing.assert_array_equal(decoded.values, tc.index.values[expected.argmax(1)])
+    np.testing.assert_allclose(
+        proba.values, expected, rtol=1e-3 if dtype == np.float32 else 1e-7, atol=1e-6
+    )
+
+
+def test_decode_1d_many_neurons():
+    tc, group, ep = get_testing_set_poisson(n_neurons=300, duration=20)
+    decoded, proba = nap.decode_1d(tc, group, ep, bin_size=0.5)
+    assert not np.any(np.isnan(proba.values))
+    assert not np.any(np.isnan(decoded.values))
+    np.testing.assert_allclose(proba.values.sum(1), 1)
+
+
+def test_decode_1d_zero_rate():
+    feature, group, tc, ep = get_testing_set_1d()
+    # Neuron 1 never fires in bin 0 so a spike from neuron 1 excludes bin 0
+    decoded, proba = nap.decode_1d(tc, group, ep, bin_size=1)
+    np.testing.assert_array_equal(proba.values[50:, 0], 0.0)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3])
+def test_decode_2d_log_domain(chunk_size):
+    features, group, tc, ep, xy = get_testing_set_2d()
+    decoded, proba = nap.decode_2d(
+        tc, group, ep, 1, xy, dtype=np.float32, chunk_size=chunk_size
+    )
+    assert proba.dtype == np.float32
+    np.testing.assert_array_almost_equal(features.values, decoded.values)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_online_decoder_update_1d(dtype):
+    tc, group, ep = get_testing_set_poisson()
+    decoded, proba = nap.decode_1d(tc, group, ep, bin_size=0.1)
+    count = group.count(0.1, ep)
+
+    decoder = nap.OnlineDecoder(tc, bin_size=0.1, dtype=dtype)
+    p = decoder.update(count.values)
+    assert p.shape == proba.shape
+    assert p.dtype == dtype
+    np.testing.assert_allclose(p, proba.values, rtol=1e-3, atol=1e-6)
+    np.testing.assert_array_equal(tc.index.values[np.argmax(p, 1)], decoded.values)
+    assert decoder.decoded == decoded.values[-1]
+
+    decoder.reset()
+    for i in range(10):
+        p = decoder.update(count.values[i])
+        assert p.shape == (len(tc),)
+        np.testing.assert_allclose(p, proba.values[i], rtol=1e-3, atol=1e-6)
+
+
+def test_online_decoder_update_2d():
+    features, group, tc, ep, xy = get_testing_set_2d()
+    decoded, proba = nap.decode_2d(tc, group, ep, 1, xy)
+    decoder = nap.OnlineDecoder(tc, bin_size=1, xy=xy)
+    p = decoder.update(group.count(1, ep).values)
+    np.testing.assert_array_almost_equal(p, proba)
+    np.testing.assert_array_equal(decoder.decoded, decoded.values[-1])
+
+
+def test_online_decoder_push():
+    tc, group, ep = get_testing_set_poisson(duration=20)
+    count = group.count(0.1, ep)
+    decoder = nap.OnlineDecoder(tc, bin_size=100, time_units="ms")
+    expected = decoder.update(count.values)
+    decoder.reset()
+
+    t = np.hstack([group[i].t for i in group])
+    n = np.hstack([np.full(len(group[i]), i) for i in group])
+    order = np.argsort(t)
+    t, n = t[order] * 1e3, n[order]
+
+    p = [decoder.push(t[i : i + 37], n[i : i + 37]) for i in range(0, len(t), 37)]
+    p.append(decoder.push([], [], t=20000))
+    p = np.vstack(p)
+    np.testing.assert_allclose(p, expected[0 : len(p)])
+    assert len(p) == len(count)
+
+    # Bins without spikes are decoded up to t
+    decoder.reset(start=0)
+    assert decoder.push([], [], t=1000).shape == (10, len(tc))
+
+
+def test_online_decoder_transition():
+    tc, group, ep = get_testing_set_poisson()
+    count = group.count(0.1, ep).values
+    p0 = nap.OnlineDecoder(tc, bin_size=0.1).update(count)
+
+    # A very wide random walk is equivalent to independent bins
+    p1 = nap.OnlineDecoder(tc, bin_size=0.1, transition=1e6).update(count)
+    np.testing.assert_allclose(p1, p0, atol=1e-6)
+
+    # Identity transition accumulates the evidence
+    decoder = nap.OnlineDecoder(tc, bin_size=0.1, transition=np.eye(len(tc)))
+    p2 = decoder.update(count[0:2])
+    np.testing.assert_allclose(
+        p2[1], nap.OnlineDecoder(tc, bin_size=0.2).update(count[0:2].sum(0)), atol=1e-8
+    )
+
+    # Separable 2d random walk
+    features, group, tc2, ep, xy = get_testing_set_2d()
+    decoder = nap.OnlineDecoder(tc2, bin_size=1, xy=xy, transition=0.5)
+    p = decoder.update(group.count(1, ep).values)
+    assert p.shape == (100, 2, 2)
+    np.testing.assert_allclose(p.sum((1, 2)), 1)
+
+
+def test_online_decoder_matches_batch():
+    tc, group, ep = get_testing_set_poisson(n_neurons=100, n_bins=200, duration=2)
+    decoded, proba = nap.decode_1d(tc, group, ep, bin_size=0.02)
+    decoder = nap.OnlineDecoder(tc, bin_size=0.02)
+    # Bin by bin, as in a closed-loop setting
+    for i, c in enumerate(group.count(0.02, ep).values):
+        np.testing.assert_allclose(decoder.update(c), proba.values[i], atol=1e-8)
+        assert decoder.decoded == decoded.values[i]
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        (dict(tuning_curves=np.zeros((2, 2))), "Unknown format for tuning_curves"),
+        (dict(occupancy=np.ones(3)), "Different shapes for occupancy and tuning_curves"),
+        (dict(transition=np.eye(3)), "Different shapes for transition and tuning_curves"),
+        (dict(transition=-1.0), "transition should be strictly positive"),
+    ],
+)
+def test_online_decoder_errors(kwargs, expected):
+    feature, group, tc, ep = get_testing_set_1d()
+    args = dict(tuning_curves=tc, bin_size=1)
+    args.update(kwargs)
+    with pytest.raises(RuntimeError, match=expected):
+        nap.OnlineDecoder(**args)
+
+
+def test_online_decoder_input_errors():
+    feature, group, tc, ep = get_testing_set_1d()
+    decoder = nap.OnlineDecoder(tc, bin_size=1)
+    with pytest.raises(RuntimeError, match="Different shapes for spike_counts"):
+        decoder.update(np.zeros(3))
+    with pytest.raises(RuntimeError, match="Different lengths"):
+        decoder.push([1, 2], [0])
+    with pytest.raises(RuntimeError, match="Unknown neurons"):
+        decoder.push([1, 2], [0, 5])
+    features, group, tc, ep, xy = get_testing_set_2d()
+    with pytest.raises(RuntimeError, match="xy should be provided"):
+        nap.OnlineDecoder(tc, bin_size=1)
+
+
+def get_testing_set_cv():
+    rng = np.random.default_rng(0)
+    t = np.arange(0, 100, 0.01)
+    x = (np.sin(t / 3) + 1) / 2
+    feature = nap.Tsd(t=t, d=x)
+    group = nap.TsGroup(
+        {
+            i: nap.Ts(t[rng.random(len(t)) < (1 + 30 * np.exp(-((x - c) ** 2) / 0.005)) * 0.01])
+            for i, c in enumerate(np.linspace(0, 1, 10))
+        }
+    )
+    return feature, group
+
+
+@pytest.mark.parametrize(
+    "folds",
+    [
+        5,
+        nap.IntervalSet(start=[0, 30.005, 60.005], end=[20.005, 50.005, 90.005]),
+        [
+            nap.IntervalSet(start=[0, 50.005], end=[10.005, 60.005]),
+            nap.IntervalSet(start=20.005, end=40.005),
+        ],
+    ],
+)
+def test_decode_cv(folds):
+    feature, group = get_testing_set_cv()
+    decoded, proba, errors = nap.decode_cv(
+        group, feature, 20, 0.2, folds=folds, minmax=(0, 1), n_jobs=2
+    )
+    assert isinstance(decoded, nap.Tsd)
+    assert isinstance(proba, nap.TsdFrame)
+    assert isinstance(errors, pd.DataFrame)
+    assert list(errors.columns) == ["n_bins", "mae", "rmse", "median_ae"]
+
+    starts, ends, fold_id, n_folds = nap.process.decoding._get_folds(
+        folds, feature.time_support
+    )
+    assert len(errors) == n_folds
+    assert errors["n_bins"].sum() == len(decoded)
+
+    for f in range(n_folds):
+        test = nap.IntervalSet(start=starts[fold_id == f], end=ends[fold_id == f])
+        train = feature.time_support.set_diff(test)
+        tc = nap.compute_1d_tuning_curves(group, feature.restrict(train), 20, minmax=(0, 1))
+        d, p = nap.decode_1d(tc, group, test, 0.2)
+        np.testing.assert_array_equal(decoded.restrict(test).values, d.values)
+        np.testing.assert_allclose(proba.restrict(test).values, p.values, atol=1e-10)
+        true = feature.bin_average(0.2, test).values
+        np.testing.assert_allclose(errors["mae"][f], np.mean(np.abs(d.values - true)))
+
+
+def test_decode_cv_occupancy():
+    feature, group = get_testing_set_cv()
+    ep = nap.IntervalSet(start=0, end=50)
+    decoded, proba, errors = nap.decode_cv(
+        group, feature, 20, 0.2, folds=2, ep=ep, minmax=(0, 1), use_occupancy=True
+    )
+    test = nap.IntervalSet(start=0, end=25)
+    train = nap.IntervalSet(start=25, end=50)
+    tc = nap.compute_1d_tuning_curves(group, feature, 20, ep=train, minmax=(0, 1))
+    d, p = nap.decode_1d(tc, group, test, 0.2, feature=feature.restrict(train))
+    np.testing.assert_array_equal(decoded.restrict(test).values, d.values)
+
+
+def test_decode_cv_sampling_rate():
+    # The feature is sampled twice slower in the second half
+    _, group = get_testing_set_cv()
+    t = np.concatenate([np.arange(0, 50, 0.01), np.arange(50, 100, 0.02)])
+    feature = nap.Tsd(t=t, d=(np.sin(t / 3) + 1) / 2)
+    test = nap.IntervalSet(start=0, end=50)
+    train = feature.time_support.set_diff(test)
+    assert feature.restrict(train).rate < 0.7 * feature.rate
+
+    decoded, proba, errors = nap.decode_cv(group, feature, 20, 0.2, folds=[test, train], minmax=(0, 1))
+    tc = nap.compute_1d_tuning_curves(group, feature.restrict(train), 20, minmax=(0, 1))
+    d, p = nap.decode_1d(tc, group, test, 0.2)
+    np.testing.assert_allclose(proba.restrict(test).values, p.values, atol=1e-10)
+
+
+def test_decode_cv_errors():
+    feature, group = get_testing_set_cv()
+    with pytest.raises(RuntimeError, match="folds should be at least 2"):
+        nap.decode_cv(group, feature, 20, 0.2, folds=1)
+    with pytest.raises(RuntimeError, match="folds should be an int"):
+        nap.decode_cv(group, feature, 20, 0.2, folds="a")
+    with pytest.raises(RuntimeError, match="Folds should not overlap"):
+        nap.decode_cv(
+            group,
+            feature,
+            20,
+            0.2,
+            folds=[nap.IntervalSet(0, 20), nap.IntervalSet(10, 30)],
+        )
@@ -0,0 +1,115 @@
+"""Tests of event detection for `pynapple` package."""
+
+import pytest
+import pynapple as nap
+import numpy as np
+from scipy import signal
+
+
+def sample_data(n_channels=None):
+    fs = 1250.0
+    t = np.arange(0, 60, 1 / fs)
+    rng = np.random.default_rng(0)
+    shape = (len(t),) if n_channels is None else (len(t), n_channels)
+    d = rng.standard_normal(shape) * 0.5
+    for c in [5, 12.3, 30, 45.7]:
+        m = (t > c) & (t < c + 0.05)
+        osc = 3 * np.sin(2 * np.pi * 150 * t[m])
+        d[m] += osc if n_channels is None else osc[:, None]
+    ep = nap.IntervalSet([0, 31], [29.9, 60])
+    if n_channels is None:
+        return nap.Tsd(t=t, d=d, time_support=ep)
+    return nap.TsdFrame(t=t, d=d, time_support=ep)
+
+
+@pytest.mark.parametrize("data", [sample_data(), sample_data(3)])
+@pytest.mark.parametrize("chunk_size", [100000, 5000, 777])
+def test_detect_oscillatory_events(data, chunk_size):
+    ev = nap.detect_oscillatory_events(
+        data, (100, 250), thr=4, off_thr=2, smooth_std=4, min_duration=15,
+        max_gap=10, time_units="ms", chunk_size=chunk_size
+    )
+    assert isinstance(ev, nap.IntervalSet)
+    assert ev.metadata_columns == ["peak_time", "peak_amplitude"]
+    assert len(ev) == 3
+    np.testing.assert_allclose(ev.start, [5, 12.3, 45.7], atol=0.01)
+    np.testing.assert_allclose(ev.end, [5.05, 12.35, 45.75], atol=0.01)
+    assert np.all((ev.peak_time >= ev.start) & (ev.peak_time <= ev.end))
+    assert np.all(ev.peak_amplitude > 4)
+
+
+@pytest.mark.parametrize("data", [sample_data(), sample_data(2)])
+def test_detect_oscillatory_events_against_full_pipeline(data):
+    sos = signal.butter(4, (100, 250), btype="bandpass", fs=1250.0, output="sos")
+    env = []
+    for ep in data.time_support:
+        sig = data.restrict(ep).values.reshape(len(data.restrict(ep)), -1)
+        env.append(np.abs(signal.hilbert(signal.sosfiltfilt(sos, sig, axis=0), axis=0)).mean(1))
+    env = np.concatenate(env)
+    env = (env - env.mean()) / env.std()
+
+    tsd = nap.Tsd(t=data.t, d=env, time_support=data.time_support)
+    expected = tsd.threshold(3).time_support
+
+    for chunk_size in [100000, 3000]:
+        ev = nap.detect_oscillatory_events(data, (100, 250), thr=3, chunk_size=chunk_size, overlap=2000)
+        np.testing.assert_allclose(ev.values, expected.values)
+        for i in range(len(ev)):
+            tmp = tsd.restrict(expected[i])
+            np.testing.assert_allclose(ev.peak_time[i], tmp.t[np.argmax(tmp.values)])
+            np.testing.assert_allclose(ev.peak_amplitude[i], np.max(tmp.values), rtol=1e-4)
+
+
+def test_detect_oscillatory_events_merge_within_epoch():
+    fs = 1250.0
+    t = np.arange(0, 20, 1 / fs)
+    d = np.random.default_rng(0).standard_normal(len(t)) * 0.5
+    # Events at the end of the first epoch and at the start of the second epoch
+    for c in [9.85, 10.06]:
+        m = (t > c) & (t < c + 0.08)
+        d[m] += 3 * np.sin(2 * np.pi * 150 * t[m])
+    ep = nap.IntervalSet([0, 10.05], [9.95, 20])
+    data = nap.Tsd(t=t, d=d, time_support=ep)
+    kwargs = dict(thr=4, off_thr=2, smooth_std=4, min_duration=15, time_units="ms")
+    ev = nap.detect_oscillatory_events(data, (100, 250), max_gap=500, **kwargs)
+    assert len(ev) == 2
+    assert ev.end[0] <= 9.95 and ev.start[1] >= 10.05
+
+    # Events within the same epoch are merged
+    data = nap.Tsd(t=t, d=d)
+    ev = nap.detect_oscillatory_events(data, (100, 250), max_gap=500, **kwargs)
+    assert len(ev) == 1
+
+
+def test_detect_oscillatory_events_numpy_integers():
+    data = sample_data()
+    ev = nap.detect_oscillatory_events(data, (100, 250), thr=3, chunk_size=5000, overlap=2000)
+    ev2 = nap.detect_oscillatory_events(
+        data, (100, 250), thr=3, chunk_size=np.int64(5000), overlap=np.int32(2000)
+    )
+    np.testing.assert_array_equal(ev.values, ev2.values)
+
+def test_detect_oscillatory_events_no_zscore():
+    data = sample_data()
+    ev = nap.detect_oscillatory_events(data, (100, 250), thr=100, zscore=False)
+    assert len(ev) == 0
+    ev = nap.detect_oscillatory_events(data, (100, 250), thr=2, off_thr=1, zscore=False, min_duration=0.015)
+    assert len(ev) == 3
+    assert np.all(ev.peak_amplitude > 2)
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        (dict(data=np.arange(10)), "First argument should be of type Tsd or TsdFrame"),
+        (dict(cutoff=100), "bandpass filter require a tuple of two numbers"),
+        (dict(off_thr=5), "off_thr should be lower than thr."),
+        (dict(chunk_size=0), "chunk_size should be a strictly positive integer."),
+        (dict(overlap=-1), "overlap should be a positive integer."),
+    ],
+)
+def test_detect_oscillatory_events_errors(kwargs, expected):
+    args = dict(data=sample_data(), cutoff=(100, 250), thr=3)
+    args.update(kwargs)
+    with pytest.raises(ValueError, match=expected):
+        nap.detect_oscillatory_events(**args)
@@ -299,3 +299,224 @@ def test_get_filter_frequency_response(cutoff, fs, filter_type, mode, order, tb)
 def test_get_filter_frequency_response_error():
     with pytest.raises(ValueError, match="Unrecognized filter mode. Choose either 'butter' or 'sinc'"):
         nap.get_filter_frequency_response(250, 1000, "lowpass", "a", 4, 0.02)
+
+
+def test_filter_design_cache():
+    nap.process.filtering._design_filter.cache_clear()
+    sos = nap.process.filtering._get_butter_coefficients(np.array([10.0, 20.0]), "bandpass", 1000, 4)
+    sos2 = nap.process.filtering._get_butter_coefficients((10, 20), "bandpass", 1000.0, 4)
+    np.testing.assert_array_equal(sos, sos2)
+    assert nap.process.filtering._design_filter.cache_info().hits == 1
+    # Returned coefficients are copies of the cached ones
+    sos[:] = 0
+    sos3 = nap.process.filtering._get_butter_coefficients((10, 20), "bandpass", 1000.0, 4)
+    np.testing.assert_array_equal(sos2, sos3)
+
+
+@pytest.mark.parametrize("mode", ["butter", "sinc"])
+@pytest.mark.parametrize("shape", [(5000,), (5000, 2), (5000, 2, 3)])
+@pytest.mark.parametrize("ep", [nap.IntervalSet(start=[0], end=[1]), nap.IntervalSet(start=[0, 0.5], end=[0.4, 1])])
+def test_apply_filter_bank(mode, shape, ep):
+    t = np.linspace(0, 1, shape[0])
+    y = np.random.normal(size=shape)
+    if len(shape) == 1:
+        tsd = nap.Tsd(t, y, time_support=ep)
+    elif len(shape) == 2:
+        tsd = nap.TsdFrame(t, y, time_support=ep)
+    else:
+        tsd = nap.TsdTensor(t, y, time_support=ep)
+
+    bands = [(10, 50), (100, 200), (300, 600)]
+    out = nap.apply_filter_bank(tsd, bands, mode=mode, transition_bandwidth=0.1)
+    assert isinstance(out, nap.TsdFrame if len(shape) == 1 else nap.TsdTensor)
+    assert out.shape == (len(tsd), len(bands), *shape[1:])
+    np.testing.assert_array_equal(out.t, tsd.t)
+    np.testing.assert_array_almost_equal(out.time_support.values, tsd.time_support.values)
+    for i, band in enumerate(bands):
+        expected = nap.apply_bandpass_filter(tsd, band, mode=mode, transition_bandwidth=0.1)
+        np.testing.assert_allclose(out.values[:, i], expected.values, atol=1e-10)
+
+
+def test_apply_filter_bank_dtype(tmp_path):
+    t = np.arange(0, 1, 1 / 1000)
+    d = np.random.randint(-100, 100, size=(len(t), 2)).astype(np.int16)
+    memmap = np.lib.format.open_memmap(tmp_path / "data.npy", mode="w+", dtype=np.int16, shape=d.shape)
+    memmap[:] = d
+    tsd = nap.TsdFrame(t=t, d=memmap, load_array=False)
+    out = nap.apply_filter_bank(tsd, [(10, 50), (100, 200)])
+    assert out.dtype == np.float32
+    expected = nap.apply_bandpass_filter(nap.TsdFrame(t=t, d=d.astype(np.float64)), (100, 200))
+    np.testing.assert_allclose(out.values[:, 1], expected.values, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(data=np.arange(10)), "First argument should be of type Tsd, TsdFrame or TsdTensor"),
+        (dict(bands=[]), "bands should be a list of tuples."),
+        (dict(bands=[(10, 20), 30]), "bandpass filter require a tuple of two numbers."),
+        (dict(fs="a"), "Invalid value for 'fs'. Parameter 'fs' should be of type float or int"),
+        (dict(order=1.5), "Invalid value for 'order': Parameter 'order' should be of type int"),
+        (dict(transition_bandwidth=1), "'transition_bandwidth' should be of type float"),
+        (dict(mode="a"), "Unrecognized filter mode. Choose either 'butter' or 'sinc'"),
+        (dict(data=sample_data_with_nan()), "The input signal contains NaN values"),
+    ],
+)
+def test_apply_filter_bank_errors(kwargs, msg):
+    args = dict(data=sample_data(), bands=[(10, 20)])
+    args.update(kwargs)
+    with pytest.raises(ValueError, match=msg):
+        nap.apply_filter_bank(**args)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2, 3, None])
+@pytest.mark.parametrize("shape", [(5000,), (5000, 4), (5000, 2, 3)])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_butter_n_jobs(n_jobs, shape, dtype):
+    t = np.linspace(0, 1, shape[0])
+    y = np.random.normal(size=shape).astype(dtype)
+    ep = nap.IntervalSet(start=[0, 0.5], end=[0.4, 1])
+    tsd = nap.Tsd(t, y, time_support=ep) if len(shape) == 1 else (
+        nap.TsdFrame(t, y, time_support=ep) if len(shape) == 2 else nap.TsdTensor(t, y, time_support=ep)
+    )
+    out = nap.apply_bandpass_filter(tsd, (10, 200), n_jobs=n_jobs)
+    assert out.dtype == dtype
+    expected = compare_scipy(tsd.astype(np.float64), ep, 4, (10, 200), tsd.rate, "bandpass")
+    rtol, atol = (1e-7, 1e-12) if dtype == np.float64 else (1e-5, 1e-6)
+    np.testing.assert_allclose(out.values, expected, rtol=rtol, atol=atol)
+
+    bank = nap.apply_filter_bank(tsd, [(10, 200), (300, 400)], n_jobs=n_jobs)
+    assert bank.dtype == dtype
+    np.testing.assert_allclose(bank.values[:, 0], out.values, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("cutoff", [(300, 6000), (1, 4), (0.5, 2)])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_butter_float32_precision(cutoff, n_jobs):
+    # Low cutoffs at high sampling rates are unstable with float32 coefficients
+    fs = 30000.0
+    t = np.arange(0, 10, 1 / fs)
+    d = np.random.default_rng(0).standard_normal((len(t), 2)).astype(np.float32)
+    tsd = nap.TsdFrame(t=t, d=d)
+    sos = signal.butter(4, cutoff, btype="bandpass", fs=fs, output="sos")
+    expected = signal.sosfiltfilt(sos, d.astype(np.float64), axis=0)
+
+    out = nap.apply_bandpass_filter(tsd, cutoff, fs=fs, n_jobs=n_jobs)
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out.values, expected, atol=1e-6 * np.abs(expected).max())
+
+    bank = nap.apply_filter_bank(tsd, [cutoff], fs=fs, n_jobs=n_jobs)
+    assert bank.dtype == np.float32
+    np.testing.assert_allclose(bank.values[:, 0], expected, atol=1e-6 * np.abs(expected).max())
+
+
+def test_butter_n_jobs_hdf5(tmp_path):
+    h5py = pytest.importorskip("h5py")
+    t = np.arange(0, 1, 1 / 1000)
+    d = np.random.randn(len(t), 3).astype(np.float32)
+    with h5py.File(tmp_path / "data.h5", "w") as f:
+        f.create_dataset("data", data=d)
+    with h5py.File(tmp_path / "data.h5", "r") as f:
+        tsd = nap.TsdFrame(t=t, d=f["data"], load_array=False)
+        out = nap.apply_highpass_filter(tsd, 100.0, n_jobs=2)
+    expected = nap.apply_highpass_filter(nap.TsdFrame(t=t, d=d), 100.0)
+    np.testing.assert_array_equal(out.values, expected.values)
+
+
+@pytest.mark.parametrize("n_jobs", [0, -1, 1.5, "a"])
+def test_n_jobs_error(n_jobs):
+    msg = "Invalid value for 'n_jobs': Parameter 'n_jobs' should be a strictly positive int or None"
+    with pytest.raises(ValueError, match=msg):
+        nap.apply_lowpass_filter(sample_data(), 10, n_jobs=n_jobs)
+    with pytest.raises(ValueError, match=msg):
+        nap.apply_filter_bank(sample_data(), [(10, 20)], n_jobs=n_jobs)
+
+
+@pytest.mark.parametrize(
+    "cutoff, filter_type",
+    [((100, 250), "bandpass"), ((6, 10), "bandpass"), ((45, 55), "bandstop"), (20.0, "lowpass"), (300.0, "highpass")],
+)
+@pytest.mark.parametrize("shape", [(20000,), (20000, 3)])
+@pytest.mark.parametrize("chunk_size", [7, 777, 5000, 30000])
+def test_streaming_filter(cutoff, filter_type, shape, chunk_size):
+    fs = 1250.0
+    x = np.random.randn(*shape)
+    sos = signal.butter(4, cutoff, btype=filter_type, fs=fs, output="sos")
+
+    filt = nap.StreamingFilter(cutoff, fs, filter_type)
+    assert filt.delay == 0
+    out = np.concatenate([filt.process(x[i : i + chunk_size]) for i in range(0, len(x), chunk_size)])
+    assert filt.flush() is None
+    zi = signal.sosfilt_zi(sos).reshape(sos.shape[0], 2, *[1] * (len(shape) - 1)) * x[0]
+    np.testing.assert_allclose(out, signal.sosfilt(sos, x, axis=0, zi=zi)[0], atol=1e-10)
+
+    filt = nap.StreamingFilter(cutoff, fs, filter_type, zero_phase=True)
+    outs = [filt.process(x[i : i + chunk_size]) for i in range(0, len(x), chunk_size)]
+    np.testing.assert_array_equal(
+        np.cumsum([len(o) for o in outs]),
+        np.maximum(np.minimum(np.arange(1, len(outs) + 1) * chunk_size, len(x)) - filt.delay, 0),
+    )
+    out = np.concatenate(outs + [filt.flush()])
+    np.testing.assert_allclose(out, signal.sosfiltfilt(sos, x, axis=0), atol=1e-4)
+
+
+def test_streaming_filter_tsd():
+    fs = 1000.0
+    t = np.arange(0, 10, 1 / fs)
+    tsd = nap.TsdFrame(t=t, d=np.random.randn(len(t), 2), columns=["a", "b"])
+    filt = nap.StreamingFilter((10, 50), fs, "bandpass", zero_phase=True, overlap=1000)
+    assert filt.delay == 1000
+    assert nap.StreamingFilter((10, 50), fs, "bandpass", zero_phase=True, overlap=np.int64(1000)).delay == 1000
+    outs = [filt.process(tsd[i : i + 1000]) for i in range(0, len(t), 1000)] + [filt.flush()]
+    for out in outs:
+        assert isinstance(out, nap.TsdFrame)
+        np.testing.assert_array_equal(out.columns, ["a", "b"])
+    np.testing.assert_array_equal(np.concatenate([o.t for o in outs]), tsd.t)
+    expected = nap.apply_bandpass_filter(tsd, (10, 50), fs=fs)
+    np.testing.assert_allclose(np.concatenate([o.values for o in outs]), expected.values, atol=1e-4)
+
+    # A new stream after flush
+    out = filt.process(tsd[0:1500])
+    np.testing.assert_array_equal(out.t, tsd.t[0:500])
+
+    filt = nap.StreamingFilter(100.0, fs, "lowpass")
+    out = filt.process(tsd.astype(np.float32))
+    assert out.dtype == np.float32
+    np.testing.assert_array_equal(out.t, tsd.t)
+
+
+@pytest.mark.parametrize("zero_phase", [False, True])
+def test_streaming_filter_float32_precision(zero_phase):
+    # Low band at a high sampling rate: float32 coefficients would be unstable
+    fs = 30000.0
+    x = np.random.randn(60000)
+    outs = {}
+    for dtype in [np.float64, np.float32]:
+        filt = nap.StreamingFilter((1, 4), fs, "bandpass", zero_phase=zero_phase, overlap=60000)
+        out = [filt.process(x[i : i + 15000].astype(dtype)) for i in range(0, len(x), 15000)]
+        outs[dtype] = np.concatenate(out + ([filt.flush()] if zero_phase else []))
+    assert outs[np.float32].dtype == np.float32
+    sos = signal.butter(4, (1, 4), btype="bandpass", fs=fs, output="sos")
+    if zero_phase:
+        expected = signal.sosfiltfilt(sos, x)
+    else:
+        expected = signal.sosfilt(sos, x, zi=signal.sosfilt_zi(sos) * x[0])[0]
+    np.testing.assert_allclose(outs[np.float64], expected, atol=1e-10)
+    np.testing.assert_allclose(outs[np.float32], expected, atol=1e-5 * np.abs(expected).max())
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(cutoff=10), "bandpass filter require a tuple of two numbers"),
+        (dict(fs=None), "Invalid value for 'fs'. Parameter 'fs' should be of type float or int"),
+        (dict(fs="a"), "Invalid value for 'fs'. Parameter 'fs' should be of type float or int"),
+        (dict(order=1.5), "Invalid value for 'order': Parameter 'order' should be of type int"),
+        (dict(overlap=-1), "overlap should be a positive integer."),
+    ],
+)
+def test_streaming_filter_errors(kwargs, msg):
+    args = dict(cutoff=(10, 20), fs=1000.0, filter_type="bandpass")
+    args.update(kwargs)
+    with pytest.raises(ValueError, match=msg):
+        nap.StreamingFilter(**args)
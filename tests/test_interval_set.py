@@ -575,8 +575,151 @@ def test_split_errors():
     with pytest.raises(IOError) as e:
         ep.split(1, time_units=1)
     assert str(e.value) == "Argument time_units should be of type str"
-    
 
 
+def test_metadata():
+    ep = nap.IntervalSet(
+        start=[0, 10, 20, 30],
+        end=[5, 15, 25, 35],
+        metadata={"trial": [0, 1, 2, 3], "stim": ["a", "b", "a", "c"]},
+    )
+    assert ep.metadata_columns == ["trial", "stim"]
+    assert isinstance(ep.trial, np.ndarray)
+    np.testing.assert_array_equal(ep.trial, [0, 1, 2, 3])
+    np.testing.assert_array_equal(ep["stim"], ["a", "b", "a", "c"])
+    np.testing.assert_array_equal(ep.get_info("stim"), ["a", "b", "a", "c"])
+    assert isinstance(ep.__repr__(), str)
+
+    ep.set_info(speed=pd.Series(index=np.arange(4), data=[1.0, 2.0, 3.0, 4.0]))
+    np.testing.assert_array_equal(ep.speed, [1.0, 2.0, 3.0, 4.0])
+
+    with pytest.raises(RuntimeError, match="Array is not the same length."):
+        ep.set_info(bad=[0, 1])
+    with pytest.raises(ValueError, match="Invalid metadata name"):
+        ep.set_info(start=[0, 1, 2, 3])
+    with pytest.raises(TypeError, match="Cannot set the following metadata"):
+        ep.set_info(bad=1)
+    with pytest.raises(AttributeError):
+        ep.bad
+
+def test_metadata_from_dataframe():
+    df = pd.DataFrame({"start": [0.0, 10.0], "end": [5.0, 15.0], "trial": [3, 4]})
+    ep = nap.IntervalSet(df)
+    np.testing.assert_array_equal(ep.trial, [3, 4])
+    pd.testing.assert_frame_equal(ep.as_dataframe(), df)
+
+    ep2 = nap.IntervalSet(ep)
+    np.testing.assert_array_equal(ep2.trial, [3, 4])
+
+def test_metadata_sorting_and_dropping():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ep = nap.IntervalSet(start=[10, 0], end=[15, 5], metadata={"a": [1, 0]})
+    np.testing.assert_array_equal(ep.a, [0, 1])
+
+    with pytest.warns(UserWarning, match="Dropping the metadata"):
+        ep = nap.IntervalSet(start=[0, 0.5], end=[5, 6], metadata={"a": [1, 0]})
+    assert ep.metadata_columns == []
+
+    with pytest.raises(RuntimeError, match="not the same length"):
+        nap.IntervalSet(start=[0, 10], end=[5, 15], metadata={"a": [1]})
+
+def test_metadata_slicing():
+    ep = nap.IntervalSet(
+        start=[0, 10, 20, 30], end=[5, 15, 25, 35], metadata={"trial": [0, 1, 2, 3]}
+    )
+    np.testing.assert_array_equal(ep[1].trial, [1])
+    np.testing.assert_array_equal(ep[-1].trial, [3])
+    np.testing.assert_array_equal(ep[[0, 2]].trial, [0, 2])
+    np.testing.assert_array_equal(ep[1:3].trial, [1, 2])
+    np.testing.assert_array_equal(ep[1:3, :].trial, [1, 2])
+    np.testing.assert_array_equal(ep[ep.trial > 1].trial, [2, 3])
+    np.testing.assert_array_equal(ep.drop_short_intervals(4.5).trial, [0, 1, 2, 3])
+
+def test_metadata_set_operations():
+    ep = nap.IntervalSet(
+        start=[0, 10, 20, 30], end=[5, 15, 25, 35], metadata={"trial": [0, 1, 2, 3]}
+    )
+    ep2 = nap.IntervalSet(start=[3, 12, 21], end=[11, 14, 40])
+
+    ep3 = ep.intersect(ep2)
+    np.testing.assert_array_almost_equal(ep3.start, [3, 10, 12, 21, 30])
+    np.testing.assert_array_equal(ep3.trial, [0, 1, 1, 2, 3])
+
+    ep4 = ep.set_diff(ep2)
+    np.testing.assert_array_almost_equal(ep4.start, [0, 11, 14, 20])
+    np.testing.assert_array_equal(ep4.trial, [0, 1, 1, 2])
+
+    assert ep.union(ep2).metadata_columns == []
+
+    ep5 = ep.split(2.0)
+    np.testing.assert_array_equal(ep5.trial, [0, 0, 1, 1, 2, 2, 3, 3])
+
+def test_metadata_getby():
+    ep = nap.IntervalSet(
+        start=[0, 10, 20, 30],
+        end=[5, 15, 25, 35],
+        metadata={"trial": [0, 1, 2, 3], "stim": ["a", "b", "a", "c"]},
+    )
+    ep2 = ep.getby_threshold("trial", 1)
+    np.testing.assert_array_almost_equal(ep2.start, [20, 30])
+    for op, res in zip(["<", ">=", "<="], [[0], [1, 2, 3], [0, 1]]):
+        np.testing.assert_array_equal(ep.getby_threshold("trial", 1, op).trial, res)
+    with pytest.raises(RuntimeError):
+        ep.getby_threshold("trial", 1, "!")
+
+    sliced, bincenter = ep.getby_intervals("trial", [0, 2, 4])
+    np.testing.assert_array_equal(bincenter, [1, 3])
+    np.testing.assert_array_equal(sliced[0].trial, [0, 1])
+    np.testing.assert_array_equal(sliced[1].trial, [2, 3])
+
+    groups = ep.getby_category("stim")
+    assert list(groups.keys()) == ["a", "b", "c"]
+    np.testing.assert_array_almost_equal(groups["a"].start, [0, 20])
+    np.testing.assert_array_equal(groups["c"].trial, [3])
 
 
+def test_metadata_save_load(tmp_path):
+    ep = nap.IntervalSet(
+        start=[0, 10, 20],
+        end=[5, 15, 25],
+        metadata={"trial": [0, 1, 2], "stim": np.array(["a", "b", "a"], dtype=object)},
+    )
+    ep.save(tmp_path / "ep.npz")
+    with np.load(tmp_path / "ep.npz") as file:
+        np.testing.assert_array_equal(file["trial"], [0, 1, 2])
+        np.testing.assert_array_equal(file["stim"], ["a", "b", "a"])
+
+    ep2 = nap.load_file(tmp_path / "ep.npz")
+    assert isinstance(ep2, nap.IntervalSet)
+    np.testing.assert_array_equal(ep2.values, ep.values)
+    assert sorted(ep2.metadata_columns) == ["stim", "trial"]
+    np.testing.assert_array_equal(ep2.trial, [0, 1, 2])
+    np.testing.assert_array_equal(ep2.stim, ["a", "b", "a"])
+
+    # Column conflicting with the 'type' key
+    ep = nap.IntervalSet(start=[0, 10], end=[5, 15], metadata={"type": [1, 2]})
+    with pytest.warns(UserWarning, match="Metadata column 'type'"):
+        ep.save(tmp_path / "ep_type.npz")
+    assert nap.load_file(tmp_path / "ep_type.npz").metadata_columns == []
+
+
+def test_metadata_as_units():
+    ep = nap.IntervalSet(start=[0, 10], end=[5, 15], metadata={"trial": [0, 1]})
+    df = ep.as_units("ms")
+    assert list(df.columns) == ["start", "end", "trial"]
+    np.testing.assert_array_almost_equal(df[["start", "end"]].values, ep.values * 1e3)
+    np.testing.assert_array_equal(df["trial"].values, [0, 1])
+
+
+def test_metadata_not_in_time_support():
+    ep = nap.IntervalSet(start=[0, 10], end=[5, 15], metadata={"trial": [0, 1]})
+    tsd = nap.Tsd(t=np.arange(20), d=np.arange(20))
+    group = nap.TsGroup({0: nap.Ts(t=np.arange(20))})
+    for obj in [tsd.restrict(ep), nap.Tsd(t=np.arange(20), d=np.arange(20), time_support=ep),
+                group.restrict(ep), nap.TsGroup({0: nap.Ts(t=np.arange(20))}, time_support=ep)]:
+        assert obj.time_support.metadata_columns == []
+        np.testing.assert_array_equal(obj.time_support.values, ep.values)
+        assert "trial" not in repr(obj.time_support)
+    # The IntervalSet itself keeps its metadata
+    assert ep.metadata_columns == ["trial"]
@@ -425,3 +425,39 @@ def test_jitin_interval():
 
         np.testing.assert_array_equal(inep, inep2)
 
+
+def test_jitintersect_return_index():
+    for i in range(10):
+        ep1, ep2 = get_example_isets()
+        s, e, idx1, idx2 = nap.core._jitted_functions.jitintersect(
+            ep1.start, ep1.end, ep2.start, ep2.end, return_index=True
+        )
+        s2, e2 = nap.core._jitted_functions.jitintersect(ep1.start, ep1.end, ep2.start, ep2.end)
+        np.testing.assert_array_equal(s, s2)
+        np.testing.assert_array_equal(e, e2)
+        np.testing.assert_array_equal(idx1, np.searchsorted(ep1.start, s, side="right") - 1)
+        np.testing.assert_array_equal(idx2, np.searchsorted(ep2.start, s, side="right") - 1)
+
+def test_jitunion_return_index():
+    for i in range(10):
+        ep1, ep2 = get_example_isets()
+        s, e, idx1, idx2 = nap.core._jitted_functions.jitunion(
+            ep1.start, ep1.end, ep2.start, ep2.end, return_index=True
+        )
+        assert len(idx1) == len(ep1)
+        assert len(idx2) == len(ep2)
+        np.testing.assert_array_equal(idx1, np.searchsorted(s, ep1.start, side="right") - 1)
+        np.testing.assert_array_equal(idx2, np.searchsorted(s, ep2.start, side="right") - 1)
+        assert np.all(ep1.end <= e[idx1])
+        assert np.all(ep2.end <= e[idx2])
+
+def test_jitdiff_return_index():
+    for i in range(10):
+        ep1, ep2 = get_example_isets()
+        s, e, idx1 = nap.core._jitted_functions.jitdiff(
+            ep1.start, ep1.end, ep2.start, ep2.end, return_index=True
+        )
+        s2, e2 = nap.core._jitted_functions.jitdiff(ep1.start, ep1.end, ep2.start, ep2.end)
+        np.testing.assert_array_equal(s, s2)
+        np.testing.assert_array_equal(e, e2)
+        np.testing.assert_array_equal(idx1, np.searchsorted(ep1.start, s, side="right") - 1)
@@ -319,3 +319,192 @@ def test_compute_mean_power_spectral_density_raise_errors(
         psd = nap.compute_mean_power_spectral_density(
             sig, interval_size, fs, ep, full_range, norm, time_units
         )
+
+
+############################################################
+# Test for welch and multitaper power spectral density
+############################################################
+
+
+def get_noisy_signal(n_channels=None):
+    fs = 1000.0
+    t = np.arange(0, 60, 1 / fs)
+    rng = np.random.default_rng(0)
+    shape = (len(t),) if n_channels is None else (len(t), n_channels)
+    d = rng.standard_normal(shape)
+    d += (np.sin(2 * np.pi * 50 * t) * 2).reshape(-1, *[1] * (len(shape) - 1))
+    if n_channels is None:
+        return nap.Tsd(t=t, d=d), fs
+    return nap.TsdFrame(t=t, d=d, columns=["a", "b", "c"][:n_channels]), fs
+
+
+@pytest.mark.parametrize("n_channels", [None, 3])
+@pytest.mark.parametrize("interval_size, overlap, window", [(1.0, 0.5, "hann"), (0.255, 0.0, "hamming"), (2.0, 0.9, "hann")])
+def test_compute_welch_power_spectral_density(n_channels, interval_size, overlap, window):
+    sig, fs = get_noisy_signal(n_channels)
+    psd = nap.compute_welch_power_spectral_density(sig, interval_size, overlap=overlap, window=window)
+    assert isinstance(psd, pd.DataFrame)
+    N = int(np.round(interval_size * fs))
+    freq, expected = signal.welch(
+        sig.values, fs=sig.rate, window=window, nperseg=N, noverlap=N - int(np.round(N * (1 - overlap))), axis=0
+    )
+    np.testing.assert_allclose(psd.index.values, freq)
+    np.testing.assert_allclose(psd.values, expected.reshape(len(freq), -1), rtol=1e-10)
+    if n_channels is not None:
+        np.testing.assert_array_equal(psd.columns, sig.columns)
+    assert psd.index[np.argmax(psd.values[:, 0])] == pytest.approx(50, abs=1 / interval_size)
+
+
+def test_compute_welch_power_spectral_density_epochs():
+    sig, fs = get_noisy_signal(2)
+    ep = nap.IntervalSet([0, 20.5, 50], [10, 40, 50.5])
+    psd = nap.compute_welch_power_spectral_density(sig, 1.0, fs=fs, ep=ep)
+    # Average over the segments of each epoch, the last epoch being too short
+    psds, counts = [], []
+    for i in range(2):
+        x = sig.restrict(ep[i]).values
+        psds.append(signal.welch(x, fs=fs, nperseg=1000, axis=0)[1])
+        counts.append((len(x) - 1000) // 500 + 1)
+    expected = np.average(psds, axis=0, weights=counts)
+    np.testing.assert_allclose(psd.values, expected, rtol=1e-10)
+
+    psd32 = nap.compute_welch_power_spectral_density(sig, 1.0, fs=fs, ep=ep, dtype=np.float32)
+    assert psd32.values.dtype == np.float32
+    np.testing.assert_allclose(psd32.values, expected, rtol=1e-4)
+
+
+def test_compute_welch_power_spectral_density_batches(monkeypatch):
+    sig, fs = get_noisy_signal(3)
+    expected = nap.compute_welch_power_spectral_density(sig, 0.5)
+    monkeypatch.setattr(nap.process.spectrum, "_SPECTRUM_MEMORY", 1)
+    psd = nap.compute_welch_power_spectral_density(sig, 0.5)
+    np.testing.assert_allclose(psd.values, expected.values, rtol=1e-10)
+
+
+@pytest.mark.parametrize("n_channels", [None, 2])
+@pytest.mark.parametrize("time_bandwidth, n_tapers", [(4.0, None), (2.5, 2)])
+def test_compute_multitaper_power_spectral_density(n_channels, time_bandwidth, n_tapers):
+    sig, fs = get_noisy_signal(n_channels)
+    psd = nap.compute_multitaper_power_spectral_density(
+        sig, 2.0, time_bandwidth=time_bandwidth, n_tapers=n_tapers, overlap=0.5, fs=fs
+    )
+    N = 2000
+    tapers = signal.windows.dpss(N, time_bandwidth, Kmax=n_tapers or int(2 * time_bandwidth) - 1)
+    x = sig.values.reshape(len(sig), -1)
+    segments = np.array([x[i : i + N] for i in range(0, len(x) - N + 1, N // 2)])
+    segments = segments - segments.mean(1, keepdims=True)
+    X = np.fft.rfft(segments[:, None] * tapers[None, :, :, None], axis=2)
+    expected = np.mean(np.abs(X) ** 2, axis=(0, 1)) / fs
+    expected[1:-1] *= 2
+    np.testing.assert_allclose(psd.index.values, np.fft.rfftfreq(N, 1 / fs))
+    np.testing.assert_allclose(psd.values, expected, rtol=1e-10)
+    # White noise of unit variance
+    np.testing.assert_allclose(psd.values[psd.index > 100].mean(), 2 / fs, rtol=0.05)
+
+
+@pytest.mark.parametrize(
+    "func, kwargs, expectation",
+    [
+        ("welch", dict(sig=np.arange(10)), pytest.raises(TypeError, match="sig must be either a Tsd or a TsdFrame object.")),
+        ("welch", dict(ep=[0, 1]), pytest.raises(TypeError, match="ep param must be a pynapple IntervalSet object, or None")),
+        ("welch", dict(fs="a"), pytest.raises(TypeError, match="fs must be of type float or int")),
+        ("welch", dict(overlap=1), pytest.raises(ValueError, match=re.escape("overlap must be a number between 0 (included) and 1."))),
+        ("welch", dict(dtype=np.int64), pytest.raises(ValueError, match="dtype must be float32 or float64.")),
+        ("welch", dict(interval_size=200), pytest.raises(RuntimeError, match="No epoch is longer than interval_size=200")),
+        ("welch", dict(interval_size=1e-4), pytest.raises(RuntimeError, match="is shorter than two samples")),
+        ("multitaper", dict(time_bandwidth=0), pytest.raises(ValueError, match="time_bandwidth must be a strictly positive number.")),
+        ("multitaper", dict(n_tapers=0), pytest.raises(ValueError, match="n_tapers must be a strictly positive integer.")),
+    ],
+)
+def test_compute_segment_power_spectral_density_raise_errors(func, kwargs, expectation):
+    sig, fs = get_noisy_signal()
+    args = dict(sig=sig, interval_size=1.0)
+    args.update(kwargs)
+    with expectation:
+        getattr(nap, f"compute_{func}_power_spectral_density")(**args)
+
+
+############################################################
+# Test for spectrogram
+############################################################
+
+
+@pytest.mark.parametrize("n_channels", [None, 3])
+@pytest.mark.parametrize("window, step", [(0.5, 0.1), (0.255, None), (1.0, 1.0)])
+def test_compute_spectrogram(n_channels, window, step):
+    sig, fs = get_noisy_signal(n_channels)
+    sxx = nap.compute_spectrogram(sig, window, step, fs=fs, dtype=np.float64)
+    N = int(np.round(window * fs))
+    step_n = int(np.round((window / 2 if step is None else step) * fs))
+    freq, t, expected = signal.spectrogram(
+        sig.values, fs=fs, window="hann", nperseg=N, noverlap=N - step_n, axis=0
+    )
+    if n_channels is None:
+        assert isinstance(sxx, nap.TsdFrame)
+        np.testing.assert_allclose(sxx.columns.values, freq)
+        np.testing.assert_allclose(sxx.values, expected.T, rtol=1e-10)
+    else:
+        assert isinstance(sxx, nap.TsdTensor)
+        assert sxx.shape == (len(t), len(freq), n_channels)
+        np.testing.assert_allclose(sxx.values, expected.transpose(2, 0, 1), rtol=1e-10)
+    np.testing.assert_allclose(sxx.t, t)
+    np.testing.assert_array_almost_equal(sxx.time_support.values, sig.time_support.values)
+
+
+def test_compute_spectrogram_epochs(monkeypatch):
+    sig, fs = get_noisy_signal(2)
+    ep = nap.IntervalSet([0, 20.5, 50], [10, 40, 50.2])
+    sxx = nap.compute_spectrogram(sig, 0.5, 0.25, ep=ep, fs=fs, time_unit="s")
+    assert sxx.dtype == np.float32
+    np.testing.assert_array_almost_equal(sxx.time_support.values, ep.values)
+    for i in range(2):
+        x = sig.restrict(ep[i])
+        freq, t, expected = signal.spectrogram(x.values, fs=fs, window="hann", nperseg=500, noverlap=250, axis=0)
+        np.testing.assert_allclose(sxx.restrict(ep[i]).t, x.t[0] + t)
+        np.testing.assert_allclose(sxx.restrict(ep[i]).values, expected.transpose(2, 0, 1), rtol=1e-4, atol=1e-8)
+    # Windows in the middle of the gap between epochs
+    assert len(sxx.restrict(nap.IntervalSet(10, 20.5))) == 0
+
+    monkeypatch.setattr(nap.process.spectrum, "_SPECTRUM_MEMORY", 1)
+    sxx2 = nap.compute_spectrogram(sig, 500, 250, ep=ep, fs=fs, time_unit="ms")
+    np.testing.assert_array_equal(sxx2.t, sxx.t)
+    np.testing.assert_allclose(sxx2.values, sxx.values)
+
+
+def test_compute_spectrogram_peak():
+    fs = 1000.0
+    t = np.arange(0, 10, 1 / fs)
+    d = np.where(t < 5, np.sin(2 * np.pi * 20 * t), np.sin(2 * np.pi * 80 * t))
+    sxx = nap.compute_spectrogram(nap.Tsd(t=t, d=d), 0.5, fs=fs)
+    peak = sxx.columns.values[np.argmax(sxx.values, 1)]
+    np.testing.assert_array_equal(peak[sxx.t < 4.5], 20)
+    np.testing.assert_array_equal(peak[sxx.t > 5.5], 80)
+
+
+@pytest.mark.parametrize("window, time_unit", [(1.0, "s"), (1000, "ms"), (1e6, "us")])
+def test_compute_spectrogram_default_step(window, time_unit):
+    fs = 1000.0
+    t = np.arange(0, 10, 1 / fs)
+    sxx = nap.compute_spectrogram(nap.Tsd(t=t, d=np.random.randn(len(t))), window, fs=fs, time_unit=time_unit)
+    assert len(sxx) == 19
+    np.testing.assert_allclose(np.diff(sxx.t), 0.5)
+
+
+@pytest.mark.parametrize(
+    "kwargs, expectation",
+    [
+        (dict(sig=np.arange(10)), pytest.raises(TypeError, match="sig must be either a Tsd or a TsdFrame object.")),
+        (dict(ep=[0, 1]), pytest.raises(TypeError, match="ep param must be a pynapple IntervalSet object, or None")),
+        (dict(fs="a"), pytest.raises(TypeError, match="fs must be of type float or int")),
+        (dict(step=0), pytest.raises(ValueError, match="step must be a strictly positive number.")),
+        (dict(dtype=np.complex64), pytest.raises(ValueError, match="dtype must be float32 or float64.")),
+        (dict(window=200), pytest.raises(RuntimeError, match="No epoch is longer than window=200")),
+        (dict(window=1e-4), pytest.raises(RuntimeError, match="window=0.0001 is shorter than two samples")),
+    ],
+)
+def test_compute_spectrogram_raise_errors(kwargs, expectation):
+    sig, fs = get_noisy_signal()
+    args = dict(sig=sig, window=1.0)
+    args.update(kwargs)
+    with expectation:
+        nap.compute_spectrogram(**args)
@@ -3,8 +3,11 @@
 import re
 from contextlib import nullcontext as does_not_raise
 
+import h5py
 import numpy as np
 import pytest
+from scipy import signal
+from scipy.fft import next_fast_len
 
 import pynapple as nap
 
@@ -371,6 +374,36 @@ def test_compute_wavelet_transform(
     )
 
 
+@pytest.mark.parametrize("chunk_size, batch_size", [(None, None), (300, 3), (1, 1)])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_compute_wavelet_transform_multichannel(chunk_size, batch_size, dtype):
+    t = np.arange(0, 2, 1 / 1000)
+    d = np.stack(
+        [np.sin(2 * np.pi * 10 * t), np.sin(2 * np.pi * 50 * t), np.zeros_like(t)], 1
+    ).astype(dtype)
+    sig = nap.TsdFrame(t=t, d=d, time_support=nap.IntervalSet([0, 1.2], [1, 2]))
+    freqs = np.array([10.0, 50.0, 80.0])
+    wavelets = nap.generate_morlet_filterbank(freqs, 1000)
+
+    mwt = nap.compute_wavelet_transform(
+        sig, freqs, fs=1000, norm=None, chunk_size=chunk_size, batch_size=batch_size
+    )
+    assert isinstance(mwt, nap.TsdTensor)
+    assert mwt.shape == (len(sig), 3, 3)
+    assert mwt.dtype == (np.complex64 if dtype == np.float32 else np.complex128)
+
+    for ep in sig.time_support:
+        output = get_output_2d(sig.restrict(ep).values.astype(np.float64), wavelets.values)
+        np.testing.assert_allclose(
+            mwt.restrict(ep).values,
+            output,
+            atol=1e-4 if dtype == np.float32 else 1e-10,
+        )
+    # Each channel peaks at its own frequency
+    power = np.abs(mwt.restrict(nap.IntervalSet(0.3, 0.7)).values).mean(0)
+    np.testing.assert_array_equal(np.argmax(power[:, 0:2], 0), [0, 1])
+
+
 @pytest.mark.parametrize(
     "sig, freqs, fs, gaussian_width, window_length, precision, norm, expectation",
     [
@@ -538,3 +571,195 @@ def test_compute_wavelet_transform_raise_errors(
         _ = nap.compute_wavelet_transform(
             sig, freqs, fs, gaussian_width, window_length, precision, norm
         )
+
+
+@pytest.mark.parametrize("output", ["power", "amplitude", "phase"])
+def test_compute_wavelet_transform_output(output):
+    sig = get_2d_signal()
+    freqs = np.linspace(10, 100, 10)
+    mwt = nap.compute_wavelet_transform(sig, freqs, fs=1000)
+    res = nap.compute_wavelet_transform(sig, freqs, fs=1000, output=output)
+    assert res.dtype == np.float32
+    expected = {"power": np.abs(mwt.values) ** 2, "amplitude": np.abs(mwt.values)}
+    if output == "phase":
+        np.testing.assert_allclose(
+            np.exp(1j * res.values), np.exp(1j * np.angle(mwt.values)), atol=1e-4
+        )
+    else:
+        np.testing.assert_allclose(res.values, expected[output], rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 7])
+def test_compute_wavelet_transform_output_rate(chunk_size):
+    t = np.arange(0, 2, 1 / 1000)
+    sig = nap.Tsd(
+        t=t,
+        d=np.sin(2 * np.pi * 20 * t),
+        time_support=nap.IntervalSet([0, 1.2], [1, 2]),
+    )
+    freqs = np.array([10.0, 20.0])
+    mwt = nap.compute_wavelet_transform(sig, freqs, fs=1000)
+    res = nap.compute_wavelet_transform(
+        sig, freqs, fs=1000, output_rate=100, chunk_size=chunk_size
+    )
+    assert isinstance(res, nap.TsdFrame)
+    np.testing.assert_array_almost_equal(res.time_support.values, sig.time_support.values)
+    for ep in sig.time_support:
+        expected = mwt.restrict(ep)[::10]
+        np.testing.assert_array_equal(res.restrict(ep).t, expected.t)
+        np.testing.assert_allclose(res.restrict(ep).values, expected.values)
+
+
+def test_compute_wavelet_transform_out(tmp_path):
+    sig = nap.TsdFrame(
+        t=np.arange(0, 2, 1 / 1000),
+        d=np.random.randn(2000, 3).astype(np.float32),
+        time_support=nap.IntervalSet([0, 1.2], [1, 2]),
+    )
+    freqs = np.linspace(10, 100, 5)
+    expected = nap.compute_wavelet_transform(
+        sig, freqs, fs=1000, output="power", output_rate=200
+    )
+
+    out = np.lib.format.open_memmap(
+        tmp_path / "cwt.npy", mode="w+", dtype=np.float32, shape=expected.shape
+    )
+    res = nap.compute_wavelet_transform(
+        sig, freqs, fs=1000, output="power", output_rate=200, out=out, chunk_size=100
+    )
+    assert res.values is out
+    np.testing.assert_allclose(
+        np.load(tmp_path / "cwt.npy"), expected.values, rtol=1e-4, atol=1e-6
+    )
+    np.testing.assert_array_equal(res.t, expected.t)
+    np.testing.assert_array_almost_equal(
+        res.time_support.values, expected.time_support.values
+    )
+
+    with h5py.File(tmp_path / "cwt.h5", "w") as f:
+        out = f.create_dataset("cwt", shape=expected.shape, dtype=np.float32)
+        res = nap.compute_wavelet_transform(
+            sig, freqs, fs=1000, output="power", output_rate=200, out=out
+        )
+        assert isinstance(res.values, h5py.Dataset)
+        np.testing.assert_allclose(out[:], expected.values, rtol=1e-4, atol=1e-6)
+
+    with pytest.raises(ValueError, match=re.escape("out should be of shape")):
+        nap.compute_wavelet_transform(sig, freqs, fs=1000, out=np.zeros((10, 5, 3)))
+
+
+@pytest.mark.parametrize(
+    "kwargs, msg",
+    [
+        (dict(output="a"), "output parameter must be 'complex', 'power', 'amplitude' or 'phase'."),
+        (dict(output_rate=0), "output_rate must be a strictly positive number."),
+    ],
+)
+def test_compute_wavelet_transform_raise_errors_output(kwargs, msg):
+    with pytest.raises(ValueError, match=re.escape(msg)):
+        nap.compute_wavelet_transform(get_1d_signal(), np.array([10.0]), **kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [dict(chunk_size=0), dict(batch_size=1.5)])
+def test_compute_wavelet_transform_raise_errors_chunks(kwargs):
+    name = list(kwargs.keys())[0]
+    with pytest.raises(
+        ValueError, match=f"{name} must be a strictly positive integer or None."
+    ):
+        nap.compute_wavelet_transform(get_1d_signal(), np.array([10.0]), **kwargs)
+
+
+def get_theta_signal(n_channels=None):
+    fs = 1250.0
+    t = np.arange(0, 40, 1 / fs)
+    rng = np.random.default_rng(0)
+    shape = (len(t),) if n_channels is None else (len(t), n_channels)
+    sos = signal.butter(4, (6, 10), btype="bandpass", fs=fs, output="sos")
+    d = signal.sosfiltfilt(sos, rng.standard_normal(shape), axis=0)
+    ep = nap.IntervalSet([0, 15.3], [15, 40])
+    if n_channels is None:
+        return nap.Tsd(t=t, d=d, time_support=ep)
+    return nap.TsdFrame(t=t, d=d, time_support=ep, columns=list("abcd")[:n_channels])
+
+
+@pytest.mark.parametrize("n_channels", [None, 1, 4])
+@pytest.mark.parametrize("ep", [None, nap.IntervalSet([1, 20], [10, 30.5])])
+def test_compute_hilbert(n_channels, ep):
+    sig = get_theta_signal(n_channels)
+    amplitude, phase = nap.compute_hilbert(sig, ep=ep, dtype=np.float64)
+    ep = sig.time_support if ep is None else ep
+    for res in [amplitude, phase]:
+        assert isinstance(res, sig.__class__)
+        assert res.dtype == np.float64
+        np.testing.assert_array_almost_equal(res.time_support.values, ep.values)
+        np.testing.assert_array_equal(res.t, sig.restrict(ep).t)
+        if n_channels is not None:
+            np.testing.assert_array_equal(res.columns, sig.columns)
+
+    for e in ep:
+        x = sig.restrict(e).values
+        z = signal.hilbert(x, N=next_fast_len(len(x), True), axis=0)[0 : len(x)]
+        np.testing.assert_allclose(amplitude.restrict(e).values, np.abs(z), atol=1e-12)
+        np.testing.assert_allclose(phase.restrict(e).values, np.angle(z), atol=1e-10)
+
+
+def test_compute_hilbert_float32(monkeypatch):
+    sig = get_theta_signal(4)
+    expected = nap.compute_hilbert(sig, dtype=np.float64)
+    monkeypatch.setattr(nap.process.hilbert, "_HILBERT_MEMORY", 1)
+    amplitude, phase = nap.compute_hilbert(sig)
+    assert amplitude.dtype == np.float32 and phase.dtype == np.float32
+    np.testing.assert_allclose(amplitude.values, expected[0].values, atol=1e-5)
+    np.testing.assert_allclose(
+        np.exp(1j * phase.values), np.exp(1j * expected[1].values), atol=1e-3
+    )
+
+
+def test_compute_hilbert_chunked(tmp_path):
+    sig = get_theta_signal(4)
+    expected_amplitude, expected_phase = nap.compute_hilbert(sig, dtype=np.float64)
+
+    with h5py.File(tmp_path / "lfp.h5", "w") as f:
+        f.create_dataset("lfp", data=sig.values)
+    with h5py.File(tmp_path / "lfp.h5", "r") as f:
+        lazy = nap.TsdFrame(
+            t=sig.t, d=f["lfp"], time_support=sig.time_support, load_array=False
+        )
+        amplitude, phase = nap.compute_hilbert(
+            lazy, chunk_size=5000, overlap=2500, dtype=np.float64
+        )
+
+    np.testing.assert_array_equal(amplitude.t, expected_amplitude.t)
+    # Approximation away from the edges of the epochs
+    inner = sig.time_support.set_diff(
+        nap.IntervalSet([0, 14, 15.3, 39], [1, 15, 16.3, 40])
+    )
+    scale = np.abs(expected_amplitude.values).max()
+    np.testing.assert_allclose(
+        amplitude.restrict(inner).values,
+        expected_amplitude.restrict(inner).values,
+        atol=0.02 * scale,
+    )
+    strong = expected_amplitude.restrict(inner).values > 0.2 * scale
+    np.testing.assert_allclose(
+        np.exp(1j * phase.restrict(inner).values)[strong],
+        np.exp(1j * expected_phase.restrict(inner).values)[strong],
+        atol=0.1,
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs, expectation",
+    [
+        (dict(sig=np.arange(10)), pytest.raises(TypeError, match="sig must be either a Tsd or a TsdFrame object.")),
+        (dict(ep=[0, 1]), pytest.raises(TypeError, match="ep param must be a pynapple IntervalSet object, or None")),
+        (dict(chunk_size=0), pytest.raises(ValueError, match="chunk_size should be a strictly positive integer or None.")),
+        (dict(chunk_size=10, overlap=-1), pytest.raises(ValueError, match="overlap should be a positive integer.")),
+        (dict(dtype=np.int32), pytest.raises(ValueError, match="dtype must be float32 or float64.")),
+    ],
+)
+def test_compute_hilbert_raise_errors(kwargs, expectation):
+    args = dict(sig=get_theta_signal())
+    args.update(kwargs)
+    with expectation:
+        nap.compute_hilbert(**args)
@@ -1698,3 +1698,205 @@ def test_get_slice_public(start, end, expected_slice, expected_array, ts):
     out_array = ts.t[out_slice]
     assert out_slice == expected_slice
     assert np.all(out_array == expected_array)
+
+
+@pytest.mark.parametrize(
+    "tsd",
+    [
+        nap.Tsd(t=np.arange(100), d=np.random.rand(100)),
+        nap.TsdFrame(t=np.arange(100), d=np.random.rand(100, 3), columns=["a", "b", "c"]),
+        nap.TsdTensor(t=np.arange(100), d=np.random.rand(100, 3, 2)),
+    ],
+)
+def test_reduce_by_interval(tsd):
+    ep = nap.IntervalSet(start=[0, 20.5, 50, 200], end=[10, 30, 50.5, 300])
+    ops = ["mean", "sum", "std", "var", "min", "max", "argmin", "argmax", 25, 90]
+    out = tsd.reduce_by_interval(ep, ops)
+
+    assert list(out.keys()) == ops
+    for op in ops:
+        assert isinstance(out[op], tsd.__class__)
+        assert out[op].shape == (len(ep), *tsd.shape[1:])
+        np.testing.assert_array_almost_equal(out[op].t, ep.start + (ep.end - ep.start) / 2)
+        np.testing.assert_array_equal(out[op].time_support.values, ep.values)
+    if hasattr(tsd, "columns"):
+        pd.testing.assert_index_equal(out["mean"].columns, tsd.columns)
+
+    funcs = {
+        "mean": np.mean, "sum": np.sum, "std": np.std, "var": np.var,
+        "min": np.min, "max": np.max,
+        25: lambda x, axis: np.percentile(x, 25, axis=axis),
+        90: lambda x, axis: np.percentile(x, 90, axis=axis),
+    }
+    for i in range(3):
+        sub = tsd.restrict(ep[i])
+        for op, func in funcs.items():
+            np.testing.assert_array_almost_equal(out[op].values[i], func(sub.values, axis=0))
+        np.testing.assert_array_equal(out["argmin"].values[i], sub.t[np.argmin(sub.values, 0)])
+        np.testing.assert_array_equal(out["argmax"].values[i], sub.t[np.argmax(sub.values, 0)])
+
+    # Empty interval
+    assert np.all(out["sum"].values[-1] == 0)
+    for op in ops:
+        if op != "sum":
+            assert np.all(np.isnan(out[op].values[-1]))
+
+    # Single operation
+    single = tsd.reduce_by_interval(ep, "max")
+    assert isinstance(single, tsd.__class__)
+    np.testing.assert_array_equal(single.values, out["max"].values)
+    np.testing.assert_array_equal(
+        tsd.reduce_by_interval(ep).values, out["mean"].values
+    )
+
+
+@pytest.mark.parametrize("position", [0, 5, 9])
+def test_reduce_by_interval_nan(position):
+    d = np.random.rand(20, 2)
+    d[position, 0] = np.nan
+    d[12, 1] = np.nan
+    tsd = nap.TsdFrame(t=np.arange(20), d=d)
+    ep = nap.IntervalSet(start=[0, 10], end=[9, 19])
+    ops = ["mean", "sum", "std", "var", "min", "max", "argmin", "argmax", 50]
+    out = tsd.reduce_by_interval(ep, ops)
+    for op in ["mean", "sum", "std", "var", "min", "max", 50]:
+        np.testing.assert_array_equal(np.isnan(out[op].values), [[True, False], [False, True]])
+    # Same rule as numpy: the first NaN is the extremum
+    for i in range(2):
+        sub = tsd.restrict(ep[i])
+        np.testing.assert_array_equal(out["min"].values[i], np.min(sub.values, 0))
+        np.testing.assert_array_equal(out["max"].values[i], np.max(sub.values, 0))
+        np.testing.assert_array_equal(out["argmin"].values[i], sub.t[np.argmin(sub.values, 0)])
+        np.testing.assert_array_equal(out["argmax"].values[i], sub.t[np.argmax(sub.values, 0)])
+    assert out["argmin"].values[0, 0] == out["argmax"].values[0, 0] == position
+
+
+def test_reduce_by_interval_errors():
+    tsd = nap.Tsd(t=np.arange(100), d=np.random.rand(100))
+    ep = nap.IntervalSet(start=0, end=10)
+    with pytest.raises(IOError, match="iset should be an object of type IntervalSet"):
+        tsd.reduce_by_interval([0, 10])
+    with pytest.raises(ValueError, match="Unknown operation median"):
+        tsd.reduce_by_interval(ep, "median")
+    with pytest.raises(ValueError, match="Percentile 101 should be a number between 0 and 100"):
+        tsd.reduce_by_interval(ep, ["mean", 101])
+
+
+@pytest.mark.parametrize("stat", ["mean", "sum", "var", "min", "max", "median"])
+@pytest.mark.parametrize("time_units", [None, "s"])
+@pytest.mark.parametrize(
+    "tsd",
+    [
+        nap.Tsd(t=np.arange(200), d=np.random.randn(200), time_support=nap.IntervalSet([0, 100], [80, 199])),
+        nap.TsdFrame(t=np.arange(200), d=np.random.randn(200, 3), time_support=nap.IntervalSet([0, 100], [80, 199])),
+        nap.TsdTensor(t=np.arange(200), d=np.random.randn(200, 3, 2), time_support=nap.IntervalSet([0, 100], [80, 199])),
+    ],
+)
+def test_rolling(tsd, stat, time_units):
+    out = tsd.rolling(10, stat, time_units=time_units)
+    assert isinstance(out, tsd.__class__)
+    assert out.shape == tsd.shape
+    np.testing.assert_array_equal(out.t, tsd.t)
+    np.testing.assert_array_equal(out.time_support.values, tsd.time_support.values)
+
+    func = {"median": np.median}.get(stat, getattr(np, stat))
+    for ep in tsd.time_support:
+        idx = np.where((tsd.t >= ep.start[0]) & (tsd.t <= ep.end[0]))[0]
+        for k, i in enumerate(idx):
+            if time_units is None and k < 9:
+                assert np.all(np.isnan(out.values[i]))
+            else:
+                window = tsd.values[idx[max(k - 9, 0)] : i + 1]
+                np.testing.assert_array_almost_equal(out.values[i], func(window, axis=0))
+
+
+@pytest.mark.parametrize("stat", ["mean", "sum", "var", "min", "max", "median"])
+def test_rolling_nan_and_dtype(stat):
+    d = np.random.randn(100, 2).astype(np.float32)
+    d[50, 1] = np.nan
+    tsdframe = nap.TsdFrame(t=np.arange(100), d=d)
+    out = tsdframe.rolling(5, stat)
+    assert out.dtype == np.float32
+    assert np.all(np.isnan(out.values[50:55, 1]))
+    assert not np.any(np.isnan(out.values[55:, 1]))
+    assert not np.any(np.isnan(out.values[4:, 0]))
+
+    tsd = nap.Tsd(t=np.arange(100), d=np.arange(100))
+    assert tsd.rolling(5, stat).dtype == np.float64
+
+
+def test_rolling_errors():
+    tsd = nap.Tsd(t=np.arange(100), d=np.random.rand(100))
+    with pytest.raises(ValueError, match="Unknown statistic std"):
+        tsd.rolling(10, "std")
+    with pytest.raises(TypeError, match="window should be type int or float"):
+        tsd.rolling("a")
+    with pytest.raises(ValueError, match="window should be strictly positive"):
+        tsd.rolling(0)
+    with pytest.raises(TypeError, match="window should be an integer number of samples"):
+        tsd.rolling(1.5)
+
+
+@pytest.mark.parametrize("method", ["above", "below", "aboveequal", "belowequal"])
+def test_tsdframe_threshold(method):
+    tsdframe = nap.TsdFrame(
+        t=np.arange(300), d=np.random.randn(300, 4), columns=["a", "b", "c", "d"],
+        time_support=nap.IntervalSet([0, 120], [100, 299]),
+    )
+    thr = [0.5, 0, -0.5, 1]
+    out = tsdframe.threshold(thr, method)
+    assert list(out.keys()) == ["a", "b", "c", "d"]
+    for i, c in enumerate(tsdframe.columns):
+        assert isinstance(out[c], nap.IntervalSet)
+        expected = tsdframe[:, i].threshold(thr[i], method).time_support
+        np.testing.assert_array_almost_equal(out[c].values, expected.values)
+
+    # Same threshold for all columns
+    out = tsdframe.threshold(0.5, method)
+    for i, c in enumerate(tsdframe.columns):
+        expected = tsdframe[:, i].threshold(0.5, method).time_support
+        np.testing.assert_array_almost_equal(out[c].values, expected.values)
+
+    table = tsdframe.threshold(thr, method, output="table")
+    assert isinstance(table, pd.DataFrame)
+    assert list(table.columns) == ["start", "end", "channel"]
+    assert np.all(np.diff(table["start"].values) >= 0)
+    for i, c in enumerate(tsdframe.columns):
+        expected = tsdframe[:, i].threshold(thr[i], method).time_support
+        np.testing.assert_array_almost_equal(
+            table.loc[table["channel"] == c, ["start", "end"]].values, expected.values
+        )
+
+
+def test_tsdframe_threshold_hysteresis_and_min_duration():
+    d = np.array([0, 2, 1, 0.5, 2, 0, 0, 2, 0, 1.6, 1.6, 1.6, 0.2, 0])
+    tsdframe = nap.TsdFrame(t=np.arange(len(d)), d=np.stack([d, -d], 1))
+
+    out = tsdframe.threshold([1.5, 5], off_thr=[0.4, 5], method="above")
+    np.testing.assert_array_equal(out[0].values, [[0.5, 4.5], [6.5, 7.5], [8.5, 11.5]])
+    assert len(out[1]) == 0
+
+    out = tsdframe.threshold([-5, -1.5], off_thr=[-5, -0.4], method="belowequal")
+    assert len(out[0]) == 0
+    np.testing.assert_array_equal(out[1].values, [[0.5, 4.5], [6.5, 7.5], [8.5, 11.5]])
+
+    out = tsdframe.threshold(1.5, off_thr=0.4, min_duration=2, output="table")
+    np.testing.assert_array_equal(out.values, [[0.5, 4.5, 0], [8.5, 11.5, 0]])
+    out = tsdframe.threshold(1.5, off_thr=0.4, min_duration=2001, time_units="ms")
+    np.testing.assert_array_equal(out[0].values, [[0.5, 4.5], [8.5, 11.5]])
+
+
+def test_tsdframe_threshold_errors():
+    tsdframe = nap.TsdFrame(t=np.arange(100), d=np.random.randn(100, 3))
+    with pytest.raises(ValueError, match="Method bla for thresholding is not accepted."):
+        tsdframe.threshold(0, "bla")
+    with pytest.raises(ValueError, match="Output bla is not accepted"):
+        tsdframe.threshold(0, output="bla")
+    with pytest.raises(ValueError, match="Thresholds should be a number or one per column."):
+        tsdframe.threshold([0, 1])
+    with pytest.raises(ValueError, match="Thresholds should be a number or one per column."):
+        tsdframe.threshold(0, off_thr=[0, 1])
+    with pytest.raises(ValueError, match="off_thr should be less strict than thr."):
+        tsdframe.threshold(0, off_thr=1)
+    with pytest.raises(ValueError, match="off_thr should be less strict than thr."):
+        tsdframe.threshold(0, method="below", off_thr=-1)
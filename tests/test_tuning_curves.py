@@ -83,6 +83,41 @@ def test_compute_1d_tuning_curves_with_min_max():
     assert tc[0].values[0] >= 9
 
 
+@pytest.mark.parametrize(
+    "ep, minmax",
+    [
+        (None, None),
+        (nap.IntervalSet(start=[10, 100], end=[50, 400]), (2, 8)),
+    ],
+)
+def test_compute_1d_tuning_curves_against_value_from(ep, minmax):
+    rng = np.random.default_rng(1)
+    t = np.arange(0, 600, 0.02)
+    feature = nap.Tsd(
+        t=t,
+        d=rng.uniform(0, 10, len(t)),
+        time_support=nap.IntervalSet(start=[0, 300.5], end=[299.9, 599]),
+    )
+    tsgroup = nap.TsGroup(
+        {
+            i: nap.Ts(np.sort(rng.uniform(-5, 610, rng.integers(0, 3000))))
+            for i in range(20)
+        }
+    )
+    tc = nap.compute_1d_tuning_curves(tsgroup, feature, 17, ep=ep, minmax=minmax)
+    assert all(tc.dtypes == np.float64)
+
+    ep = feature.time_support if ep is None else ep
+    if minmax is None:
+        bins = np.linspace(np.min(feature), np.max(feature), 18)
+    else:
+        bins = np.linspace(minmax[0], minmax[1], 18)
+    occupancy, _ = np.histogram(feature.restrict(ep).values, bins)
+    for k, v in tsgroup.value_from(feature, ep).items():
+        count, _ = np.histogram(v.values, bins)
+        np.testing.assert_allclose(tc[k].values, count / occupancy * feature.rate)
+
+
 def test_compute_2d_tuning_curves():
     tsgroup = nap.TsGroup(
         {0: nap.Ts(t=np.arange(0, 100, 10)), 1: nap.Ts(t=np.array([50, 149]))}
@@ -287,6 +322,37 @@ def test_compute_1d_tuning_curves_continuous_with_ep():
     pd.testing.assert_frame_equal(tc1, tc2)
 
 
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("error", ["var", "sem"])
+def test_compute_1d_tuning_curves_continuous_error(dtype, error):
+    rng = np.random.default_rng(0)
+    d = rng.standard_normal((1000, 3)).astype(dtype)
+    d[5, 1] = np.nan
+    tsdframe = nap.TsdFrame(t=np.arange(1000), d=d)
+    feature = nap.Tsd(t=np.arange(1000), d=np.arange(1000) % 10)
+    tc, err = nap.compute_1d_tuning_curves_continuous(
+        tsdframe, feature, nb_bins=5, minmax=(0, 10), error=error
+    )
+    assert tc.values.dtype == dtype
+    assert err.values.dtype == dtype
+    pd.testing.assert_index_equal(tc.index, err.index)
+
+    df = pd.DataFrame(d.astype(np.float64)).groupby(np.arange(1000) % 10 // 2)
+    expected = df.var() if error == "var" else df.sem()
+    np.testing.assert_allclose(tc.values, df.mean().values, rtol=1e-5)
+    np.testing.assert_allclose(err.values, expected.values, rtol=1e-5)
+
+
+def test_compute_continuous_tuning_curves_error_raise():
+    tsdframe = nap.TsdFrame(t=np.arange(0, 100), d=np.ones((100, 1)))
+    feature = nap.Tsd(t=np.arange(0, 100, 0.1), d=np.arange(0, 100, 0.1) % 1.0)
+    with pytest.raises(RuntimeError, match="error should be None, 'var' or 'sem'."):
+        nap.compute_1d_tuning_curves_continuous(tsdframe, feature, 10, error="std")
+    features = nap.TsdFrame(t=np.arange(0, 100), d=np.ones((100, 2)))
+    with pytest.raises(RuntimeError, match="error should be None, 'var' or 'sem'."):
+        nap.compute_2d_tuning_curves_continuous(tsdframe, features, 10, error="std")
+
+
 def test_compute_1d_tuning_curves_continuous_with_min_max():
     tsdframe = nap.TsdFrame(t=np.arange(0, 100), d=np.ones((100, 1)))
     feature = nap.Tsd(t=np.arange(0, 100, 0.1), d=np.arange(0, 100, 0.1) % 1.0)
@@ -342,6 +408,23 @@ def test_compute_2d_tuning_curves_continuous_output_value():
         np.testing.assert_array_almost_equal(tc[i], tmp[i])
 
 
+def test_compute_2d_tuning_curves_continuous_error():
+    rng = np.random.default_rng(0)
+    d = rng.standard_normal((400, 2)).astype(np.float32)
+    tsdframe = nap.TsdFrame(t=np.arange(400), d=d)
+    features = nap.TsdFrame(
+        t=np.arange(400), d=np.tile(np.array([[0, 0, 1, 1], [0, 1, 0, 1]]), 100).T
+    )
+    tc, xy, err = nap.compute_2d_tuning_curves_continuous(
+        tsdframe, features, 2, minmax=(-0.5, 1.5, -0.5, 1.5), error="sem"
+    )
+    df = pd.DataFrame(d.astype(np.float64)).groupby(np.arange(400) % 4)
+    for i in range(2):
+        assert tc[i].dtype == np.float32
+        np.testing.assert_allclose(tc[i].ravel(), df.mean()[i].values, rtol=1e-5)
+        np.testing.assert_allclose(err[i].ravel(), df.sem()[i].values, rtol=1e-5)
+
+
 def test_compute_2d_tuning_curves_continuous_with_ep():
     tsdframe = nap.TsdFrame(
         t=np.arange(0, 100), d=np.hstack((np.ones((100, 1)), np.ones((100, 1)) * 2))
@@ -404,3 +487,204 @@ def test_compute_2d_tuning_curves_with_minmax():
     np.testing.assert_array_almost_equal(xy[0], xbins[0:-1] + np.diff(xbins) / 2)
     ybins = np.linspace(minmax[2], minmax[3], 3)
     np.testing.assert_array_almost_equal(xy[1], ybins[0:-1] + np.diff(ybins) / 2)
+
+
+def test_compute_nd_tuning_curves_2d():
+    tsgroup = nap.TsGroup(
+        {0: nap.Ts(t=np.arange(0, 100, 10)), 1: nap.Ts(t=np.array([50, 149]))}
+    )
+    tmp = np.vstack(
+        (np.repeat(np.arange(0, 100), 10), np.tile(np.arange(0, 100), 10))
+    ).T
+    features = nap.TsdFrame(t=np.arange(0, 200, 0.1), d=np.vstack((tmp, tmp[::-1])))
+    tc2, xy = nap.compute_2d_tuning_curves(
+        tsgroup, features, 10, minmax=(0, 99, 0, 99)
+    )
+    tc, centers = nap.compute_nd_tuning_curves(
+        tsgroup, features, 10, minmax=(0, 99, 0, 99)
+    )
+    assert tc.shape == (2, 10, 10)
+    for i, k in enumerate(tsgroup.keys()):
+        np.testing.assert_allclose(tc[i], tc2[k])
+    for c, c2 in zip(centers, xy):
+        np.testing.assert_allclose(c, c2)
+
+
+@pytest.mark.parametrize("bins", [4, [3, 5, 2, 4]])
+def test_compute_nd_tuning_curves(bins):
+    rng = np.random.default_rng(0)
+    t = np.arange(0, 100, 0.05)
+    features = nap.TsdFrame(t=t, d=rng.uniform(0, 1, (len(t), 4)) ** 3)
+    tsgroup = nap.TsGroup(
+        {i: nap.Ts(np.sort(rng.uniform(0, 100, 500))) for i in range(3)}
+    )
+    ep = nap.IntervalSet(start=[0, 60], end=[40, 90])
+    tc, centers = nap.compute_nd_tuning_curves(tsgroup, features, bins, ep=ep)
+
+    shape = (bins,) * 4 if isinstance(bins, int) else tuple(bins)
+    assert tc.shape == (3,) + shape
+    assert [len(c) for c in centers] == list(shape)
+
+    edges = [
+        np.linspace(features.restrict(ep)[:, i].min(), features.restrict(ep)[:, i].max(), n + 1)
+        for i, n in enumerate(shape)
+    ]
+    occupancy, _ = np.histogramdd(features.restrict(ep).values, edges)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i, v in enumerate(tsgroup.value_from(features, ep).values()):
+            count, _ = np.histogramdd(v.values, edges)
+            np.testing.assert_allclose(tc[i], count / occupancy * features.rate)
+    assert np.all(np.isnan(tc[:, occupancy == 0]))
+
+
+def test_compute_nd_tuning_curves_errors():
+    tsgroup = nap.TsGroup({0: nap.Ts(t=np.arange(0, 100))})
+    features = nap.TsdFrame(t=np.arange(100), d=np.random.rand(100, 3))
+    with pytest.raises(AssertionError, match="group should be a TsGroup."):
+        nap.compute_nd_tuning_curves([1], features, 2)
+    with pytest.raises(AssertionError, match="features should be a TsdFrame"):
+        nap.compute_nd_tuning_curves(tsgroup, features[:, 0], 2)
+    with pytest.raises(AssertionError, match="bins should be an int or a list of int"):
+        nap.compute_nd_tuning_curves(tsgroup, features, [2, 2])
+    with pytest.raises(AssertionError, match="minmax should be a tuple"):
+        nap.compute_nd_tuning_curves(tsgroup, features, 2, minmax=(0, 1))
+    with pytest.raises(AssertionError, match="ep should be an IntervalSet"):
+        nap.compute_nd_tuning_curves(tsgroup, features, 2, ep=[0, 1])
+
+
+def get_testing_set_significance():
+    rng = np.random.default_rng(0)
+    t = np.arange(0, 300, 0.02)
+    x = (np.sin(t / 5) + 1) / 2
+    feature = nap.Tsd(t=t, d=x)
+    rates = [np.ones(len(t)), 1 + 20 * np.exp(-((x - 0.5) ** 2) / 0.01)]
+    tsgroup = nap.TsGroup(
+        {i: nap.Ts(t[rng.random(len(t)) < r * 0.02]) for i, r in enumerate(rates)}
+    )
+    return tsgroup, feature
+
+
+@pytest.mark.parametrize("bitssec", [False, True])
+def test_compute_tuning_significance(bitssec):
+    tsgroup, feature = get_testing_set_significance()
+    si, null = nap.compute_tuning_significance(
+        tsgroup, feature, 20, n_shuffles=200, bitssec=bitssec, seed=0
+    )
+    assert isinstance(si, pd.DataFrame)
+    assert list(si.columns) == ["SI", "pvalue"]
+    assert null.shape == (2, 200)
+
+    tc = nap.compute_1d_tuning_curves(tsgroup, feature, 20)
+    expected = nap.compute_1d_mutual_info(tc, feature, bitssec=bitssec)
+    np.testing.assert_allclose(si["SI"].values, expected["SI"].values)
+    np.testing.assert_allclose(
+        si["pvalue"].values, (1 + np.sum(null >= si["SI"].values[:, None], 1)) / 201
+    )
+    assert si["pvalue"][0] > 0.05
+    assert si["pvalue"][1] == 1 / 201
+
+
+def test_compute_tuning_significance_shifts():
+    tsgroup, feature = get_testing_set_significance()
+    si1, null1 = nap.compute_tuning_significance(tsgroup, feature, 20, 50, seed=1)
+    si2, null2 = nap.compute_tuning_significance(tsgroup, feature, 20, 50, seed=1)
+    np.testing.assert_array_equal(null1, null2)
+
+    # A shift of exactly the duration of the epoch gives back the observed information
+    ep = feature.time_support
+    si, null = nap.compute_tuning_significance(
+        tsgroup, feature, 20, 5, min_shift=ep.tot_length(), max_shift=ep.tot_length()
+    )
+    np.testing.assert_allclose(null, np.repeat(si["SI"].values[:, None], 5, 1))
+
+
+def test_compute_tuning_significance_error():
+    tsgroup, feature = get_testing_set_significance()
+    with pytest.raises(AssertionError, match="group should be a TsGroup."):
+        nap.compute_tuning_significance([1], feature, 20)
+    with pytest.raises(AssertionError, match="n_shuffles should be a strictly positive"):
+        nap.compute_tuning_significance(tsgroup, feature, 20, n_shuffles=0)
+
+
+def get_testing_set_phase_locking(n_channels=None):
+    fs = 1000.0
+    t = np.arange(0, 100, 1 / fs)
+    rng = np.random.default_rng(0)
+    phase = np.angle(np.exp(1j * 2 * np.pi * 8 * t))
+    # Unit 0 is locked to the phase 1, unit 1 is not locked, unit 2 has 1 spike and unit 3 none
+    locked = t[np.abs(np.angle(np.exp(1j * (phase - 1)))) < 0.5]
+    tsgroup = nap.TsGroup(
+        {
+            0: nap.Ts(np.sort(rng.choice(locked, 500, replace=False))),
+            1: nap.Ts(np.sort(rng.uniform(0, 100, 800))),
+            2: nap.Ts(np.array([50.0])),
+            3: nap.Ts(np.array([])),
+        },
+        time_support=nap.IntervalSet(0, 100),
+    )
+    if n_channels is None:
+        return tsgroup, nap.Tsd(t=t, d=phase)
+    d = np.angle(np.exp(1j * (phase[:, None] + np.arange(n_channels))))
+    return tsgroup, nap.TsdFrame(t=t, d=d, columns=list("abc")[:n_channels])
+
+
+def circular_stats(phi):
+    n = len(phi)
+    z = np.exp(1j * phi)
+    R = np.abs(z.sum())
+    ppc = np.mean([np.cos(a - b) for i, a in enumerate(phi) for b in phi[i + 1 :]]) if n > 1 else np.nan
+    return dict(
+        n_spikes=n,
+        mrl=R / n if n else np.nan,
+        preferred_phase=np.angle(z.sum()) if n else np.nan,
+        pvalue=min(np.exp(np.sqrt(1 + 4 * n + 4 * (n**2 - R**2)) - (1 + 2 * n)), 1) if n else np.nan,
+        ppc=ppc,
+    )
+
+
+@pytest.mark.parametrize("ep", [None, nap.IntervalSet([10, 60], [40, 90])])
+def test_compute_phase_locking(ep):
+    tsgroup, phase = get_testing_set_phase_locking()
+    res = nap.compute_phase_locking(tsgroup, phase, ep=ep)
+    assert isinstance(res, pd.DataFrame)
+    assert list(res.columns) == ["n_spikes", "mrl", "preferred_phase", "pvalue", "ppc"]
+    np.testing.assert_array_equal(res.index, [0, 1, 2, 3])
+
+    for k in tsgroup.keys():
+        phi = tsgroup[k].value_from(phase, ep).values
+        expected = circular_stats(phi)
+        for stat, value in expected.items():
+            np.testing.assert_allclose(res.loc[k, stat], value, rtol=1e-6, atol=1e-12)
+
+    assert res.loc[0, "mrl"] > 0.9
+    assert res.loc[0, "pvalue"] < 1e-10
+    np.testing.assert_allclose(res.loc[0, "preferred_phase"], 1, atol=0.1)
+    assert res.loc[1, "pvalue"] > 0.01
+    assert np.isnan(res.loc[2, "ppc"])
+    assert res.loc[3, "n_spikes"] == 0 and np.isnan(res.loc[3, "mrl"])
+
+
+def test_compute_phase_locking_channels():
+    tsgroup, phase = get_testing_set_phase_locking(3)
+    res = nap.compute_phase_locking(tsgroup, phase)
+    assert isinstance(res.columns, pd.MultiIndex)
+    assert res["mrl"].shape == (4, 3)
+    np.testing.assert_array_equal(res["mrl"].columns, ["a", "b", "c"])
+    for c in phase.columns:
+        expected = nap.compute_phase_locking(tsgroup, phase[c])
+        for stat in expected.columns:
+            np.testing.assert_allclose(res[stat][c].values, expected[stat].values)
+    # Channel c is shifted by c radians
+    np.testing.assert_allclose(
+        res["preferred_phase"].loc[0].values, np.angle(np.exp(1j * (1 + np.arange(3)))), atol=0.1
+    )
+
+
+def test_compute_phase_locking_error():
+    tsgroup, phase = get_testing_set_phase_locking()
+    with pytest.raises(AssertionError, match="group should be a TsGroup."):
+        nap.compute_phase_locking([1], phase)
+    with pytest.raises(AssertionError, match="phase should be a Tsd or a TsdFrame"):
+        nap.compute_phase_locking(tsgroup, np.zeros(10))
+    with pytest.raises(AssertionError, match="ep should be an IntervalSet"):
+        nap.compute_phase_locking(tsgroup, phase, ep=[0, 1])